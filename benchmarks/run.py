@@ -0,0 +1,190 @@
+"""
+Benchmark suite for the reservation engine.
+
+Generates (or reuses) a seeded synthetic dataset, then times loading,
+availability checks, searches and end-to-end CLI commands. Results can be
+saved as a JSON baseline and compared against a previous run:
+
+    python -m benchmarks.run --hotels 200 --bookings 500000 --save baseline.json
+    python -m benchmarks.run --hotels 200 --bookings 500000 --compare baseline.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional, Sequence
+
+from src.assignment import RoomSchedule
+from src.cli import CLI
+from src.datagen import write_dataset
+from src.services import HotelManager
+
+REGRESSION_THRESHOLD = 1.25
+
+
+def _percentile(samples: List[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def measure(operations: Sequence[Callable[[], object]]) -> Dict[str, float]:
+    """Time each operation once and summarise throughput and latency."""
+    samples = []
+    started = time.perf_counter()
+    for operation in operations:
+        t0 = time.perf_counter()
+        operation()
+        samples.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - started
+    return {
+        'operations': len(samples),
+        'throughput_per_s': len(samples) / elapsed if elapsed else float('inf'),
+        'p50_ms': _percentile(samples, 0.50) * 1000,
+        'p99_ms': _percentile(samples, 0.99) * 1000,
+    }
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def benchmark_load(paths: Dict[str, str]) -> Dict[str, float]:
+    """Time a load, then repeat it under tracemalloc to find its peak allocation."""
+    t0 = time.perf_counter()
+    HotelManager(paths['hotels'], paths['bookings'], cache_size=0)
+    elapsed = time.perf_counter() - t0
+    tracemalloc.start()
+    HotelManager(paths['hotels'], paths['bookings'], cache_size=0)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'seconds': elapsed, 'peak_traced_mb': peak / (1024 * 1024)}
+
+
+def run_suite(paths: Dict[str, str], start: date, queries: int, seed: int) -> Dict[str, Dict]:
+    """Run every benchmark against a dataset and return the results by name."""
+    results = {'load': benchmark_load(paths)}
+    manager = HotelManager(paths['hotels'], paths['bookings'], cache_size=0)
+    footprint = manager.memory_report()
+    results['memory'] = {name: footprint[name] for name in ('bytes_per_booking', 'bytes_per_hotel')}
+    cli = CLI(manager)
+    rng = random.Random(seed)
+    pairs = [(hotel_id, room_type)
+             for hotel_id, room_types in manager.room_types_by_hotel.items()
+             for room_type in sorted(room_types)]
+
+    def random_day() -> str:
+        return (start + timedelta(days=rng.randrange(400))).strftime('%Y%m%d')
+
+    def random_range(nights: int) -> str:
+        first = start + timedelta(days=rng.randrange(400))
+        return f"{first.strftime('%Y%m%d')}-{(first + timedelta(days=nights)).strftime('%Y%m%d')}"
+
+    def availability(date_str_factory):
+        operations = []
+        for _ in range(queries):
+            hotel_id, room_type = rng.choice(pairs)
+            date_str = date_str_factory()
+            operations.append(lambda h=hotel_id, d=date_str, r=room_type:
+                              manager.check_availability(h, d, r))
+        return operations
+
+    results['availability_day'] = measure(availability(random_day))
+    results['availability_week'] = measure(availability(lambda: random_range(7)))
+    results['availability_month'] = measure(availability(lambda: random_range(30)))
+
+    manager._today = lambda: start.toordinal()
+    for horizon in (30, 365):
+        operations = []
+        for _ in range(max(1, queries // 10)):
+            hotel_id, room_type = rng.choice(pairs)
+            operations.append(lambda h=hotel_id, r=room_type, d=horizon:
+                              manager.search_availability(h, d, r))
+        results[f'search_{horizon}d'] = measure(operations)
+
+    hotel_id, room_type = max(pairs, key=lambda pair: manager.room_counts[pair[0]].get(pair[1], 0))
+    schedule = manager.room_schedule(hotel_id, room_type)
+    stays = schedule.stays() + schedule.unassigned
+    results['room_assignment'] = measure([lambda: RoomSchedule.build(schedule.room_ids, stays)] * 5)
+
+    year = f"{start.strftime('%Y%m%d')}-{(start + timedelta(days=365)).strftime('%Y%m%d')}"
+    results['report_year_build'] = measure([lambda: manager.occupancy_report(year, 'month')])
+    results['report_year'] = measure([lambda: manager.occupancy_report(year, 'month')] * 5)
+
+    commands = []
+    for _ in range(queries):
+        hotel_id, room_type = rng.choice(pairs)
+        if rng.random() < 0.8:
+            commands.append(f"Availability({hotel_id}, {random_day()}, {room_type})")
+        else:
+            commands.append(f"Search({hotel_id}, 30, {room_type})")
+    results['cli_end_to_end'] = measure([lambda c=c: cli.process_command(c) for c in commands])
+    results['process'] = {'peak_rss_mb': _peak_rss_mb()}
+    return results
+
+
+def compare(current: Dict, baseline: Dict, threshold: float = REGRESSION_THRESHOLD) -> List[str]:
+    """Describe each metric's change against a baseline, flagging regressions."""
+    lines = []
+    higher_is_better = {'throughput_per_s'}
+    for name, metrics in current['results'].items():
+        for metric, value in metrics.items():
+            old = baseline['results'].get(name, {}).get(metric)
+            if not old or metric == 'operations':
+                continue
+            ratio = value / old
+            worse = ratio < 1 / threshold if metric in higher_is_better else ratio > threshold
+            flag = '  REGRESSION' if worse else ''
+            lines.append(f"{name}.{metric}: {old:.4g} -> {value:.4g} ({ratio:.2f}x){flag}")
+    return lines
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark the hotel reservation engine')
+    parser.add_argument('--data', help='Dataset directory; generated into a temporary directory if omitted')
+    parser.add_argument('--hotels', type=int, default=100, help='Hotels to generate')
+    parser.add_argument('--bookings', type=int, default=100000, help='Bookings to generate')
+    parser.add_argument('--queries', type=int, default=2000, help='Queries per benchmark')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    parser.add_argument('--start', default='20250101', help='Dataset start date in YYYYMMDD format')
+    parser.add_argument('--save', help='Write results to this JSON file')
+    parser.add_argument('--compare', help='Compare results with this JSON baseline')
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+                        help='Slowdown ratio reported as a regression')
+    args = parser.parse_args(argv)
+
+    start = date(int(args.start[:4]), int(args.start[4:6]), int(args.start[6:]))
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = args.data or tmp
+        paths = {'hotels': os.path.join(directory, 'hotels.json'),
+                 'bookings': os.path.join(directory, 'bookings.json')}
+        if not all(os.path.exists(path) for path in paths.values()):
+            paths = write_dataset(directory, args.hotels, args.bookings, start, args.seed)
+        results = run_suite(paths, start, args.queries, args.seed)
+
+    report = {
+        'config': {key: getattr(args, key) for key in ('hotels', 'bookings', 'queries', 'seed', 'start')},
+        'environment': {'python': platform.python_version(), 'platform': platform.platform()},
+        'results': results,
+    }
+    print(json.dumps(report, indent=2))
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            lines = compare(report, json.load(f), args.threshold)
+        print('\n'.join(lines))
+        return 1 if any(line.endswith('REGRESSION') for line in lines) else 0
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
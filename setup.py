@@ -8,6 +8,9 @@ setup(
         "pytest>=7.4.0",
         "pytest-cov>=4.1.0",
     ],
+    extras_require={
+        'fast': ["ijson>=3.1", "numpy>=1.21"],
+    },
     entry_points={
         'console_scripts': [
             'myapp=src.cli:main',
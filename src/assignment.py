@@ -0,0 +1,153 @@
+import heapq
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# (booking id, arrival ordinal, departure ordinal)
+Stay = Tuple[int, int, int]
+
+
+class RoomSchedule:
+    """
+    Assignment of the bookings of one (hotel, room type) pair to rooms.
+
+    Each room keeps its stays as parallel lists sorted by arrival. Stays
+    in one room never overlap, so they are sorted by departure as well and
+    any room's occupant on a day is a single binary search away.
+    """
+
+    def __init__(self, room_ids: Sequence[str]):
+        self.room_ids = list(room_ids)
+        self.arrivals: List[List[int]] = [[] for _ in self.room_ids]
+        self.departures: List[List[int]] = [[] for _ in self.room_ids]
+        self.booking_ids: List[List[int]] = [[] for _ in self.room_ids]
+        self.room_of: Dict[int, int] = {}
+        # Stays no room could take: the pair is overbooked on some night.
+        self.unassigned: List[Stay] = []
+
+    @classmethod
+    def build(cls, room_ids: Sequence[str], stays: Iterable[Stay]) -> 'RoomSchedule':
+        """
+        Assign every stay to a room by greedy interval partitioning.
+
+        Stays are taken in arrival order; rooms whose last stay has ended
+        return to a min-heap of free rooms and each stay takes the lowest
+        numbered free one. This needs only as many rooms as the busiest
+        night has bookings, so a stay is left unassigned only when the
+        pair is genuinely overbooked. Runs in O(n log n).
+
+        Args:
+            room_ids: Rooms of the pair, in preference order
+            stays: (booking id, arrival, departure) tuples; stays that
+                cover no night are ignored
+
+        Returns:
+            RoomSchedule: The assignment
+        """
+        schedule = cls(room_ids)
+        free = list(range(len(room_ids)))
+        busy: List[Tuple[int, int]] = []
+        for booking_id, arrival, departure in sorted(stays, key=lambda stay: (stay[1], stay[2])):
+            if departure <= arrival:
+                continue
+            while busy and busy[0][0] <= arrival:
+                heapq.heappush(free, heapq.heappop(busy)[1])
+            if not free:
+                schedule.unassigned.append((booking_id, arrival, departure))
+                continue
+            room = heapq.heappop(free)
+            schedule._append(room, booking_id, arrival, departure)
+            heapq.heappush(busy, (departure, room))
+        return schedule
+
+    def _append(self, room: int, booking_id: int, arrival: int, departure: int) -> None:
+        self.arrivals[room].append(arrival)
+        self.departures[room].append(departure)
+        self.booking_ids[room].append(booking_id)
+        self.room_of[booking_id] = room
+
+    def _is_free(self, room: int, arrival: int, departure: int) -> bool:
+        index = bisect_left(self.arrivals[room], departure)
+        return index == 0 or self.departures[room][index - 1] <= arrival
+
+    def assign(self, booking_id: int, arrival: int, departure: int) -> Optional[str]:
+        """
+        Put a new stay into the first room free for all of its nights.
+
+        If every room is taken on some night of the stay although the
+        pair has capacity left, the rooms are fragmented and all stays
+        are repacked with build(), which may move existing stays.
+
+        Returns:
+            str: The room id, or None if the pair is overbooked
+        """
+        if departure <= arrival:
+            return None
+        room = self._place(booking_id, arrival, departure)
+        if room is not None:
+            return self.room_ids[room]
+        rebuilt = RoomSchedule.build(self.room_ids,
+                                     self.stays() + self.unassigned + [(booking_id, arrival, departure)])
+        self.__dict__.update(rebuilt.__dict__)
+        return self.room_for(booking_id)
+
+    def _place(self, booking_id: int, arrival: int, departure: int) -> Optional[int]:
+        """Insert a stay into the first room free for all of its nights and return that room."""
+        for room in range(len(self.room_ids)):
+            if self._is_free(room, arrival, departure):
+                index = bisect_left(self.arrivals[room], arrival)
+                self.arrivals[room].insert(index, arrival)
+                self.departures[room].insert(index, departure)
+                self.booking_ids[room].insert(index, booking_id)
+                self.room_of[booking_id] = room
+                return room
+        return None
+
+    def release(self, booking_id: int) -> None:
+        """
+        Remove a stay, freeing its room.
+
+        Unassigned stays overlapping the freed nights are then placed, in
+        arrival order, into any room that is now free for them.
+        """
+        room = self.room_of.pop(booking_id, None)
+        if room is None:
+            self.unassigned = [stay for stay in self.unassigned if stay[0] != booking_id]
+            return
+        index = self.booking_ids[room].index(booking_id)
+        arrival, departure = self.arrivals[room][index], self.departures[room][index]
+        del self.arrivals[room][index]
+        del self.departures[room][index]
+        del self.booking_ids[room][index]
+        if self.unassigned:
+            self.unassigned = [stay for stay in self.unassigned
+                               if not (stay[1] < departure and stay[2] > arrival)
+                               or self._place(*stay) is None]
+
+    def stays(self) -> List[Stay]:
+        """Return every assigned stay."""
+        return [
+            (booking_id, arrival, departure)
+            for room in range(len(self.room_ids))
+            for booking_id, arrival, departure in zip(
+                self.booking_ids[room], self.arrivals[room], self.departures[room])
+        ]
+
+    def room_for(self, booking_id: int) -> Optional[str]:
+        room = self.room_of.get(booking_id)
+        return None if room is None else self.room_ids[room]
+
+    def occupant(self, room: int, day: int) -> Optional[int]:
+        """Return the booking in a room on the night of day, if any."""
+        index = bisect_right(self.arrivals[room], day) - 1
+        if index >= 0 and self.departures[room][index] > day:
+            return self.booking_ids[room][index]
+        return None
+
+    def occupancy(self, day: int) -> Dict[str, Optional[int]]:
+        """Map every room id to the booking occupying it on the night of day."""
+        return {room_id: self.occupant(room, day) for room, room_id in enumerate(self.room_ids)}
+
+    def free_rooms(self, start: int, end: int) -> List[str]:
+        """Return the rooms free on every night in [start, end)."""
+        return [room_id for room, room_id in enumerate(self.room_ids)
+                if self._is_free(room, start, end)]
@@ -0,0 +1,179 @@
+import multiprocessing
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Mapping, Optional, Sequence, AbstractSet, Tuple
+from .models import ordinal_to_date
+from .occupancy import OccupancyGroup
+from .store import BookingStore
+
+UNKNOWN_HOTEL = 'unknown hotel'
+UNKNOWN_ROOM_TYPE = 'unknown room type'
+EMPTY_STAY = 'departure not after arrival'
+
+# (room type, rooms, sorted arrivals, sorted departures) of one hotel
+_GroupData = Tuple[str, int, array, array]
+
+
+@dataclass
+class InvalidBooking:
+    """A booking whose references or dates make it unusable."""
+    booking_id: int
+    hotel_id: str
+    room_type: str
+    reason: str
+
+
+@dataclass
+class OverbookedNights:
+    """A run of nights on which a (hotel, room type) has more bookings than rooms."""
+    hotel_id: str
+    room_type: str
+    first: int
+    last: int
+    booked: int
+    rooms: int
+
+
+@dataclass
+class AuditReport:
+    """Outcome of HotelManager.audit()."""
+    bookings_checked: int
+    invalid: List[InvalidBooking] = field(default_factory=list)
+    overbooked: List[OverbookedNights] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.invalid and not self.overbooked
+
+    def summary(self) -> str:
+        """Format the report as text, one line per finding."""
+        lines = [f"Checked {self.bookings_checked} bookings: {len(self.invalid)} invalid, "
+                 f"{len(self.overbooked)} overbooked periods"]
+        lines.extend(f"Booking {item.booking_id} ({item.hotel_id} {item.room_type}): {item.reason}"
+                     for item in self.invalid)
+        for run in self.overbooked:
+            days = ordinal_to_date(run.first)
+            if run.last != run.first:
+                days += f"-{ordinal_to_date(run.last)}"
+            lines.append(f"Overbooked {run.hotel_id} {run.room_type} {days}: "
+                         f"{run.booked} bookings for {run.rooms} rooms")
+        return '\n'.join(lines)
+
+
+def find_invalid(store: BookingStore, room_types: Mapping[str, AbstractSet[str]]) -> List[InvalidBooking]:
+    """
+    Check every live booking's hotel, room type and dates.
+
+    References are resolved once per distinct interned code pair rather
+    than once per booking, so the pass is a tight scan of the columns.
+
+    Args:
+        store: Booking store to check
+        room_types: Room type codes per known hotel
+
+    Returns:
+        list: The invalid bookings, in id order
+    """
+    reasons: Dict[Tuple[int, int], Optional[str]] = {}
+    invalid = []
+    cancelled = store.cancelled
+    for index, (hotel_code, type_code, arrival, departure) in enumerate(zip(
+            store.hotel_codes, store.room_type_codes, store.arrivals, store.departures)):
+        if cancelled and index in cancelled:
+            continue
+        key = (hotel_code, type_code)
+        if key in reasons:
+            reason = reasons[key]
+        else:
+            types = room_types.get(store.hotel_ids[hotel_code])
+            if types is None:
+                reason = UNKNOWN_HOTEL
+            elif store.room_types[type_code] not in types:
+                reason = UNKNOWN_ROOM_TYPE
+            else:
+                reason = None
+            reasons[key] = reason
+        if reason is None and departure <= arrival:
+            reason = EMPTY_STAY
+        if reason is not None:
+            invalid.append(InvalidBooking(index, store.hotel_ids[hotel_code],
+                                          store.room_types[type_code], reason))
+    return invalid
+
+
+def overbooked_nights(hotel_id: str, room_type: str, rooms: int,
+                      arrivals: Sequence[int], departures: Sequence[int]) -> List[OverbookedNights]:
+    """
+    Sweep one pair's sorted arrivals and departures for nights over capacity.
+
+    Each boundary day is visited once, in order, adjusting the running
+    count of bookings in house; runs of consecutive nights with the same
+    count above `rooms` are reported together.
+    """
+    runs: List[OverbookedNights] = []
+    i = j = booked = 0
+    n_arr, n_dep = len(arrivals), len(departures)
+    # Every stay departs after it arrives, so the last boundary is a departure.
+    while j < n_dep:
+        day = min(arrivals[i], departures[j]) if i < n_arr else departures[j]
+        while j < n_dep and departures[j] == day:
+            booked -= 1
+            j += 1
+        while i < n_arr and arrivals[i] == day:
+            booked += 1
+            i += 1
+        if j >= n_dep:
+            break
+        following = min(arrivals[i], departures[j]) if i < n_arr else departures[j]
+        if booked > rooms:
+            previous = runs[-1] if runs else None
+            if previous is not None and previous.last == day - 1 and previous.booked == booked:
+                previous.last = following - 1
+            else:
+                runs.append(OverbookedNights(hotel_id, room_type, day, following - 1, booked, rooms))
+    return runs
+
+
+def _audit_hotels(hotels: List[Tuple[str, List[_GroupData]]]) -> List[OverbookedNights]:
+    runs = []
+    for hotel_id, groups in hotels:
+        for room_type, rooms, arrivals, departures in groups:
+            runs.extend(overbooked_nights(hotel_id, room_type, rooms, arrivals, departures))
+    return runs
+
+
+def find_overbooked(groups: Mapping[Tuple[str, str], OccupancyGroup], room_counts: Mapping[Tuple[str, str], int],
+                    workers: Optional[int] = None) -> List[OverbookedNights]:
+    """
+    Find every night on which a (hotel, room type) pair is overbooked.
+
+    Hotels are split into one batch per worker process and swept in
+    parallel; a single worker, or a single hotel, runs in-process.
+
+    Args:
+        groups: Occupancy groups per (hotel, room type)
+        room_counts: Rooms per (hotel, room type)
+        workers: Number of worker processes; defaults to the CPU count
+
+    Returns:
+        list: Overbooked runs ordered by hotel, room type and date
+    """
+    by_hotel: Dict[str, List[_GroupData]] = {}
+    for (hotel_id, room_type), group in sorted(groups.items()):
+        if len(group.arrivals) > room_counts.get((hotel_id, room_type), 0):
+            # Memory-mapped snapshot columns cannot be pickled.
+            by_hotel.setdefault(hotel_id, []).append(
+                (room_type, room_counts.get((hotel_id, room_type), 0),
+                 array('i', group.arrivals), array('i', group.departures)))
+    hotels = list(by_hotel.items())
+    workers = min(workers or os.cpu_count() or 1, len(hotels))
+    if workers <= 1:
+        return _audit_hotels(hotels)
+    batches = [hotels[n::workers] for n in range(workers)]
+    # Forking copies the caller's locks in whatever state other threads
+    # hold them (the server audits while serving), so start clean workers.
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+        runs = [run for batch in pool.map(_audit_hotels, batches) for run in batch]
+    return sorted(runs, key=lambda run: (run.hotel_id, run.room_type, run.first))
@@ -0,0 +1,120 @@
+import heapq
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+from .cli import CLI
+from .services import HotelManager
+from .exceptions import HotelReservationError
+
+Shard = Tuple[Optional[List[str]], List[Tuple[int, str]]]
+
+# Commands that change bookings; their effects must be seen in input order.
+MUTATING_COMMANDS = {'book', 'cancel', 'modify'}
+
+
+def _run_shard(hotels_file: str, bookings_file: str, snapshot_file: Optional[str],
+               shard: Shard, journal_file: Optional[str] = None,
+               sqlite_file: Optional[str] = None) -> List[Tuple[int, str]]:
+    """Load one shard's hotels and process its commands."""
+    hotel_ids, commands = shard
+    manager = HotelManager(hotels_file, bookings_file, snapshot_file=snapshot_file,
+                           hotel_ids=hotel_ids, journal_file=journal_file, sqlite_file=sqlite_file)
+    cli = CLI(manager)
+    try:
+        return [(index, cli.process_command(command)) for index, command in commands]
+    finally:
+        manager.close()
+
+
+def shard_commands(commands: Iterable[str], workers: int,
+                   ordered: bool = False) -> Tuple[List[Shard], Dict[int, str]]:
+    """
+    Parse commands and split them into per-hotel shards.
+
+    Hotels are assigned to at most `workers` shards, heaviest first, so each
+    shard receives a similar number of commands. Commands that fail to parse
+    are answered immediately; commands that name no hotel go to a shard that
+    loads every hotel. A batch containing booking changes is not split, so
+    every command sees the changes made before it.
+
+    Args:
+        commands: Raw command lines
+        workers: Maximum number of shards
+        ordered: Keep every command in one shard that loads all hotels
+
+    Returns:
+        tuple: (shards, results already known by input index)
+    """
+    by_hotel: Dict[Optional[str], List[Tuple[int, str]]] = {}
+    results: Dict[int, str] = {}
+    mutating = False
+    for index, command in enumerate(commands):
+        try:
+            params = CLI.parse_command(command)
+        except HotelReservationError as e:
+            results[index] = f"Error: {str(e)}"
+            continue
+        if not params:
+            results[index] = ""
+            continue
+        mutating = mutating or params['command'] in MUTATING_COMMANDS
+        by_hotel.setdefault(params.get('hotel_id'), []).append((index, command))
+
+    if mutating or ordered:
+        ordered = sorted(item for hotel_commands in by_hotel.values() for item in hotel_commands)
+        return [(None, ordered)], results
+
+    shards: List[Shard] = []
+    unsharded = by_hotel.pop(None, None)
+    if unsharded:
+        shards.append((None, unsharded))
+
+    buckets: List[Tuple[int, int, List[str], List[Tuple[int, str]]]] = [
+        (0, n, [], []) for n in range(max(1, workers))
+    ]
+    for hotel_id, hotel_commands in sorted(by_hotel.items(), key=lambda item: -len(item[1])):
+        load, n, hotel_ids, assigned = heapq.heappop(buckets)
+        hotel_ids.append(hotel_id)
+        assigned.extend(hotel_commands)
+        heapq.heappush(buckets, (load + len(hotel_commands), n, hotel_ids, assigned))
+    shards.extend((hotel_ids, assigned) for _, _, hotel_ids, assigned in buckets if assigned)
+    return shards, results
+
+
+def run_batch(hotels_file: str, bookings_file: str, commands: List[str],
+              workers: Optional[int] = None, snapshot_file: Optional[str] = None,
+              journal_file: Optional[str] = None, sqlite_file: Optional[str] = None) -> List[str]:
+    """
+    Process a batch of commands across a pool of worker processes.
+
+    Args:
+        hotels_file: Path to hotels JSON file
+        bookings_file: Path to bookings JSON file
+        commands: Raw command lines
+        workers: Number of worker processes; defaults to the CPU count
+        snapshot_file: Optional snapshot cache shared by the workers
+        journal_file: Optional booking journal; a journaled batch runs in
+            a single process so booking ids and changes stay consistent
+        sqlite_file: Optional SQLite booking database; like a journal, it
+            is used from a single process
+
+    Returns:
+        list: One result per input command, in input order
+    """
+    workers = workers or os.cpu_count() or 1
+    shards, results = shard_commands(commands, workers, ordered=bool(journal_file or sqlite_file))
+
+    if workers == 1 or len(shards) <= 1:
+        outputs = [_run_shard(hotels_file, bookings_file, snapshot_file, shard, journal_file, sqlite_file)
+                   for shard in shards]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(shards))) as pool:
+            futures = [
+                pool.submit(_run_shard, hotels_file, bookings_file, snapshot_file, shard)
+                for shard in shards
+            ]
+            outputs = [future.result() for future in futures]
+
+    for output in outputs:
+        results.update(output)
+    return [results[index] for index in range(len(commands))]
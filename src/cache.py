@@ -0,0 +1,142 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Set, Tuple
+
+GroupKey = Tuple[str, str]
+
+MISSING = object()
+
+
+class ResultCache:
+    """
+    Bounded LRU cache with optional TTL and per-group invalidation.
+
+    Every entry is tagged with the (hotel, room type) group it was computed
+    from, so a booking change can drop exactly the results it affects.
+
+    A result computed while a booking change lands could be stored after
+    that change's invalidation and outlive it. Callers therefore read the
+    group's version() before computing and hand it to put(), which drops
+    the result if the group has been invalidated since.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            maxsize: Maximum number of entries; 0 disables caching
+            ttl: Seconds an entry stays valid; None keeps entries until evicted
+            clock: Monotonic time source
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self._entries: 'OrderedDict[Hashable, Tuple[Any, Optional[float], GroupKey]]' = OrderedDict()
+        self._by_group: Dict[GroupKey, Set[Hashable]] = {}
+        # Invalidation stamps per group and for clear(), from one counter.
+        self._versions: Dict[GroupKey, int] = {}
+        self._cleared = 0
+        self._stamp = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.stale = 0
+
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value for key, or MISSING."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return MISSING
+            value, expires, group = entry
+            if expires is not None and self.clock() >= expires:
+                self._discard(key, group)
+                self.expirations += 1
+                self.misses += 1
+                return MISSING
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def version(self, group: GroupKey) -> int:
+        """Return the group's current version, to pass to put() after computing a result."""
+        with self._lock:
+            return self._version(group)
+
+    def _version(self, group: GroupKey) -> int:
+        return max(self._versions.get(group, 0), self._cleared)
+
+    def put(self, key: Hashable, value: Any, group: GroupKey, version: Optional[int] = None) -> None:
+        """
+        Store value under key, evicting the least recently used entry if full.
+
+        Args:
+            key: Cache key
+            value: Result to store
+            group: (hotel, room type) group the result was computed from
+            version: The group's version() read before computing; the value
+                is dropped if the group was invalidated since
+        """
+        if self.maxsize <= 0:
+            return
+        expires = self.clock() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            if version is not None and version != self._version(group):
+                self.stale += 1
+                return
+            if key in self._entries:
+                self._discard(key, self._entries[key][2])
+            self._entries[key] = (value, expires, group)
+            self._by_group.setdefault(group, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                old_key, (_, _, old_group) = self._entries.popitem(last=False)
+                self._forget(old_key, old_group)
+                self.evictions += 1
+
+    def invalidate(self, hotel_id: str, room_type: str) -> None:
+        """Drop every entry computed from the given (hotel, room type) group."""
+        with self._lock:
+            self._stamp += 1
+            self._versions[(hotel_id, room_type)] = self._stamp
+            keys = self._by_group.pop((hotel_id, room_type), ())
+            for key in keys:
+                del self._entries[key]
+            self.invalidations += len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_group.clear()
+            self._stamp += 1
+            self._cleared = self._stamp
+            self._versions.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit, miss, eviction, expiration, invalidation and stale-put counters."""
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations,
+                'stale': self.stale,
+            }
+
+    def _discard(self, key: Hashable, group: GroupKey) -> None:
+        del self._entries[key]
+        self._forget(key, group)
+
+    def _forget(self, key: Hashable, group: GroupKey) -> None:
+        keys = self._by_group.get(group)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_group[group]
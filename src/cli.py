@@ -1,10 +1,50 @@
 import argparse
+import re
+import signal
 import sys
-from typing import Optional, List
+from itertools import groupby
+from typing import Dict, NamedTuple, Optional, List, Tuple
 from .services import HotelManager
+from .models import date_to_ordinal
 from .validators import validate_date_format, validate_hotel_id, validate_room_type
 from .exceptions import HotelReservationError, ValidationError, DateFormatError
 
+class CommandSpec(NamedTuple):
+    key: str
+    params: Tuple[str, ...]
+    usage: str
+    optional: int = 0
+
+COMMANDS = {
+    'Availability': CommandSpec('availability', ('hotel_id', 'date_str', 'room_type'),
+                                'hotelId, date, roomType'),
+    'AvailabilityMany': CommandSpec('availability_many', ('queries',),
+                                    'hotelId date roomType; hotelId date roomType; ...'),
+    'Search': CommandSpec('search', ('hotel_id', 'days', 'room_type', 'limit'),
+                          'hotelId, days, roomType[, limit]', optional=1),
+    'FindStay': CommandSpec('find_stay', ('hotel_id', 'nights', 'room_type', 'min_rooms', 'horizon', 'limit'),
+                            'hotelId, nights, roomType, minRooms, horizon[, k]', optional=1),
+    'Rooms': CommandSpec('rooms', ('hotel_id', 'date_str', 'room_type'), 'hotelId, date, roomType'),
+    'Book': CommandSpec('book', ('hotel_id', 'arrival', 'departure', 'room_type', 'room_rate'),
+                        'hotelId, arrival, departure, roomType, roomRate'),
+    'AvailabilityMatrix': CommandSpec('matrix', ('date_str', 'room_types', 'hotel_ids'),
+                                      'dateRange, roomTypes[, hotelIds]', optional=1),
+    'Report': CommandSpec('report', ('date_str', 'period', 'hotel_ids', 'room_types'),
+                          'dateRange, day|week|month[, hotelIds[, roomTypes]]', optional=2),
+    'Stats': CommandSpec('stats', (), ''),
+    'Audit': CommandSpec('audit', (), ''),
+    'Reload': CommandSpec('reload', (), ''),
+    'Cancel': CommandSpec('cancel', ('booking_id',), 'bookingId'),
+    'Modify': CommandSpec('modify', ('booking_id', 'arrival', 'departure', 'room_type'),
+                          'bookingId, arrival, departure[, roomType]', optional=1),
+}
+
+# Command grammar: Name(arg, arg, ...) with free spacing around the name,
+# the parentheses and the commas.
+_COMMAND_PATTERN = re.compile(r'(\w+)\s*\((.*)\)', re.S)
+_NAME_PATTERN = re.compile(r'(\w+)\s*\(')
+_SEPARATOR_PATTERN = re.compile(r'\s*,\s*')
+
 class CLI:
     def __init__(self, manager: HotelManager):
         """
@@ -15,7 +55,8 @@ class CLI:
         """
         self.manager = manager
 
-    def parse_command(self, command: str) -> Optional[dict]:
+    @staticmethod
+    def parse_command(command: str) -> Optional[dict]:
         """
         Parse input command and return command parameters.
         
@@ -32,52 +73,44 @@ class CLI:
         if not command:
             return None
 
-        if command.startswith('Availability('):
-            if not command.endswith(')'):
-                raise ValidationError("Invalid command format. Use: Availability(hotelId, date, roomType)")
-            params = command[12:].strip('()').split(', ')
-            if len(params) != 3:
-                raise ValidationError("Invalid number of parameters. Expected: hotelId, date, roomType")
-            return {
-                'command': 'availability',
-                'hotel_id': params[0],
-                'date_str': params[1],
-                'room_type': params[2]
-            }
-
-        elif command.startswith('Search('):
-            if not command.endswith(')'):
-                raise ValidationError("Invalid command format. Use: Search(hotelId, days, roomType)")
-            params = command[7:].strip('()').split(', ')
-            if len(params) != 3:
-                raise ValidationError("Invalid number of parameters. Expected: hotelId, days, roomType")
-            return {
-                'command': 'search',
-                'hotel_id': params[0],
-                'days': params[1],
-                'room_type': params[2]
-            }
-        else:
-            raise ValidationError("Unknown command. Available commands: Availability(...), Search(...)")
+        match = _COMMAND_PATTERN.fullmatch(command)
+        head = match or _NAME_PATTERN.match(command)
+        spec = COMMANDS.get(head.group(1)) if head else None
+        if spec is None:
+            available = ', '.join(f"{name}(...)" for name in COMMANDS)
+            raise ValidationError(f"Unknown command. Available commands: {available}")
+        if match is None:
+            raise ValidationError(f"Invalid command format. Use: {head.group(1)}({spec.usage})")
+        args = match.group(2).strip()
+        params = _SEPARATOR_PATTERN.split(args) if args else []
+        if not len(spec.params) - spec.optional <= len(params) <= len(spec.params):
+            raise ValidationError(f"Invalid number of parameters. Expected: {spec.usage}")
+
+        result = {'command': spec.key}
+        result.update(zip(spec.params, params))
+        return result
 
     def validate_availability_params(self, params: dict) -> None:
         """Validate parameters for availability command."""
-        if not validate_hotel_id(params['hotel_id'], self.manager.hotels):
+        if not validate_hotel_id(params['hotel_id'], self.manager.hotels_by_id):
             raise ValidationError(f"Hotel {params['hotel_id']} not found")
 
         if '-' in params['date_str']:
             start, end = params['date_str'].split('-')
             validate_date_format(start)
             validate_date_format(end)
+            if end < start:
+                raise ValidationError("End date must not be before start date")
         else:
             validate_date_format(params['date_str'])
 
-        if not validate_room_type(params['room_type'], params['hotel_id'], self.manager.hotels):
+        if not validate_room_type(params['room_type'], params['hotel_id'], self.manager.hotels_by_id,
+                                  self.manager.room_types_by_hotel):
             raise ValidationError(f"Room type {params['room_type']} not found in hotel {params['hotel_id']}")
 
     def validate_search_params(self, params: dict) -> None:
         """Validate parameters for search command."""
-        if not validate_hotel_id(params['hotel_id'], self.manager.hotels):
+        if not validate_hotel_id(params['hotel_id'], self.manager.hotels_by_id):
             raise ValidationError(f"Hotel {params['hotel_id']} not found")
 
         try:
@@ -87,9 +120,181 @@ class CLI:
         except ValueError:
             raise ValidationError("Days must be a valid number")
 
-        if not validate_room_type(params['room_type'], params['hotel_id'], self.manager.hotels):
+        if not validate_room_type(params['room_type'], params['hotel_id'], self.manager.hotels_by_id,
+                                  self.manager.room_types_by_hotel):
             raise ValidationError(f"Room type {params['room_type']} not found in hotel {params['hotel_id']}")
 
+    def validate_positive_int(self, params: dict, name: str, label: str) -> int:
+        """Validate and return a positive integer parameter."""
+        try:
+            value = int(params[name])
+        except ValueError:
+            raise ValidationError(f"{label} must be a valid number")
+        if value <= 0:
+            raise ValidationError(f"{label} must be a positive number")
+        return value
+
+    def validate_booking_id(self, params: dict) -> int:
+        """Validate and return the booking id parameter."""
+        try:
+            return int(params['booking_id'])
+        except ValueError:
+            raise ValidationError("Booking id must be a valid number")
+
+    def _run_availability(self, params: dict) -> str:
+        with self.manager.stats.timer('phase.validate'):
+            self.validate_availability_params(params)
+        result = self.manager.check_availability(
+            params['hotel_id'],
+            params['date_str'],
+            params['room_type']
+        )
+        return str(result)
+
+    def _run_availability_many(self, params: dict) -> str:
+        lines: List[Optional[str]] = []
+        queries: List[Tuple[int, Tuple[str, str, str]]] = []
+        with self.manager.stats.timer('phase.validate'):
+            for item in params['queries'].split(';'):
+                fields = item.split()
+                try:
+                    if len(fields) != 3:
+                        raise ValidationError("Invalid query. Expected: hotelId date roomType")
+                    self.validate_availability_params(
+                        dict(zip(('hotel_id', 'date_str', 'room_type'), fields)))
+                except HotelReservationError as e:
+                    lines.append(f"Error: {str(e)}")
+                    continue
+                queries.append((len(lines), tuple(fields)))
+                lines.append(None)
+        results = self.manager.check_availability_many(query for _, query in queries)
+        for (index, _), result in zip(queries, results):
+            lines[index] = str(result)
+        return '\n'.join(lines)
+
+    def _run_search(self, params: dict) -> str:
+        with self.manager.stats.timer('phase.validate'):
+            self.validate_search_params(params)
+            limit = self.validate_positive_int(params, 'limit', "Limit") if 'limit' in params else None
+        return self.manager.search_availability(
+            params['hotel_id'],
+            int(params['days']),
+            params['room_type'],
+            limit
+        )
+
+    def _run_find_stay(self, params: dict) -> str:
+        with self.manager.stats.timer('phase.validate'):
+            if not validate_hotel_id(params['hotel_id'], self.manager.hotels_by_id):
+                raise ValidationError(f"Hotel {params['hotel_id']} not found")
+            if not validate_room_type(params['room_type'], params['hotel_id'], self.manager.hotels_by_id,
+                                      self.manager.room_types_by_hotel):
+                raise ValidationError(f"Room type {params['room_type']} not found in hotel {params['hotel_id']}")
+            nights = self.validate_positive_int(params, 'nights', "Nights")
+            min_rooms = self.validate_positive_int(params, 'min_rooms', "Minimum rooms")
+            horizon = self.validate_positive_int(params, 'horizon', "Horizon")
+            limit = self.validate_positive_int(params, 'limit', "Limit") if 'limit' in params else 1
+        stays = self.manager.find_stays(params['hotel_id'], nights, params['room_type'],
+                                        min_rooms, horizon, limit)
+        return ', '.join(f"({arrival}-{departure}, {rooms})" for arrival, departure, rooms in stays)
+
+    def _run_rooms(self, params: dict) -> str:
+        with self.manager.stats.timer('phase.validate'):
+            validate_date_format(params['date_str'])
+            self.validate_availability_params(params)
+        occupancy = self.manager.room_occupancy(params['hotel_id'], params['date_str'], params['room_type'])
+        lines = [f"{room_id}: {'free' if booking_id is None else booking_id}"
+                 for room_id, booking_id in occupancy.items()]
+        day = date_to_ordinal(params['date_str'])
+        schedule = self.manager.room_schedule(params['hotel_id'], params['room_type'])
+        unassigned = [str(booking_id) for booking_id, arrival, departure in schedule.unassigned
+                      if arrival <= day < departure]
+        if unassigned:
+            lines.append(f"Unassigned: {', '.join(unassigned)}")
+        return '\n'.join(lines)
+
+    def _run_matrix(self, params: dict) -> str:
+        for date_str in params['date_str'].split('-'):
+            validate_date_format(date_str)
+        hotel_ids = params['hotel_ids'].split() if 'hotel_ids' in params else None
+        matrix = self.manager.availability_matrix(
+            params['date_str'],
+            params['room_types'].split(),
+            hotel_ids
+        )
+        return '\n'.join(
+            f"{hotel_id} {room_type}: {' '.join(map(str, row))}"
+            for hotel_id, rows in zip(matrix.hotel_ids, matrix.values)
+            for room_type, row in zip(matrix.room_types, rows)
+        )
+
+    def _run_report(self, params: dict) -> str:
+        for date_str in params['date_str'].split('-'):
+            validate_date_format(date_str)
+        hotel_ids = params['hotel_ids'].split() if params.get('hotel_ids') else None
+        room_types = params['room_types'].split() if 'room_types' in params else None
+        rows = self.manager.occupancy_report(params['date_str'], params['period'], hotel_ids, room_types)
+        lines = []
+        for (period, hotel_id, room_type), group in groupby(
+                rows, key=lambda row: (row.period, row.hotel_id, row.room_type)):
+            group = list(group)
+            nights = sum(row.room_nights for row in group)
+            capacity = group[0].capacity
+            occupancy = 100.0 * nights / capacity if capacity else 0.0
+            mix = '; '.join(f"{row.room_rate} {row.room_nights}, {row.occupancy:.1f}%" for row in group)
+            lines.append(f"{period} {hotel_id} {room_type}: {nights}/{capacity} room-nights, "
+                         f"{occupancy:.1f}% ({mix})")
+        return '\n'.join(lines)
+
+    def _run_stats(self, params: dict) -> str:
+        return self.manager.stats_report()
+
+    def _run_audit(self, params: dict) -> str:
+        return self.manager.audit().summary()
+
+    def _run_reload(self, params: dict) -> str:
+        self.manager.reload(wait=False)
+        return "Reload started"
+
+    def _run_book(self, params: dict) -> str:
+        booking_id = self.manager.add_booking(
+            params['hotel_id'],
+            params['arrival'],
+            params['departure'],
+            params['room_type'],
+            params['room_rate']
+        )
+        return str(booking_id)
+
+    def _run_cancel(self, params: dict) -> str:
+        booking_id = self.validate_booking_id(params)
+        self.manager.cancel_booking(booking_id)
+        return f"Cancelled {booking_id}"
+
+    def _run_modify(self, params: dict) -> str:
+        booking_id = self.validate_booking_id(params)
+        self.manager.modify_booking(
+            booking_id,
+            params['arrival'],
+            params['departure'],
+            params.get('room_type')
+        )
+        return f"Modified {booking_id}"
+
+    def _dispatch(self, command: str) -> Tuple[Optional[str], str]:
+        """Parse and run a command, returning (command key or None if empty, result)."""
+        stats = self.manager.stats
+        with stats.timer('phase.parse'):
+            params = self.parse_command(command)
+        if not params:
+            return None, ""
+
+        handler = getattr(self, f"_run_{params['command']}")
+        if not stats.enabled:
+            return params['command'], handler(params)
+        with stats.timer(f"command.{params['command']}"):
+            return params['command'], handler(params)
+
     def process_command(self, command: str) -> str:
         """
         Process a command and return the result.
@@ -101,54 +306,154 @@ class CLI:
             str: Command result or error message
         """
         try:
-            params = self.parse_command(command)
-            if not params:
-                return ""
-
-            if params['command'] == 'availability':
-                self.validate_availability_params(params)
-                result = self.manager.check_availability(
-                    params['hotel_id'],
-                    params['date_str'],
-                    params['room_type']
-                )
-                return str(result)
-
-            elif params['command'] == 'search':
-                self.validate_search_params(params)
-                result = self.manager.search_availability(
-                    params['hotel_id'],
-                    int(params['days']),
-                    params['room_type']
-                )
-                return result
-
+            return self._dispatch(command)[1]
         except HotelReservationError as e:
+            self.manager.stats.increment(f"errors.{type(e).__name__}")
             return f"Error: {str(e)}"
         except Exception as e:
+            self.manager.stats.increment(f"errors.{type(e).__name__}")
             return f"Unexpected error: {str(e)}"
 
+    def execute(self, command: str) -> Optional[Dict[str, object]]:
+        """
+        Process a command and return the outcome as fields instead of text.
+        
+        Args:
+            command: Input command string
+            
+        Returns:
+            dict: {"ok": True, "command": key, "result": text} on success,
+            {"ok": False, "error": exception name, "message": text} on
+            failure, or None if the command is empty
+        """
+        try:
+            key, result = self._dispatch(command)
+        except Exception as e:
+            self.manager.stats.increment(f"errors.{type(e).__name__}")
+            return {'ok': False, 'error': type(e).__name__, 'message': str(e)}
+        if key is None:
+            return None
+        return {'ok': True, 'command': key, 'result': result}
+
+def _print_progress(done: int, total: int) -> None:
+    """Print bookings load progress on stderr."""
+    percent = 100 * done // total if total else 100
+    print(f"\rLoading bookings: {percent}%", end='\n' if done >= total else '', file=sys.stderr)
+
+def _run_batch(args: argparse.Namespace) -> None:
+    """
+    Run --batch mode, writing one result line per command in input order.
+
+    As with --serve, blank input lines get no answer, every other line gets
+    exactly one (possibly empty) line, and multi-line results have their
+    lines joined with '; '.
+    """
+    from .batch import run_batch
+
+    try:
+        with open(args.batch) as f:
+            commands = f.read().splitlines()
+        results = run_batch(args.hotels, args.bookings, commands,
+                            workers=args.workers, snapshot_file=args.snapshot,
+                            journal_file=args.journal, sqlite_file=args.sqlite)
+    except Exception as e:
+        print(f"Fatal error: {str(e)}", file=sys.stderr)
+        sys.exit(1)
+    sys.stdout.write(''.join(result.replace('\n', '; ') + '\n'
+                             for command, result in zip(commands, results) if command.strip()))
+
+def _run_pipe(cli: CLI) -> None:
+    """Run --pipe mode: JSON-lines answers to commands on stdin until EOF."""
+    from .pipe import run_pipe
+
+    try:
+        run_pipe(cli, sys.stdin.buffer, sys.stdout.buffer)
+    except (BrokenPipeError, KeyboardInterrupt):
+        pass
+
+def _run_server(cli: CLI, args: argparse.Namespace) -> None:
+    """Run --serve/--unix mode until interrupted."""
+    import asyncio
+    from .server import serve
+
+    host = port = None
+    if args.serve:
+        host, _, port = args.serve.rpartition(':')
+        port = int(port)
+    try:
+        asyncio.run(serve(cli, host or None, port, args.unix, args.max_pending))
+    except KeyboardInterrupt:
+        pass
+
 def main():
     """Main entry point for the CLI application."""
     parser = argparse.ArgumentParser(description='Hotel Reservation System')
     parser.add_argument('--hotels', required=True, help='Path to hotels JSON file')
     parser.add_argument('--bookings', required=True, help='Path to bookings JSON file')
+    parser.add_argument('--progress', action='store_true', help='Report bookings load progress on stderr')
+    parser.add_argument('--snapshot', help='Path to a binary snapshot cache for fast startup')
+    parser.add_argument('--journal', metavar='PATH',
+                        help='Log booking changes to an append-only journal and replay it on startup')
+    parser.add_argument('--journal-sync-every', type=int, default=1, metavar='N',
+                        help='Group journal writes into one fsync per N changes')
+    parser.add_argument('--sqlite', metavar='PATH',
+                        help='Keep bookings in a SQLite database instead of memory; '
+                             'it is imported from --bookings on first use')
+    parser.add_argument('--audit', action='store_true',
+                        help='Audit the bookings on startup, report problems on stderr and leave '
+                             'invalid bookings out of queries')
+    parser.add_argument('--watch', type=float, metavar='SECONDS',
+                        help='Poll the data files at this interval and reload them when they change')
+    parser.add_argument('--batch', metavar='FILE', help='Process all commands in FILE non-interactively')
+    parser.add_argument('--workers', type=int, help='Number of worker processes for --batch')
+    parser.add_argument('--pipe', action='store_true',
+                        help='Read commands from stdin without prompting and answer each with a JSON line')
+    parser.add_argument('--serve', metavar='HOST:PORT', help='Serve commands over TCP instead of stdin')
+    parser.add_argument('--unix', metavar='PATH', help='Serve commands over a Unix socket instead of stdin')
+    parser.add_argument('--max-pending', type=int, default=1024,
+                        help='Maximum number of queued commands in server mode')
+    parser.add_argument('--stats', action='store_true',
+                        help='Collect timings and counters; print them on exit and via Stats()')
     args = parser.parse_args()
 
+    if args.batch:
+        _run_batch(args)
+        return
+
     try:
-        manager = HotelManager(args.hotels, args.bookings)
+        progress = _print_progress if args.progress else None
+        manager = HotelManager(args.hotels, args.bookings, progress=progress,
+                               snapshot_file=args.snapshot, stats=args.stats,
+                               journal_file=args.journal,
+                               journal_sync_every=args.journal_sync_every,
+                               sqlite_file=args.sqlite, audit=args.audit)
+        if args.audit:
+            print(manager.audit().summary(), file=sys.stderr)
         cli = CLI(manager)
+        if args.watch:
+            manager.watch(args.watch)
+        if hasattr(signal, 'SIGHUP'):
+            signal.signal(signal.SIGHUP, lambda signum, frame: manager.reload(wait=False))
 
-        while True:
-            try:
-                command = input("> ")
-                if not command:
+        if args.pipe:
+            _run_pipe(cli)
+        elif args.serve or args.unix:
+            _run_server(cli, args)
+        else:
+            while True:
+                try:
+                    command = input("> ")
+                    if not command:
+                        break
+                    result = cli.process_command(command)
+                    if result:
+                        print(result)
+                except EOFError:
                     break
-                result = cli.process_command(command)
-                if result:
-                    print(result)
-            except EOFError:
-                break
+
+        manager.close()
+        if args.stats:
+            print(manager.stats_report(), file=sys.stderr)
 
     except Exception as e:
         print(f"Fatal error: {str(e)}", file=sys.stderr)
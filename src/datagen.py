@@ -0,0 +1,154 @@
+import argparse
+import json
+import os
+import random
+from datetime import date, timedelta
+from typing import Dict, Iterator, List, Optional
+
+# (code, description, weight, amenities, features)
+ROOM_TYPES = [
+    ("SGL", "Single Room", 0.30, ["WiFi", "TV"], ["Non-smoking"]),
+    ("DBL", "Double Room", 0.35, ["WiFi", "TV", "Minibar"], ["Non-smoking", "Sea View"]),
+    ("TWN", "Twin Room", 0.15, ["WiFi", "TV"], ["Non-smoking"]),
+    ("FAM", "Family Room", 0.12, ["WiFi", "TV", "Minibar"], ["Balcony"]),
+    ("STE", "Suite", 0.08, ["WiFi", "TV", "Minibar", "Bathtub"], ["Sea View", "Balcony"]),
+]
+
+ROOM_RATES = [("Standard", 0.7), ("Prepaid", 0.3)]
+
+MEAN_STAY_NIGHTS = 2.5
+MAX_STAY_NIGHTS = 28
+MEAN_LEAD_DAYS = 35
+MAX_LEAD_DAYS = 365
+
+
+def generate_hotels(count: int, seed: int = 0) -> List[Dict]:
+    """
+    Generate hotel records in the hotels.json format.
+
+    Every hotel offers two to five room types. Room counts scale with each
+    type's weight, so singles and doubles make up most of the inventory.
+
+    Args:
+        count: Number of hotels
+        seed: Random seed
+
+    Returns:
+        list: Hotel records
+    """
+    rng = random.Random(seed)
+    hotels = []
+    for n in range(count):
+        offered = sorted(
+            rng.sample(range(len(ROOM_TYPES)), rng.randint(2, len(ROOM_TYPES))))
+        room_types, rooms = [], []
+        for index in offered:
+            code, description, weight, amenities, features = ROOM_TYPES[index]
+            room_types.append({
+                "code": code,
+                "description": description,
+                "amenities": amenities,
+                "features": features,
+            })
+            floor = index + 1
+            rooms.extend(
+                {"roomType": code, "roomId": f"{floor}{number:03d}"}
+                for number in range(1, max(2, int(weight * rng.randint(20, 400))) + 1)
+            )
+        hotels.append({
+            "id": f"H{n + 1}",
+            "name": f"Hotel {n + 1}",
+            "roomTypes": room_types,
+            "rooms": rooms,
+        })
+    return hotels
+
+
+def generate_bookings(hotels: List[Dict], count: int, start: date, seed: int = 0) -> Iterator[Dict]:
+    """
+    Lazily generate booking records in the bookings.json format.
+
+    Bookings are made on a uniformly random day in the year from `start`,
+    arrive after an exponential lead time and stay a geometric number of
+    nights, so short stays booked a few weeks ahead dominate as they do in
+    real reservation data. Room types are picked in proportion to the
+    number of rooms a hotel has of each.
+
+    Args:
+        hotels: Hotel records as produced by generate_hotels
+        count: Number of bookings
+        start: First booking day
+        seed: Random seed
+
+    Yields:
+        dict: Booking records
+    """
+    rng = random.Random(seed)
+    pools = []
+    for hotel in hotels:
+        pools.append((hotel["id"], [room["roomType"] for room in hotel["rooms"]]))
+    rates, rate_weights = zip(*ROOM_RATES)
+    stay_p = 1 / MEAN_STAY_NIGHTS
+
+    for _ in range(count):
+        hotel_id, room_types = pools[rng.randrange(len(pools))]
+        booked = start + timedelta(days=rng.randrange(365))
+        lead = min(int(rng.expovariate(1 / MEAN_LEAD_DAYS)), MAX_LEAD_DAYS)
+        nights = 1
+        while nights < MAX_STAY_NIGHTS and rng.random() > stay_p:
+            nights += 1
+        arrival = booked + timedelta(days=lead)
+        yield {
+            "hotelId": hotel_id,
+            "arrival": arrival.strftime('%Y%m%d'),
+            "departure": (arrival + timedelta(days=nights)).strftime('%Y%m%d'),
+            "roomType": room_types[rng.randrange(len(room_types))],
+            "roomRate": rng.choices(rates, rate_weights)[0],
+        }
+
+
+def write_dataset(directory: str, hotels: int, bookings: int, start: Optional[date] = None,
+                  seed: int = 0) -> Dict[str, str]:
+    """
+    Write hotels.json and bookings.json into a directory.
+
+    Bookings are streamed to disk one record at a time, so datasets far
+    larger than memory can be generated.
+
+    Returns:
+        dict: Paths of the written 'hotels' and 'bookings' files
+    """
+    os.makedirs(directory, exist_ok=True)
+    start = start or date.today()
+    hotel_records = generate_hotels(hotels, seed)
+    paths = {
+        "hotels": os.path.join(directory, "hotels.json"),
+        "bookings": os.path.join(directory, "bookings.json"),
+    }
+    with open(paths["hotels"], "w") as f:
+        json.dump(hotel_records, f, indent=2)
+    with open(paths["bookings"], "w") as f:
+        f.write("[")
+        for n, record in enumerate(generate_bookings(hotel_records, bookings, start, seed)):
+            f.write(",\n" if n else "\n")
+            json.dump(record, f)
+        f.write("\n]\n")
+    return paths
+
+
+def main():
+    """Command-line entry point for generating a dataset."""
+    parser = argparse.ArgumentParser(description='Generate a synthetic hotel dataset')
+    parser.add_argument('--out', required=True, help='Output directory')
+    parser.add_argument('--hotels', type=int, default=100, help='Number of hotels')
+    parser.add_argument('--bookings', type=int, default=100000, help='Number of bookings')
+    parser.add_argument('--start', help='First booking day in YYYYMMDD format (default: today)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    args = parser.parse_args()
+
+    start = date(int(args.start[:4]), int(args.start[4:6]), int(args.start[6:])) if args.start else None
+    paths = write_dataset(args.out, args.hotels, args.bookings, start, args.seed)
+    print(f"Wrote {paths['hotels']} and {paths['bookings']}")
+
+if __name__ == '__main__':
+    main()
@@ -12,4 +12,16 @@ class ResourceNotFoundError(HotelReservationError):
 
 class DateFormatError(ValidationError):
     """Raised when date format is invalid"""
-    pass 
\ No newline at end of file
+    pass 
+
+class OverbookingError(HotelReservationError):
+    """Raised when a booking would exceed a hotel's room capacity"""
+    pass
+
+class ReloadError(HotelReservationError):
+    """Raised when a reload would discard booking changes"""
+    pass
+
+class UnsupportedStorageError(HotelReservationError):
+    """Raised when an operation is not supported by the booking storage"""
+    pass
@@ -0,0 +1,214 @@
+import json
+import os
+import time
+from typing import Dict, Iterator, Optional
+from .models import ordinal_to_date
+from .store import BookingStore
+
+MANIFEST_SUFFIX = '.manifest'
+
+
+def _fsync_replace(tmp_path: str, path: str) -> None:
+    """Rename tmp_path over path and make the rename durable."""
+    os.replace(tmp_path, path)
+    directory = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    try:
+        os.fsync(directory)
+    except OSError:
+        pass  # Not every platform can fsync a directory
+    finally:
+        os.close(directory)
+
+
+def read_manifest(journal_path: str) -> Optional[Dict]:
+    """
+    Return the journal's compaction manifest, or None if it was never compacted.
+
+    The manifest names the compacted bookings file, the sequence number
+    of the last journal event folded into it and the next free booking
+    id, which cancelled bookings at the end of the store keep taken.
+    """
+    try:
+        with open(journal_path + MANIFEST_SUFFIX) as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return None
+    manifest['snapshot'] = os.path.join(os.path.dirname(os.path.abspath(journal_path)),
+                                        manifest['snapshot'])
+    return manifest
+
+
+class BookingJournal:
+    """
+    Append-only log of booking changes with snapshot compaction.
+
+    Every add, cancel and modify is written as one JSON line carrying a
+    sequence number before it is applied in memory. Writes are made
+    durable in groups: the file is fsynced once per `sync_every` events,
+    or once `sync_interval` seconds have passed since the last fsync,
+    whichever comes first; sync() forces it.
+
+    Compaction writes the live bookings, with their ids, to a new JSON
+    file and then atomically replaces a small manifest naming that file
+    and the last sequence number it contains. The manifest is the commit
+    point: a crash before it is replaced leaves the previous snapshot and
+    the full journal in force, a crash after it only leaves journal
+    entries that replay skips. Startup therefore reads one snapshot plus
+    the events logged since it was written.
+    """
+
+    def __init__(self, path: str, sync_every: int = 1, sync_interval: Optional[float] = None):
+        """
+        Open a journal, creating it if needed.
+
+        A torn last line left by a crash during a write is discarded.
+
+        Args:
+            path: Journal file path
+            sync_every: Number of events written per fsync
+            sync_interval: Optional maximum seconds between fsyncs
+        """
+        self.path = path
+        self.sync_every = max(1, sync_every)
+        self.sync_interval = sync_interval
+        manifest = read_manifest(path)
+        self.snapshot_file: Optional[str] = manifest['snapshot'] if manifest else None
+        self.base_seq: int = manifest['seq'] if manifest else 0
+        self.next_id: int = manifest.get('next_id', 0) if manifest else 0
+        self.seq = max(self.base_seq, self._recover())
+        self.unsynced = 0
+        self._last_sync = time.monotonic()
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def _recover(self) -> int:
+        """Truncate a torn last line and return the last logged sequence number."""
+        try:
+            with open(self.path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return 0
+        complete = data.rfind(b'\n') + 1
+        if complete < len(data):
+            with open(self.path, 'r+b') as f:
+                f.truncate(complete)
+        lines = [line for line in data[:complete].splitlines() if line.strip()]
+        return json.loads(lines[-1])['seq'] if lines else 0
+
+    @property
+    def pending_events(self) -> int:
+        """Number of events not yet folded into a snapshot."""
+        return self.seq - self.base_seq
+
+    def replay(self) -> Iterator[Dict]:
+        """Yield the events logged after the last compaction, in order."""
+        self._file.flush()
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    event = json.loads(line)
+                    if event['seq'] > self.base_seq:
+                        yield event
+
+    def append(self, op: str, booking_id: int, booking: Optional[Dict[str, str]] = None) -> int:
+        """
+        Log one booking change.
+
+        Args:
+            op: 'add', 'cancel' or 'modify'
+            booking_id: Id of the booking changed
+            booking: New booking record for 'add' and 'modify'
+
+        Returns:
+            int: Sequence number of the event
+        """
+        event = {'seq': self.seq + 1, 'op': op, 'id': booking_id}
+        if booking is not None:
+            event['booking'] = booking
+        self._file.write(json.dumps(event) + '\n')
+        self.seq += 1
+        self.unsynced += 1
+        if (self.unsynced >= self.sync_every or
+                (self.sync_interval is not None
+                 and time.monotonic() - self._last_sync >= self.sync_interval)):
+            self.sync()
+        return self.seq
+
+    def sync(self) -> None:
+        """Flush and fsync every event written so far."""
+        self._file.flush()
+        if self.unsynced:
+            os.fsync(self._file.fileno())
+            self.unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def write_snapshot(self, store: BookingStore, seq: int) -> str:
+        """
+        Write the live bookings of store as the snapshot for events up to seq.
+
+        Safe to call without holding up writers as long as store is a copy
+        (see BookingStore.copy); only the final truncate() needs exclusion.
+
+        Returns:
+            str: Path of the new snapshot file
+        """
+        directory = os.path.dirname(os.path.abspath(self.path))
+        name = f"{os.path.basename(self.path)}.{seq}.json"
+        snapshot_path = os.path.join(directory, name)
+        tmp_path = f"{snapshot_path}.tmp{os.getpid()}"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write('[')
+            first = True
+            for index in range(len(store.arrivals)):
+                if index in store.cancelled:
+                    continue
+                record = {
+                    'id': index,
+                    'hotelId': store.hotel_ids[store.hotel_codes[index]],
+                    'arrival': ordinal_to_date(store.arrivals[index]),
+                    'departure': ordinal_to_date(store.departures[index]),
+                    'roomType': store.room_types[store.room_type_codes[index]],
+                    'roomRate': store.room_rates[store.rate_codes[index]],
+                }
+                f.write('\n' if first else ',\n')
+                f.write(json.dumps(record))
+                first = False
+            f.write('\n]\n')
+            f.flush()
+            os.fsync(f.fileno())
+        _fsync_replace(tmp_path, snapshot_path)
+
+        manifest_path = self.path + MANIFEST_SUFFIX
+        tmp_path = f"{manifest_path}.tmp{os.getpid()}"
+        with open(tmp_path, 'w') as f:
+            json.dump({'snapshot': name, 'seq': seq, 'next_id': store.next_id}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        _fsync_replace(tmp_path, manifest_path)
+
+        previous, self.snapshot_file, self.base_seq = self.snapshot_file, snapshot_path, seq
+        self.next_id = store.next_id
+        if previous and previous != snapshot_path:
+            try:
+                os.remove(previous)
+            except OSError:
+                pass
+        return snapshot_path
+
+    def truncate(self) -> None:
+        """Drop journal entries already folded into the current snapshot."""
+        self.sync()
+        self._file.close()
+        with open(self.path, 'rb') as f:
+            lines = [line for line in f if line.strip() and json.loads(line)['seq'] > self.base_seq]
+        tmp_path = f"{self.path}.tmp{os.getpid()}"
+        with open(tmp_path, 'wb') as f:
+            f.writelines(lines)
+            f.flush()
+            os.fsync(f.fileno())
+        _fsync_replace(tmp_path, self.path)
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
@@ -0,0 +1,140 @@
+import codecs
+import json
+import os
+from typing import Any, BinaryIO, Callable, Iterator, Optional
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - optional fast backend
+    ijson = None
+
+ProgressCallback = Callable[[int, int], None]
+
+_WHITESPACE = ' \t\n\r'
+_DELIMITERS = _WHITESPACE + ',]'
+
+
+def iter_json_array(fp: BinaryIO, chunk_size: int = 1 << 16,
+                    progress: Optional[Callable[[int], None]] = None,
+                    backend: Optional[str] = None) -> Iterator[Any]:
+    """
+    Lazily yield the elements of a top-level JSON array.
+
+    Args:
+        fp: File opened in binary mode
+        chunk_size: Number of bytes read per chunk
+        progress: Optional callback receiving the number of bytes read so far
+        backend: 'ijson' or 'stdlib'; defaults to ijson when it is installed
+
+    Yields:
+        Each decoded array element in file order
+
+    Raises:
+        ValueError: If the input is not a well-formed JSON array
+    """
+    if backend is None:
+        backend = 'ijson' if ijson is not None else 'stdlib'
+    if backend == 'ijson':
+        if ijson is None:
+            raise ValueError("ijson backend requested but ijson is not installed")
+        yield from ijson.items(_ProgressReader(fp, progress), 'item')
+    elif backend == 'stdlib':
+        yield from _iter_stdlib(fp, chunk_size, progress)
+    else:
+        raise ValueError(f"Unknown JSON backend: {backend}")
+
+
+class _ProgressReader:
+    """File wrapper reporting the number of bytes read to a callback."""
+
+    def __init__(self, fp: BinaryIO, progress: Optional[Callable[[int], None]]):
+        self.fp = fp
+        self.progress = progress
+        self.bytes_read = 0
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.fp.read(size)
+        self.bytes_read += len(data)
+        if self.progress is not None and data:
+            self.progress(self.bytes_read)
+        return data
+
+
+def _iter_stdlib(fp: BinaryIO, chunk_size: int,
+                 progress: Optional[Callable[[int], None]]) -> Iterator[Any]:
+    reader = _ProgressReader(fp, progress)
+    decoder = json.JSONDecoder()
+    text = codecs.getincrementaldecoder('utf-8')()
+    buffer = ''
+    pos = 0
+    eof = False
+
+    def fill() -> bool:
+        nonlocal buffer, pos, eof
+        if eof:
+            return False
+        chunk = reader.read(chunk_size)
+        eof = not chunk
+        buffer = buffer[pos:] + text.decode(chunk, final=eof)
+        pos = 0
+        return True
+
+    def skip_whitespace() -> str:
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos < len(buffer):
+                return buffer[pos]
+            if not fill():
+                raise ValueError("Unexpected end of JSON input")
+
+    if skip_whitespace() != '[':
+        raise ValueError("Expected a JSON array")
+    pos += 1
+    if skip_whitespace() == ']':
+        return
+
+    while True:
+        skip_whitespace()
+        try:
+            value, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if fill():
+                continue
+            raise
+        if not eof and (end == len(buffer) or buffer[end] not in _DELIMITERS):
+            # A number or literal may continue in the next chunk ("1" of
+            # "1.5"); only trust the value once a delimiter follows it.
+            fill()
+            continue
+        pos = end
+        yield value
+
+        separator = skip_whitespace()
+        pos += 1
+        if separator == ']':
+            return
+        if separator != ',':
+            raise ValueError(f"Expected ',' or ']' in JSON array, got {separator!r}")
+
+
+def iter_json_file(filename: str, progress: Optional[ProgressCallback] = None,
+                   backend: Optional[str] = None) -> Iterator[Any]:
+    """
+    Stream the elements of a JSON array file.
+
+    Args:
+        filename: Path to the JSON file
+        progress: Optional callback receiving (bytes read, total bytes)
+        backend: JSON backend, see iter_json_array
+
+    Yields:
+        Each decoded array element
+    """
+    total = os.path.getsize(filename)
+    report = None
+    if progress is not None:
+        report = lambda done: progress(done, total)
+    with open(filename, 'rb') as f:
+        yield from iter_json_array(f, progress=report, backend=backend)
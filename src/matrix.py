@@ -0,0 +1,76 @@
+from dataclasses import dataclass
+from typing import List, Sequence
+from .models import ordinal_to_date
+from .occupancy import OccupancyIndex
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional fast backend
+    np = None
+
+
+@dataclass
+class AvailabilityMatrix:
+    """Available rooms per hotel, room type and day over [start, end)."""
+    hotel_ids: List[str]
+    room_types: List[str]
+    start: int
+    end: int
+    values: List[List[List[int]]]
+
+    @property
+    def dates(self) -> List[str]:
+        return [ordinal_to_date(day) for day in range(self.start, self.end)]
+
+    def row(self, hotel_id: str, room_type: str) -> List[int]:
+        """Return the daily availability of one (hotel, room type) pair."""
+        return self.values[self.hotel_ids.index(hotel_id)][self.room_types.index(room_type)]
+
+
+def compute_matrix(index: OccupancyIndex, hotel_ids: Sequence[str], room_types: Sequence[str],
+                   start: int, end: int) -> AvailabilityMatrix:
+    """
+    Compute a hotels x room types x days availability matrix.
+
+    With NumPy installed every (hotel, room type) row is one pair of
+    vectorised searchsorted calls over the group's sorted booking ordinals.
+    Without it, or for an index that is not held in memory (see
+    storage.py), each row is expanded from a single sweep of the group.
+
+    Args:
+        index: Occupancy index to read
+        hotel_ids: Hotels, one matrix plane each
+        room_types: Room type codes, one row per hotel each
+        start: First day ordinal
+        end: Day ordinal after the last day
+
+    Returns:
+        AvailabilityMatrix: Availability for every hotel, room type and day
+    """
+    days = max(0, end - start)
+    compute_row = _numpy_row if np is not None and isinstance(index, OccupancyIndex) else _sweep_row
+    values = [
+        [compute_row(index, hotel_id, room_type, start, days) for room_type in room_types]
+        for hotel_id in hotel_ids
+    ]
+    return AvailabilityMatrix(list(hotel_ids), list(room_types), start, start + days, values)
+
+
+def _numpy_row(index: OccupancyIndex, hotel_id: str, room_type: str, start: int, days: int) -> List[int]:
+    rooms = index.room_count(hotel_id, room_type)
+    group = index.groups.get((hotel_id, room_type))
+    if group is None:
+        return [rooms] * days
+    day_ordinals = np.arange(start, start + days, dtype=np.int32)
+    arrivals = np.frombuffer(group.arrivals, dtype=np.int32)
+    departures = np.frombuffer(group.departures, dtype=np.int32)
+    occupied = (np.searchsorted(arrivals, day_ordinals, side='right')
+                - np.searchsorted(departures, day_ordinals, side='right'))
+    return np.maximum(rooms - occupied, 0).tolist()
+
+
+def _sweep_row(index: OccupancyIndex, hotel_id: str, room_type: str, start: int, days: int) -> List[int]:
+    row = [0] * days
+    for first, last, count in index.iter_runs(hotel_id, room_type, start, start + days):
+        row[first - start:last - start + 1] = [count] * (last - first + 1)
+    return row
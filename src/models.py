@@ -1,21 +1,61 @@
+import sys
 from dataclasses import dataclass
-from typing import List, Dict
-from datetime import datetime
+from functools import lru_cache
+from typing import List, Dict, NamedTuple, Tuple
+from datetime import date
+
+@lru_cache(maxsize=65536)
+def date_to_ordinal(date_str: str) -> int:
+    """Convert a YYYYMMDD string to a proleptic Gregorian day ordinal."""
+    return date(int(date_str[:4]), int(date_str[4:6]), int(date_str[6:8])).toordinal()
+
+def ordinal_to_date(ordinal: int) -> str:
+    """Convert a day ordinal back to a YYYYMMDD string."""
+    return date.fromordinal(ordinal).strftime('%Y%m%d')
+
+class Period(NamedTuple):
+    """A run of consecutive nights with the same number of rooms available."""
+    start: int  # day ordinal of the first night
+    end: int    # day ordinal of the last night, inclusive
+    count: int  # rooms available on each night
+
+    @property
+    def start_date(self) -> str:
+        return ordinal_to_date(self.start)
+
+    @property
+    def end_date(self) -> str:
+        return ordinal_to_date(self.end)
+
+# The models declare __slots__ so an instance carries no per-object
+# __dict__. from_dict() interns the low-cardinality fields (ids, room
+# types, rates, amenities, features), so records share one string object
+# per distinct value instead of one per record.
+_intern = sys.intern
 
 @dataclass
 class RoomType:
+    __slots__ = ('code', 'description', 'amenities', 'features')
     code: str
     description: str
     amenities: List[str]
     features: List[str]
 
+    def freeze(self) -> 'FrozenRoomType':
+        return FrozenRoomType(self.code, self.description, tuple(self.amenities), tuple(self.features))
+
 @dataclass
 class Room:
+    __slots__ = ('roomType', 'roomId')
     roomType: str
     roomId: str
 
+    def freeze(self) -> 'FrozenRoom':
+        return FrozenRoom(self.roomType, self.roomId)
+
 @dataclass
 class Hotel:
+    __slots__ = ('id', 'name', 'roomTypes', 'rooms')
     id: str
     name: str
     roomTypes: List[RoomType]
@@ -24,21 +64,26 @@ class Hotel:
     @classmethod
     def from_dict(cls, data: Dict) -> 'Hotel':
         return cls(
-            id=data['id'],
+            id=_intern(data['id']),
             name=data['name'],
             roomTypes=[
                 RoomType(
-                    code=rt['code'],
+                    code=_intern(rt['code']),
                     description=rt['description'],
-                    amenities=rt.get('amenities', []),
-                    features=rt.get('features', [])
+                    amenities=[_intern(amenity) for amenity in rt.get('amenities', [])],
+                    features=[_intern(feature) for feature in rt.get('features', [])]
                 ) for rt in data['roomTypes']
             ],
-            rooms=[Room(**room) for room in data['rooms']]
+            rooms=[Room(_intern(room['roomType']), _intern(room['roomId'])) for room in data['rooms']]
         )
 
+    def freeze(self) -> 'FrozenHotel':
+        return FrozenHotel(self.id, self.name, tuple(rt.freeze() for rt in self.roomTypes),
+                           tuple(room.freeze() for room in self.rooms))
+
 @dataclass
 class Booking:
+    __slots__ = ('hotelId', 'arrival', 'departure', 'roomType', 'roomRate')
     hotelId: str
     arrival: str
     departure: str
@@ -47,4 +92,55 @@ class Booking:
 
     @classmethod
     def from_dict(cls, data: Dict) -> 'Booking':
-        return cls(**data) 
\ No newline at end of file
+        return cls(
+            hotelId=_intern(data['hotelId']),
+            arrival=_intern(data['arrival']),
+            departure=_intern(data['departure']),
+            roomType=_intern(data['roomType']),
+            roomRate=_intern(data['roomRate'])
+        )
+
+    def freeze(self) -> 'FrozenBooking':
+        return FrozenBooking(self.hotelId, self.arrival, self.departure, self.roomType, self.roomRate)
+
+# Immutable, hashable counterparts, e.g. for use as dict keys or for
+# sharing between threads; lists become tuples.
+
+@dataclass(frozen=True)
+class FrozenRoomType:
+    __slots__ = ('code', 'description', 'amenities', 'features')
+    code: str
+    description: str
+    amenities: Tuple[str, ...]
+    features: Tuple[str, ...]
+
+@dataclass(frozen=True)
+class FrozenRoom:
+    __slots__ = ('roomType', 'roomId')
+    roomType: str
+    roomId: str
+
+@dataclass(frozen=True)
+class FrozenHotel:
+    __slots__ = ('id', 'name', 'roomTypes', 'rooms')
+    id: str
+    name: str
+    roomTypes: Tuple[FrozenRoomType, ...]
+    rooms: Tuple[FrozenRoom, ...]
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'FrozenHotel':
+        return Hotel.from_dict(data).freeze()
+
+@dataclass(frozen=True)
+class FrozenBooking:
+    __slots__ = ('hotelId', 'arrival', 'departure', 'roomType', 'roomRate')
+    hotelId: str
+    arrival: str
+    departure: str
+    roomType: str
+    roomRate: str
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'FrozenBooking':
+        return Booking.from_dict(data).freeze()
@@ -0,0 +1,249 @@
+import threading
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from .models import Hotel
+from .runlength import OccupancyCalendar
+from .store import BookingStore
+
+GroupKey = Tuple[str, str]
+
+
+class OccupancyGroup:
+    """Sorted arrival and departure ordinals for one (hotel, room type) pair."""
+
+    def __init__(self):
+        self.arrivals = array('i')
+        self.departures = array('i')
+        # Bookings whose departure is not after their arrival; they can
+        # never cover a single night but may still overlap a date range.
+        self.degenerate: List[Tuple[int, int]] = []
+        # Run-length occupancy, built on the first sweep or capacity check.
+        # The lock keeps a build from reading the arrays while insert() or
+        # remove() changes them.
+        self.calendar: Optional[OccupancyCalendar] = None
+        self._calendar_lock = threading.Lock()
+
+    def add(self, arrival: int, departure: int) -> None:
+        if departure > arrival:
+            self.arrivals.append(arrival)
+            self.departures.append(departure)
+        else:
+            self.degenerate.append((arrival, departure))
+
+    def freeze(self) -> None:
+        self.arrivals = array('i', sorted(self.arrivals))
+        self.departures = array('i', sorted(self.departures))
+
+    def _writable(self) -> None:
+        if not isinstance(self.arrivals, array):
+            # Restored from a snapshot as read-only memoryviews.
+            self.arrivals = array('i', self.arrivals)
+            self.departures = array('i', self.departures)
+
+    def insert(self, arrival: int, departure: int) -> None:
+        """Add a booking to a frozen group, keeping the arrays sorted."""
+        self._writable()
+        with self._calendar_lock:
+            insort(self.arrivals, arrival)
+            insort(self.departures, departure)
+            if self.calendar is not None:
+                self.calendar.add(arrival, departure, 1)
+
+    def remove(self, arrival: int, departure: int) -> None:
+        """Remove a booking previously added to a frozen group."""
+        if departure <= arrival:
+            self.degenerate.remove((arrival, departure))
+            return
+        self._writable()
+        with self._calendar_lock:
+            del self.arrivals[bisect_left(self.arrivals, arrival)]
+            del self.departures[bisect_left(self.departures, departure)]
+            if self.calendar is not None:
+                self.calendar.add(arrival, departure, -1)
+
+    def max_occupancy(self, start: int, end: int) -> int:
+        """
+        Return the highest number of rooms occupied on any night in [start, end).
+
+        Read from the occupancy calendar: a binary search plus one step per
+        change in occupancy within the range.
+        """
+        return self.build_calendar().max(start, end)
+
+    def count_overlapping(self, start: int, end: int) -> int:
+        """Count bookings with arrival < end and departure > start (start < end)."""
+        count = bisect_left(self.arrivals, end) - bisect_right(self.departures, start)
+        if self.degenerate:
+            count += sum(1 for a, d in self.degenerate if a < end and d > start)
+        return count
+
+    def count_overlapping_many(self, ranges: Sequence[Tuple[int, int]]) -> List[int]:
+        """
+        Count overlapping bookings for many ranges in one merged pass.
+
+        Range ends are visited in ascending order, each binary search
+        starting where the previous one stopped, and likewise for range
+        starts; a dense burst therefore walks each array about once
+        instead of searching it from scratch per range.
+
+        Returns:
+            list: count_overlapping(start, end) for each range, in order
+        """
+        counts = [0] * len(ranges)
+        arrivals, departures = self.arrivals, self.departures
+        lo = 0
+        for k in sorted(range(len(ranges)), key=lambda k: ranges[k][1]):
+            lo = bisect_left(arrivals, ranges[k][1], lo)
+            counts[k] = lo
+        lo = 0
+        for k in sorted(range(len(ranges)), key=lambda k: ranges[k][0]):
+            lo = bisect_right(departures, ranges[k][0], lo)
+            counts[k] -= lo
+        if self.degenerate:
+            for k, (start, end) in enumerate(ranges):
+                counts[k] += sum(1 for a, d in self.degenerate if a < end and d > start)
+        return counts
+
+    def build_calendar(self) -> OccupancyCalendar:
+        """Return the run-length occupancy, building it on first use."""
+        calendar = self.calendar
+        if calendar is None:
+            with self._calendar_lock:
+                if self.calendar is None:
+                    self.calendar = OccupancyCalendar.from_sorted(self.arrivals, self.departures)
+                calendar = self.calendar
+        return calendar
+
+    def iter_runs(self, start: int, end: int, rooms: int) -> Iterator[Tuple[int, int, int]]:
+        """
+        Yield availability runs over [start, end) from the occupancy calendar.
+
+        The calendar is built from the sorted arrays on the first call and
+        kept up to date afterwards, so a search costs a binary search plus
+        one step per run, however long the horizon.
+
+        Yields:
+            tuple: (first day, last day, available rooms) for every maximal
+            run of equal, positive availability
+        """
+        for first, last, count in self.build_calendar().runs(start, end):
+            if count < rooms:
+                # Neighbouring runs differ in occupancy, so they differ in availability.
+                yield first, last, rooms - count
+
+
+class OccupancyIndex:
+    """
+    Per-(hotel, room type) occupancy index.
+
+    Bookings are grouped by pair and kept as two independently sorted
+    ordinal arrays, so the number of bookings overlapping any date range
+    is a difference of two binary searches and does not depend on the
+    total booking volume.
+    """
+
+    def __init__(self, hotels: Iterable[Hotel], bookings: BookingStore,
+                 groups: Optional[Dict[GroupKey, OccupancyGroup]] = None):
+        """
+        Build the index.
+
+        Args:
+            hotels: Hotels providing room counts
+            bookings: Booking store to group and sort
+            groups: Prebuilt groups (e.g. restored from a snapshot); when
+                given, bookings are not scanned
+        """
+        self.room_counts: Dict[GroupKey, int] = defaultdict(int)
+        for hotel in hotels:
+            for room in hotel.rooms:
+                self.room_counts[(hotel.id, room.roomType)] += 1
+        self.room_counts = dict(self.room_counts)
+        self.groups = groups if groups is not None else self._build_groups(bookings)
+
+    @staticmethod
+    def _build_groups(bookings: BookingStore) -> Dict[GroupKey, OccupancyGroup]:
+        by_code: Dict[Tuple[int, int], OccupancyGroup] = {}
+        cancelled = bookings.cancelled
+        for index, (hotel_code, room_type_code, arrival, departure) in enumerate(zip(
+                bookings.hotel_codes, bookings.room_type_codes,
+                bookings.arrivals, bookings.departures)):
+            if cancelled and index in cancelled:
+                continue
+            group = by_code.get((hotel_code, room_type_code))
+            if group is None:
+                group = by_code[(hotel_code, room_type_code)] = OccupancyGroup()
+            group.add(arrival, departure)
+
+        groups: Dict[GroupKey, OccupancyGroup] = {}
+        for (hotel_code, room_type_code), group in by_code.items():
+            group.freeze()
+            key = (bookings.hotel_ids[hotel_code], bookings.room_types[room_type_code])
+            groups[key] = group
+        return groups
+
+    def add_booking(self, hotel_id: str, room_type: str, arrival: int, departure: int) -> None:
+        """Add a live booking to its (hotel, room type) group."""
+        group = self.groups.get((hotel_id, room_type))
+        if group is None:
+            group = self.groups[(hotel_id, room_type)] = OccupancyGroup()
+        group.insert(arrival, departure)
+
+    def remove_booking(self, hotel_id: str, room_type: str, arrival: int, departure: int) -> None:
+        """Remove a booking from its (hotel, room type) group."""
+        self.groups[(hotel_id, room_type)].remove(arrival, departure)
+
+    def max_occupancy(self, hotel_id: str, room_type: str, start: int, end: int) -> int:
+        """Return the highest number of rooms occupied on any night in [start, end)."""
+        group = self.groups.get((hotel_id, room_type))
+        if group is None:
+            return 0
+        return group.max_occupancy(start, end)
+
+    def room_count(self, hotel_id: str, room_type: str) -> int:
+        return self.room_counts.get((hotel_id, room_type), 0)
+
+    def count_overlapping(self, hotel_id: str, room_type: str, start: int, end: int) -> int:
+        """
+        Count bookings overlapping the half-open ordinal range [start, end).
+
+        Args:
+            hotel_id: Hotel identifier
+            room_type: Room type code
+            start: First day ordinal
+            end: Day ordinal after the last day
+
+        Returns:
+            int: Number of overlapping bookings
+        """
+        group = self.groups.get((hotel_id, room_type))
+        if group is None:
+            return 0
+        return group.count_overlapping(start, end)
+
+    def count_overlapping_many(self, hotel_id: str, room_type: str,
+                               ranges: Sequence[Tuple[int, int]]) -> List[int]:
+        """Count bookings overlapping each of many half-open ranges, in order."""
+        group = self.groups.get((hotel_id, room_type))
+        if group is None:
+            return [0] * len(ranges)
+        return group.count_overlapping_many(ranges)
+
+    def count_events(self, hotel_id: str, room_type: str, start: int, end: int) -> int:
+        """Count arrivals and departures a sweep over [start, end) visits."""
+        group = self.groups.get((hotel_id, room_type))
+        if group is None:
+            return 0
+        return (bisect_left(group.arrivals, end) - bisect_right(group.arrivals, start)
+                + bisect_left(group.departures, end) - bisect_right(group.departures, start))
+
+    def iter_runs(self, hotel_id: str, room_type: str, start: int, end: int) -> Iterator[Tuple[int, int, int]]:
+        """Yield (first day, last day, available rooms) runs over [start, end)."""
+        rooms = self.room_count(hotel_id, room_type)
+        group = self.groups.get((hotel_id, room_type))
+        if group is None:
+            if rooms > 0 and start < end:
+                yield start, end - 1, rooms
+            return
+        yield from group.iter_runs(start, end, rooms)
@@ -0,0 +1,56 @@
+import json
+from typing import BinaryIO, List
+from .cli import CLI
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+_encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+
+
+def run_pipe(cli: CLI, stdin: BinaryIO, stdout: BinaryIO, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """
+    Answer newline-separated commands from stdin with JSON lines on stdout.
+
+    Input is read in chunks of up to chunk_size bytes, taking whatever is
+    available rather than waiting for a full chunk, so a driver that
+    sends one command and waits for its answer is served at once while a
+    bulk stream is read in large blocks. The answers to one chunk are
+    encoded and written with a single write and flush. Blank lines are
+    skipped; every other line gets exactly one answer, see CLI.execute,
+    tagged with its 1-based input line number.
+
+    Args:
+        cli: CLI to run the commands with
+        stdin: Binary input stream
+        stdout: Binary output stream
+        chunk_size: Maximum bytes read at once
+
+    Returns:
+        int: Number of commands answered
+    """
+    read = getattr(stdin, 'read1', stdin.read)
+    line_number = answered = 0
+    pending = b''
+    while True:
+        chunk = read(chunk_size)
+        if chunk:
+            lines = (pending + chunk).split(b'\n')
+            pending = lines.pop()
+        else:
+            lines, pending = [pending], b''
+        out: List[str] = []
+        for line in lines:
+            line_number += 1
+            command = line.decode('utf-8', errors='replace')
+            if not command.strip():
+                continue
+            response = cli.execute(command)
+            response['line'] = line_number
+            out.append(_encode(response))
+        if out:
+            out.append('')
+            stdout.write('\n'.join(out).encode('utf-8'))
+            stdout.flush()
+            answered += len(out) - 1
+        if not chunk:
+            return answered
@@ -0,0 +1,35 @@
+from array import array
+from typing import Iterator, List, Sequence
+
+
+class SparseTableMin:
+    """
+    Static range-minimum table.
+
+    Level k holds the minimum of every run of 2**k values, so the minimum
+    of any range is the smaller of two overlapping power-of-two runs and
+    costs O(1) after an O(n log n) build.
+    """
+
+    def __init__(self, values: Sequence[int]):
+        self.levels: List[array] = [array('i', values)]
+        span = 1
+        while 2 * span <= len(values):
+            previous = self.levels[-1]
+            self.levels.append(array('i', map(min, previous[:len(previous) - span], previous[span:])))
+            span *= 2
+
+    def __len__(self) -> int:
+        return len(self.levels[0])
+
+    def min(self, start: int, end: int) -> int:
+        """Return the smallest value in [start, end); the range must not be empty."""
+        level = (end - start).bit_length() - 1
+        row = self.levels[level]
+        return min(row[start], row[end - (1 << level)])
+
+    def windows(self, length: int, minimum: int) -> Iterator[int]:
+        """Yield, in order, every start of a length-long window whose values are all >= minimum."""
+        for start in range(len(self) - length + 1):
+            if self.min(start, start + length) >= minimum:
+                yield start
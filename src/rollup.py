@@ -0,0 +1,235 @@
+from array import array
+from dataclasses import dataclass
+from datetime import date
+from itertools import accumulate
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from .models import Booking, date_to_ordinal, ordinal_to_date
+from .store import BookingStore
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional fast backend
+    np = None
+
+# (hotel id, room type, room rate)
+RollupKey = Tuple[str, str, str]
+
+PERIODS = ('day', 'week', 'month')
+
+
+@dataclass
+class RollupRow:
+    """Occupied room-nights of one (hotel, room type, rate) over one period."""
+    period: str
+    start: int
+    end: int
+    hotel_id: str
+    room_type: str
+    room_rate: str
+    room_nights: int
+    capacity: int
+
+    @property
+    def occupancy(self) -> float:
+        """Share of the period's room-nights taken by this rate, in percent."""
+        return 100.0 * self.room_nights / self.capacity if self.capacity else 0.0
+
+
+class DailySeries:
+    """Occupied rooms per night from origin onwards, grown on demand."""
+
+    __slots__ = ('origin', 'counts')
+
+    def __init__(self, origin: int, counts: Optional[array] = None):
+        self.origin = origin
+        self.counts = counts if counts is not None else array('i')
+
+    def add(self, start: int, end: int, delta: int) -> None:
+        """Add delta to every night in [start, end)."""
+        if start < self.origin:
+            self.counts = array('i', [0]) * (self.origin - start) + self.counts
+            self.origin = start
+        if end - self.origin > len(self.counts):
+            self.counts.extend(array('i', [0]) * (end - self.origin - len(self.counts)))
+        for offset in range(start - self.origin, end - self.origin):
+            self.counts[offset] += delta
+
+    def total(self, start: int, end: int) -> int:
+        """Return the occupied room-nights in [start, end)."""
+        first = max(0, start - self.origin)
+        last = min(len(self.counts), end - self.origin)
+        return sum(self.counts[first:last]) if first < last else 0
+
+
+def iter_periods(start: int, end: int, period: str) -> Iterator[Tuple[str, int, int]]:
+    """
+    Split [start, end) into calendar periods.
+
+    Days are labelled YYYYMMDD, ISO weeks (Monday to Sunday) YYYY-Www and
+    months YYYY-MM. The first and last period are clipped to the range.
+
+    Yields:
+        tuple: (label, first day ordinal, day ordinal after the last day)
+    """
+    day = start
+    while day < end:
+        current = date.fromordinal(day)
+        if period == 'day':
+            label, following = ordinal_to_date(day), day + 1
+        elif period == 'week':
+            year, week, weekday = current.isocalendar()
+            label, following = f"{year}-W{week:02d}", day + 8 - weekday
+        elif period == 'month':
+            label = f"{current.year}-{current.month:02d}"
+            next_month = date(current.year + current.month // 12, current.month % 12 + 1, 1)
+            following = next_month.toordinal()
+        else:
+            raise ValueError(f"Unknown period {period}; expected one of {', '.join(PERIODS)}")
+        yield label, day, min(following, end)
+        day = following
+
+
+# Nightly counts per (hotel, room type, rate) code triple, each as
+# (origin, counts) where counts[i] is the night of day origin + i.
+_Nightly = Dict[Tuple[int, int, int], Tuple[int, array]]
+
+
+def _nightly_python(store: BookingStore) -> _Nightly:
+    diffs: Dict[Tuple[int, int, int], Dict[int, int]] = {}
+    for index in range(len(store.arrivals)):
+        arrival, departure = store.arrivals[index], store.departures[index]
+        if departure <= arrival or index in store.cancelled:
+            continue
+        key = (store.hotel_codes[index], store.room_type_codes[index], store.rate_codes[index])
+        diff = diffs.get(key)
+        if diff is None:
+            diff = diffs[key] = {}
+        diff[arrival] = diff.get(arrival, 0) + 1
+        diff[departure] = diff.get(departure, 0) - 1
+    nightly: _Nightly = {}
+    for key, diff in diffs.items():
+        origin, last = min(diff), max(diff)
+        steps = array('i', [0]) * (last - origin)
+        for day, delta in diff.items():
+            if day < last:
+                steps[day - origin] = delta
+        nightly[key] = (origin, array('i', accumulate(steps)))
+    return nightly
+
+
+def _nightly_numpy(store: BookingStore) -> _Nightly:
+    arrivals = np.frombuffer(store.arrivals, dtype=np.int32)
+    departures = np.frombuffer(store.departures, dtype=np.int32)
+    live = departures > arrivals
+    if store.cancelled:
+        live[np.fromiter(store.cancelled, dtype=np.int64)] = False
+    if not live.any():
+        return {}
+    arrivals, departures = arrivals[live], departures[live]
+    codes = np.stack([np.frombuffer(store.hotel_codes, dtype=np.uint32)[live].astype(np.int64),
+                      np.frombuffer(store.room_type_codes, dtype=np.uint16)[live],
+                      np.frombuffer(store.rate_codes, dtype=np.uint16)[live]], axis=1)
+    keys, key_ids = np.unique(codes, axis=0, return_inverse=True)
+    key_ids = key_ids.reshape(-1)
+    origin = int(arrivals.min())
+    span = int(departures.max()) - origin
+    diff = np.zeros((len(keys), span + 1), dtype=np.int32)
+    np.add.at(diff, (key_ids, arrivals - origin), 1)
+    np.add.at(diff, (key_ids, departures - origin), -1)
+    counts = np.cumsum(diff[:, :span], axis=1, dtype=np.int32)
+    return {tuple(int(code) for code in key): (origin, array('i', row.tobytes()))
+            for key, row in zip(keys, counts)}
+
+
+class Rollups:
+    """
+    Materialized occupied room-nights per (hotel, room type, rate) and night.
+
+    Built once from all bookings with a difference array per key: each
+    booking adds +1 on its arrival and -1 on its departure, and a running
+    sum turns that into nightly counts. With NumPy installed the whole
+    store is scattered into one 2-D difference array and summed in a
+    single vectorised pass. Afterwards add() and remove() keep the series
+    current as bookings change, so reports over any period are sums over
+    the stored nights rather than scans of the bookings.
+    """
+
+    def __init__(self):
+        self.series: Dict[RollupKey, DailySeries] = {}
+
+    @classmethod
+    def build(cls, bookings: Iterable[Booking]) -> 'Rollups':
+        """
+        Compute the rollups of every live booking.
+
+        Args:
+            bookings: A BookingStore, read column-wise, or any iterable of
+                Booking objects
+        """
+        if isinstance(bookings, BookingStore):
+            return cls._from_store(bookings)
+        rollups = cls()
+        for booking in bookings:
+            rollups.add(booking.hotelId, booking.roomType, booking.roomRate,
+                        date_to_ordinal(booking.arrival), date_to_ordinal(booking.departure))
+        return rollups
+
+    @classmethod
+    def _from_store(cls, store: BookingStore) -> 'Rollups':
+        build = _nightly_numpy if np is not None else _nightly_python
+        rollups = cls()
+        for (hotel_code, type_code, rate_code), (origin, nights) in build(store).items():
+            key = (store.hotel_ids[hotel_code], store.room_types[type_code], store.room_rates[rate_code])
+            rollups.series[key] = DailySeries(origin, nights)
+        return rollups
+
+    def add(self, hotel_id: str, room_type: str, room_rate: str, start: int, end: int) -> None:
+        """Count a booking's nights."""
+        if end > start:
+            key = (hotel_id, room_type, room_rate)
+            series = self.series.get(key)
+            if series is None:
+                series = self.series[key] = DailySeries(start)
+            series.add(start, end, 1)
+
+    def remove(self, hotel_id: str, room_type: str, room_rate: str, start: int, end: int) -> None:
+        """Stop counting a booking's nights."""
+        if end > start:
+            self.series[(hotel_id, room_type, room_rate)].add(start, end, -1)
+
+    def rates(self, hotel_id: str, room_type: str) -> List[str]:
+        """Return the rates with bookings for a (hotel, room type) pair, sorted."""
+        return sorted(rate for h, rt, rate in self.series if h == hotel_id and rt == room_type)
+
+    def report(self, hotel_ids: Sequence[str], room_types: Dict[str, Sequence[str]],
+               room_counts: Dict[str, Dict[str, int]], start: int, end: int,
+               period: str = 'month') -> List[RollupRow]:
+        """
+        Report occupied room-nights and occupancy per period.
+
+        Args:
+            hotel_ids: Hotels to report on
+            room_types: Room types to report on, per hotel
+            room_counts: Rooms per room type, per hotel
+            start: First day ordinal
+            end: Day ordinal after the last day
+            period: 'day', 'week' or 'month'
+
+        Returns:
+            list: One row per period, hotel, room type and rate with
+            bookings, in that order
+        """
+        periods = list(iter_periods(start, end, period))
+        by_pair: Dict[Tuple[str, str], List[Tuple[str, DailySeries]]] = {}
+        for (hotel_id, room_type, room_rate), series in sorted(self.series.items()):
+            by_pair.setdefault((hotel_id, room_type), []).append((room_rate, series))
+        rows = []
+        for label, first, last in periods:
+            for hotel_id in hotel_ids:
+                counts = room_counts.get(hotel_id, {})
+                for room_type in room_types[hotel_id]:
+                    capacity = counts.get(room_type, 0) * (last - first)
+                    for room_rate, series in by_pair.get((hotel_id, room_type), ()):
+                        rows.append(RollupRow(label, first, last, hotel_id, room_type, room_rate,
+                                              series.total(first, last), capacity))
+        return rows
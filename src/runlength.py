@@ -0,0 +1,106 @@
+from array import array
+from bisect import bisect_right
+from typing import Iterator, Sequence, Tuple
+
+# Before the first day ordinal (1), so the first run covers every earlier day.
+DOMAIN_START = 0
+
+
+class OccupancyCalendar:
+    """
+    Run-length encoded daily occupancy.
+
+    starts[k] is the first day of run k and counts[k] the occupancy on
+    every day up to, not including, starts[k + 1]; the last run extends
+    forever. Adjacent runs always differ, so a calendar costs two ints per
+    change in occupancy instead of one per day, and a ten-year horizon
+    with long steady stretches stays small. A point query is one binary
+    search, O(log runs); a range query is one binary search plus a step
+    per run it covers.
+    """
+
+    def __init__(self):
+        self.starts = array('i', [DOMAIN_START])
+        self.counts = array('i', [0])
+
+    @classmethod
+    def from_sorted(cls, arrivals: Sequence[int], departures: Sequence[int]) -> 'OccupancyCalendar':
+        """
+        Build a calendar from sorted arrival and departure ordinals in one merge.
+
+        Every stay must cover at least one night (departure > arrival).
+        """
+        calendar = cls()
+        starts, counts = calendar.starts, calendar.counts
+        i = j = count = 0
+        n_arr, n_dep = len(arrivals), len(departures)
+        while i < n_arr or j < n_dep:
+            day = min(arrivals[i] if i < n_arr else departures[j],
+                      departures[j] if j < n_dep else arrivals[i])
+            while i < n_arr and arrivals[i] == day:
+                count += 1
+                i += 1
+            while j < n_dep and departures[j] == day:
+                count -= 1
+                j += 1
+            if count != counts[-1]:
+                starts.append(day)
+                counts.append(count)
+        return calendar
+
+    def __len__(self) -> int:
+        """Number of runs."""
+        return len(self.starts)
+
+    def at(self, day: int) -> int:
+        """Return the occupancy on the night of day."""
+        return self.counts[bisect_right(self.starts, day) - 1]
+
+    def runs(self, start: int, end: int) -> Iterator[Tuple[int, int, int]]:
+        """
+        Yield the runs overlapping [start, end), clipped to it.
+
+        Yields:
+            tuple: (first day, last day, occupancy)
+        """
+        k = bisect_right(self.starts, start) - 1
+        first = start
+        while first < end:
+            following = self.starts[k + 1] if k + 1 < len(self.starts) else end
+            last = min(following, end)
+            yield first, last - 1, self.counts[k]
+            first = last
+            k += 1
+
+    def max(self, start: int, end: int) -> int:
+        """Return the highest occupancy over [start, end), or 0 if empty."""
+        return max((count for _, _, count in self.runs(start, end)), default=0)
+
+    def add(self, start: int, end: int, delta: int) -> None:
+        """
+        Add delta to every day in [start, end).
+
+        The runs containing start and end are split at those days, the
+        runs in between are shifted, and neighbours that became equal are
+        merged back together.
+        """
+        if start >= end or not delta:
+            return
+        lo = self._split(start)
+        hi = self._split(end)
+        for k in range(lo, hi):
+            self.counts[k] += delta
+        # Only the edges of the shifted span can now equal a neighbour.
+        for k in (hi, lo):
+            if 0 < k < len(self.starts) and self.counts[k] == self.counts[k - 1]:
+                del self.starts[k]
+                del self.counts[k]
+
+    def _split(self, day: int) -> int:
+        """Make day the start of a run and return that run's index."""
+        k = bisect_right(self.starts, day) - 1
+        if self.starts[k] == day:
+            return k
+        self.starts.insert(k + 1, day)
+        self.counts.insert(k + 1, self.counts[k])
+        return k + 1
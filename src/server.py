@@ -0,0 +1,91 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from .cli import CLI
+
+DEFAULT_MAX_PENDING = 1024
+MAX_LINE_LENGTH = 64 * 1024
+
+
+class CommandServer:
+    """
+    Line-delimited network front end for the CLI command protocol.
+
+    Each request line is one command, answered by exactly one response
+    line; multi-line results have their lines joined with '; '. Commands
+    run on a single compute thread, off the event loop, so the loop keeps
+    serving sockets while a long Search runs and every command sees a
+    consistent HotelManager without locks. At most max_pending commands
+    wait for that thread; further clients stop being read until a slot
+    frees up, which pushes back on senders through TCP flow control.
+    """
+
+    def __init__(self, cli: CLI, max_pending: int = DEFAULT_MAX_PENDING):
+        """
+        Args:
+            cli: CLI wrapping the shared HotelManager
+            max_pending: Maximum number of commands queued for execution
+        """
+        self.cli = cli
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='hotel-command')
+        self._pending: Optional[asyncio.Semaphore] = None
+
+    async def start(self, host: Optional[str] = None, port: Optional[int] = None,
+                    path: Optional[str] = None) -> asyncio.AbstractServer:
+        """
+        Start listening on a TCP address or a Unix socket path.
+
+        Returns:
+            asyncio.AbstractServer: The listening server
+        """
+        self._pending = asyncio.Semaphore(self.max_pending)
+        if path is not None:
+            return await asyncio.start_unix_server(self.handle_client, path=path, limit=MAX_LINE_LENGTH)
+        return await asyncio.start_server(self.handle_client, host, port, limit=MAX_LINE_LENGTH)
+
+    async def execute(self, command: str) -> str:
+        """Run one command on the compute thread and return its result."""
+        async with self._pending:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, self.cli.process_command, command)
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    writer.write(b"Error: Command line too long\n")
+                    break
+                if not line:
+                    break
+                command = line.decode('utf-8', errors='replace').strip()
+                if not command:
+                    continue
+                result = await self.execute(command)
+                writer.write(result.replace('\n', '; ').encode('utf-8') + b'\n')
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+
+
+async def serve(cli: CLI, host: Optional[str] = None, port: Optional[int] = None,
+                path: Optional[str] = None, max_pending: int = DEFAULT_MAX_PENDING) -> None:
+    """Serve the command protocol until cancelled."""
+    server = CommandServer(cli, max_pending)
+    listener = await server.start(host, port, path)
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        server.close()
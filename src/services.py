@@ -1,33 +1,340 @@
 import json
-from datetime import datetime, timedelta
-from typing import List, Tuple
-from .models import Hotel, Booking
-from .exceptions import ResourceNotFoundError
+import os
+import threading
+from datetime import datetime
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+from .models import Hotel, Booking, Period, date_to_ordinal, ordinal_to_date
+from .occupancy import OccupancyIndex
+from .store import BookingStore
+from .loader import ProgressCallback
+from .storage import MemoryStorage, SQLiteStorage, Storage
+from .rangemin import SparseTableMin
+from .assignment import RoomSchedule
+from .audit import EMPTY_STAY, AuditReport, InvalidBooking, find_invalid, find_overbooked
+from .rollup import PERIODS, RollupRow, Rollups
+from .matrix import AvailabilityMatrix, compute_matrix
+from .cache import MISSING, ResultCache
+from .journal import BookingJournal
+from .stats import Stats, deep_sizeof
+from .validators import validate_date_format
+from .exceptions import (OverbookingError, ReloadError, ResourceNotFoundError, UnsupportedStorageError,
+                         ValidationError)
+
+# Longest FindStay horizon, in days; each search lays out one entry per day.
+MAX_HORIZON = 3660
+
+class _State:
+    """
+    One generation of loaded hotels, bookings and the indexes over them.
+
+    Queries read the manager's current state once and use only that
+    object, so a reload that swaps in a new generation never changes the
+    data under a query already running.
+    """
+
+    def __init__(self, hotels: List[Hotel], generation: int):
+        self.generation = generation
+        self.hotels = hotels
+        self.hotels_by_id: Dict[str, Hotel] = {}
+        self.room_types_by_hotel: Dict[str, Set[str]] = {}
+        self.room_counts: Dict[str, Dict[str, int]] = {}
+        for hotel in hotels:
+            if hotel.id in self.hotels_by_id:
+                continue
+            self.hotels_by_id[hotel.id] = hotel
+            self.room_types_by_hotel[hotel.id] = {rt.code for rt in hotel.roomTypes}
+            counts = self.room_counts[hotel.id] = {}
+            for room in hotel.rooms:
+                counts[room.roomType] = counts.get(room.roomType, 0) + 1
+        self.bookings = BookingStore()
+        self.occupancy: Optional[OccupancyIndex] = None
+        # Room-level assignments, built per hotel on first use.
+        self.schedules: Dict[Tuple[str, str], RoomSchedule] = {}
+        # Occupancy and rate-mix rollups, built on the first report.
+        self.rollups: Optional[Rollups] = None
+        # Bookings left out of the indexes by an audited load.
+        self.excluded: List[InvalidBooking] = []
+
 
 class HotelManager:
-    def __init__(self, hotels_file: str, bookings_file: str):
+    def __init__(self, hotels_file: str, bookings_file: str,
+                 progress: Optional[ProgressCallback] = None,
+                 snapshot_file: Optional[str] = None,
+                 hotel_ids: Optional[Iterable[str]] = None,
+                 cache_size: int = 1024,
+                 cache_ttl: Optional[float] = None,
+                 stats: bool = False,
+                 journal_file: Optional[str] = None,
+                 journal_sync_every: int = 1,
+                 compact_after: Optional[int] = 10000,
+                 sqlite_file: Optional[str] = None,
+                 storage: Optional[Storage] = None,
+                 audit: bool = False):
         """
         Initialize HotelManager with data files.
         
         Args:
             hotels_file: Path to hotels JSON file
             bookings_file: Path to bookings JSON file
+            progress: Optional callback receiving (bytes read, total bytes)
+                while the bookings file is streamed in
+            snapshot_file: Optional path of a binary snapshot cache. A valid
+                snapshot is memory-mapped instead of parsing the bookings
+                file; a missing or stale one is rebuilt after loading.
+            hotel_ids: Optional subset of hotels to load; hotels and
+                bookings outside it are skipped. A partial load never
+                writes the snapshot.
+            cache_size: Maximum number of cached availability and search
+                results; 0 disables the cache
+            cache_ttl: Optional lifetime of a cached result in seconds
+            stats: Enable timers and counters, see stats.Stats
+            journal_file: Optional path of a booking journal. Booking
+                changes are logged there before they are applied; on
+                startup the last compacted snapshot is loaded in place of
+                the bookings file and the journal tail is replayed.
+            journal_sync_every: Number of journal events per fsync
+            compact_after: Start a background compaction once this many
+                events are in the journal; None compacts only on request
+            sqlite_file: Optional path of a SQLite database to keep the
+                bookings in instead of memory, see storage.SQLiteStorage.
+                It is filled from the bookings file on first use.
+            storage: Optional Storage to use instead of the ones above
+            audit: Leave bookings with unknown hotels or room types, or
+                with no nights, out of the indexes; they are reported by
+                audit() instead of skewing every query
+
+        Raises:
+            ValueError: If a journal is combined with a hotel_ids subset
+                or audit, or a persistent storage with a journal, snapshot
+                file or audit
         """
-        self.hotels = self._load_hotels(hotels_file)
-        self.bookings = self._load_bookings(bookings_file)
+        self.stats = Stats(enabled=stats)
+        self.cache = ResultCache(cache_size, cache_ttl)
+        self.hotel_ids = set(hotel_ids) if hotel_ids is not None else None
+        if journal_file and self.hotel_ids is not None:
+            raise ValueError("A booking journal requires loading every hotel")
+        self._write_lock = threading.RLock()
+        self._compaction: Optional[threading.Thread] = None
+        # Booking changes kept only in memory, which a reload would drop.
+        self._unjournaled_changes = 0
+        self.compact_after = compact_after
+        if sqlite_file and storage is None:
+            storage = SQLiteStorage(sqlite_file, bookings_file)
+        if storage is not None and storage.persistent and (journal_file or snapshot_file):
+            raise ValueError("A persistent storage cannot be combined with a journal or snapshot file")
+        if audit and (journal_file or (storage is not None and storage.persistent)):
+            # Compaction or the database would make the exclusion permanent.
+            raise ValueError("Invalid bookings can only be excluded from in-memory storage without a journal")
+        self.exclude_invalid = audit
+        self.journal = BookingJournal(journal_file, journal_sync_every) if journal_file else None
+        self.storage = storage or MemoryStorage(hotels_file, bookings_file, snapshot_file,
+                                                self.hotel_ids, self.journal)
+        self.hotels_file = hotels_file
+        self.bookings_file = bookings_file
+        self.snapshot_file = snapshot_file
+        self.reload_error: Optional[Exception] = None
+        self._reload_thread: Optional[threading.Thread] = None
+        self._watch_stop: Optional[threading.Event] = None
+        self._state = self._build_state(0, progress)
 
-    def _load_hotels(self, filename: str) -> List[Hotel]:
-        with open(filename) as f:
-            data = json.load(f)
-            return [Hotel.from_dict(hotel) for hotel in data]
+    @property
+    def hotels(self) -> List[Hotel]:
+        return self._state.hotels
+
+    @property
+    def hotels_by_id(self) -> Dict[str, Hotel]:
+        return self._state.hotels_by_id
+
+    @property
+    def room_types_by_hotel(self) -> Dict[str, Set[str]]:
+        return self._state.room_types_by_hotel
+
+    @property
+    def room_counts(self) -> Dict[str, Dict[str, int]]:
+        return self._state.room_counts
+
+    @property
+    def bookings(self) -> BookingStore:
+        return self._state.bookings
+
+    @property
+    def occupancy(self) -> OccupancyIndex:
+        return self._state.occupancy
+
+    def _build_state(self, generation: int, progress: Optional[ProgressCallback] = None) -> _State:
+        """Load the source files into a new, unpublished state."""
+        state = self._load_state(generation, progress)
+        self._replay_journal(state)
+        return state
+
+    def _load_state(self, generation: int, progress: Optional[ProgressCallback] = None) -> _State:
+        """Load the hotels and the stored bookings, without the journal tail."""
+        state = _State(self._load_hotels(self.hotels_file), generation)
+        state.bookings, state.occupancy = self.storage.open(state.hotels, progress)
+        if self.exclude_invalid:
+            self._exclude_invalid(state)
+        return state
+
+    def _replay_journal(self, state: _State) -> None:
+        if self.journal:
+            for event in self.journal.replay():
+                self._apply_event(state, event)
+
+    def _exclude_invalid(self, state: _State) -> None:
+        """Tombstone invalid bookings and take them out of the occupancy index."""
+        store = state.bookings
+        state.excluded = find_invalid(store, state.room_types_by_hotel)
+        for item in state.excluded:
+            if item.reason == EMPTY_STAY:
+                state.occupancy.remove_booking(item.hotel_id, item.room_type,
+                                               store.arrivals[item.booking_id],
+                                               store.departures[item.booking_id])
+            else:
+                # Every booking of an unknown pair is invalid; drop the whole group.
+                state.occupancy.groups.pop((item.hotel_id, item.room_type), None)
+            store.cancel(item.booking_id)
+
+    def audit(self, workers: Optional[int] = None) -> AuditReport:
+        """
+        Check all bookings for broken references and overbooked nights.
+
+        References are validated in one pass over the booking columns.
+        Each (hotel, room type) pair's sorted arrivals and departures are
+        then swept for nights with more bookings than rooms, hotels being
+        spread over a process pool. Booking changes wait for the audit.
+
+        Args:
+            workers: Number of worker processes; defaults to the CPU count
 
-    def _load_bookings(self, filename: str) -> List[Booking]:
+        Returns:
+            AuditReport: Invalid bookings, including those excluded at
+            load, and overbooked runs of nights
+
+        Raises:
+            UnsupportedStorageError: If the bookings are not held in memory
+        """
+        if self.storage.persistent:
+            raise UnsupportedStorageError("Auditing needs in-memory storage")
+        with self._write_lock:
+            state = self._state
+            invalid = sorted(state.excluded + find_invalid(state.bookings, state.room_types_by_hotel),
+                             key=lambda item: item.booking_id)
+            groups = {key: group for key, group in state.occupancy.groups.items()
+                      if key[1] in state.room_types_by_hotel.get(key[0], ())}
+            overbooked = find_overbooked(groups, state.occupancy.room_counts, workers)
+            self.stats.increment('audit.invalid', len(invalid))
+            self.stats.increment('audit.overbooked', len(overbooked))
+            return AuditReport(len(state.bookings) + len(state.excluded), invalid, overbooked)
+
+    def reload(self, wait: bool = True) -> None:
+        """
+        Reload the hotels and bookings files on a background thread.
+
+        The new state is built while queries keep running against the
+        current one and is then published with a single reference swap,
+        so a query sees either the old data or the new data, never a mix.
+        The files are read without holding the write lock; only replaying
+        the journal tail on top of the new bookings and the swap itself
+        hold it, so booking changes are neither lost nor applied to the
+        wrong generation. If the new files cannot be loaded, the current
+        state stays in place and the error is kept in reload_error. A
+        reload requested while one is running joins it.
+
+        Without a journal, booking changes live only in memory and a
+        reload would drop them, so it is refused once any have been made.
+
+        Args:
+            wait: Block until the reload has finished
+
+        Raises:
+            ReloadError: If unjournaled booking changes would be lost
+            Exception: With wait=True, whatever made the reload fail
+        """
+        with self._write_lock:
+            if self._unjournaled_changes:
+                self.stats.increment('reload.refused')
+                raise ReloadError(f"{self._unjournaled_changes} booking change(s) are not journaled "
+                                  "and would be lost; use a journal to reload with changes")
+            thread = self._reload_thread
+            if thread is None or not thread.is_alive():
+                thread = threading.Thread(target=self._reload, name='hotel-reload', daemon=True)
+                self._reload_thread = thread
+                thread.start()
+        if wait:
+            thread.join()
+            if self.reload_error is not None:
+                raise self.reload_error
+
+    def _reload(self) -> None:
+        while True:
+            compaction = self._compaction
+            if compaction is not None:
+                # A compaction replaces the journal's snapshot file; let it finish first.
+                compaction.join()
+            try:
+                state = self._load_state(self._state.generation + 1)
+            except Exception as e:
+                self.reload_error = e
+                self.stats.increment('reload.failed')
+                return
+            with self._write_lock:
+                if self._compaction is not compaction:
+                    # The loaded bookings may predate the new snapshot; load again.
+                    continue
+                try:
+                    self._replay_journal(state)
+                except Exception as e:
+                    self.reload_error = e
+                    self.stats.increment('reload.failed')
+                    return
+                self._state = state
+                self.reload_error = None
+            self.cache.clear()
+            self.stats.increment('reload.completed')
+            return
+
+    def watch(self, interval: float = 2.0) -> None:
+        """
+        Poll the source files and reload whenever one of them changes.
+
+        Args:
+            interval: Seconds between checks
+        """
+        if self._watch_stop is not None:
+            return
+        self._watch_stop = threading.Event()
+        threading.Thread(target=self._watch, args=(interval, self._watch_stop),
+                         name='hotel-watch', daemon=True).start()
+
+    def _source_stamps(self) -> List[Optional[Tuple[int, int]]]:
+        stamps = []
+        for filename in (self.hotels_file, self.bookings_file):
+            try:
+                stat = os.stat(filename)
+                stamps.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                stamps.append(None)
+        return stamps
+
+    def _watch(self, interval: float, stop: threading.Event) -> None:
+        stamps = self._source_stamps()
+        while not stop.wait(interval):
+            current = self._source_stamps()
+            if current != stamps and None not in current:
+                stamps = current
+                try:
+                    self.reload()
+                except Exception:
+                    pass  # Kept in reload_error; the old data stays live
+
+    def _load_hotels(self, filename: str) -> List[Hotel]:
         with open(filename) as f:
             data = json.load(f)
-            return [Booking.from_dict(booking) for booking in data]
-
-    def _parse_date(self, date_str: str) -> datetime:
-        return datetime.strptime(date_str, '%Y%m%d')
+            return [
+                Hotel.from_dict(hotel) for hotel in data
+                if self.hotel_ids is None or hotel['id'] in self.hotel_ids
+            ]
 
     def check_availability(self, hotel_id: str, date_str: str, room_type: str) -> int:
         """
@@ -43,29 +350,378 @@ class HotelManager:
             
         Raises:
             ResourceNotFoundError: If hotel is not found
+            ValidationError: If the date range ends before it starts
+        """
+        state = self._state
+        with self.stats.timer('phase.lookup'):
+            start, end = self._parse_range(date_str)
+
+            counts = state.room_counts.get(hotel_id)
+            if counts is None:
+                raise ResourceNotFoundError(f"Hotel {hotel_id} not found")
+
+            key = ('availability', state.generation, hotel_id, room_type, start, end)
+            result = self.cache.get(key)
+        if result is MISSING:
+            version = self.cache.version((hotel_id, room_type))
+            with self.stats.timer('phase.compute'):
+                total_rooms = counts.get(room_type, 0)
+                overlapping_bookings = state.occupancy.count_overlapping(hotel_id, room_type, start, end)
+                result = max(0, total_rooms - overlapping_bookings)
+            self.cache.put(key, result, (hotel_id, room_type), version)
+        return result
+
+    def check_availability_many(self, queries: Iterable[Tuple[str, str, str]]) -> List[int]:
+        """
+        Check availability for a burst of queries in one pass.
+
+        Queries are grouped by (hotel, room type) and each group's date
+        ranges are answered by a single merged sweep over its sorted
+        bookings, see OccupancyGroup.count_overlapping_many. Cached
+        results are reused and new ones cached as in check_availability.
+        
+        Args:
+            queries: (hotel_id, date_str, room_type) tuples
+            
+        Returns:
+            list: Number of available rooms per query, in input order
+            
+        Raises:
+            ResourceNotFoundError: If a hotel is not found
+            ValidationError: If a date range ends before it starts
+        """
+        state = self._state
+        results: List[int] = []
+        pending: Dict[Tuple[str, str], List[Tuple[int, Tuple]]] = {}
+        with self.stats.timer('phase.lookup'):
+            for index, (hotel_id, date_str, room_type) in enumerate(queries):
+                start, end = self._parse_range(date_str)
+                if hotel_id not in state.room_counts:
+                    raise ResourceNotFoundError(f"Hotel {hotel_id} not found")
+                key = ('availability', state.generation, hotel_id, room_type, start, end)
+                result = self.cache.get(key)
+                results.append(result)
+                if result is MISSING:
+                    pending.setdefault((hotel_id, room_type), []).append((index, key))
+        with self.stats.timer('phase.compute'):
+            for (hotel_id, room_type), items in pending.items():
+                version = self.cache.version((hotel_id, room_type))
+                total_rooms = state.room_counts[hotel_id].get(room_type, 0)
+                ranges = [key[-2:] for _, key in items]
+                counts = state.occupancy.count_overlapping_many(hotel_id, room_type, ranges)
+                for (index, key), overlapping in zip(items, counts):
+                    results[index] = max(0, total_rooms - overlapping)
+                    self.cache.put(key, results[index], (hotel_id, room_type), version)
+        return results
+
+    def availability_matrix(self, date_str: str, room_types: Sequence[str],
+                            hotel_ids: Optional[Sequence[str]] = None) -> AvailabilityMatrix:
         """
+        Compute availability for many hotels and room types in one query.
+        
+        Args:
+            date_str: Date or date range in YYYYMMDD format; a range
+                covers the nights from its start up to, not including, its end
+            room_types: Room type codes to include
+            hotel_ids: Hotels to include; all hotels if None
+            
+        Returns:
+            AvailabilityMatrix: Available rooms per hotel, room type and day
+            
+        Raises:
+            ResourceNotFoundError: If a requested hotel is not found
+            ValidationError: If the date range ends before it starts
+        """
+        state = self._state
+        start, end = self._parse_range(date_str)
+        if hotel_ids is None:
+            hotel_ids = list(state.hotels_by_id)
+        for hotel_id in hotel_ids:
+            if hotel_id not in state.hotels_by_id:
+                raise ResourceNotFoundError(f"Hotel {hotel_id} not found")
+        return compute_matrix(state.occupancy, hotel_ids, room_types, start, end)
+
+    def _parse_range(self, date_str: str) -> Tuple[int, int]:
+        """Parse a date or date range into a half-open ordinal range."""
         if '-' in date_str:
-            start_date, end_date = map(self._parse_date, date_str.split('-'))
+            start, end = map(date_to_ordinal, date_str.split('-'))
+            if end < start:
+                raise ValidationError("End date must not be before start date")
+            return start, end
+        start = date_to_ordinal(date_str)
+        return start, start + 1
+
+    def add_booking(self, hotel_id: str, arrival: str, departure: str,
+                    room_type: str, room_rate: str) -> int:
+        """
+        Add a booking, rejecting it if it would overbook the room type.
+        
+        Args:
+            hotel_id: Hotel identifier
+            arrival: Arrival date in YYYYMMDD format
+            departure: Departure date in YYYYMMDD format
+            room_type: Room type code
+            room_rate: Rate code, e.g. Prepaid or Standard
+            
+        Returns:
+            int: Id of the new booking
+            
+        Raises:
+            ResourceNotFoundError: If hotel is not found
+            ValidationError: If the room type or dates are invalid
+            OverbookingError: If a night in the stay has no free room
+        """
+        with self._write_lock:
+            start, end = self._validate_stay(hotel_id, arrival, departure, room_type)
+            self._check_capacity(hotel_id, room_type, start, end)
+            booking_id = self.bookings.next_id
+            self._log('add', booking_id, {'hotelId': hotel_id, 'arrival': arrival, 'departure': departure,
+                                          'roomType': room_type, 'roomRate': room_rate})
+            self._apply_add(self._state, booking_id, hotel_id, room_type, start, end, room_rate)
+            self._maybe_compact()
+        return booking_id
+
+    def cancel_booking(self, booking_id: int) -> None:
+        """
+        Cancel a booking.
+        
+        Args:
+            booking_id: Booking id returned by add_booking or the load order
+            
+        Raises:
+            ResourceNotFoundError: If the booking does not exist or is already cancelled
+        """
+        with self._write_lock:
+            self._get_booking(booking_id)
+            self._log('cancel', booking_id)
+            self._apply_cancel(self._state, booking_id)
+            self._maybe_compact()
+
+    def modify_booking(self, booking_id: int, arrival: str, departure: str,
+                       room_type: Optional[str] = None, room_rate: Optional[str] = None) -> None:
+        """
+        Change the dates, room type or rate of a booking, keeping its id.
+        
+        The booking is left untouched if the new stay would overbook.
+        
+        Args:
+            booking_id: Booking id
+            arrival: New arrival date in YYYYMMDD format
+            departure: New departure date in YYYYMMDD format
+            room_type: New room type code; unchanged if None
+            room_rate: New rate code; unchanged if None
+            
+        Raises:
+            ResourceNotFoundError: If the booking does not exist
+            ValidationError: If the room type or dates are invalid
+            OverbookingError: If a night in the new stay has no free room
+        """
+        with self._write_lock:
+            booking = self._get_booking(booking_id)
+            room_type = room_type or booking.roomType
+            room_rate = room_rate or booking.roomRate
+            start, end = self._validate_stay(booking.hotelId, arrival, departure, room_type)
+            old_start, old_end = date_to_ordinal(booking.arrival), date_to_ordinal(booking.departure)
+
+            self.occupancy.remove_booking(booking.hotelId, booking.roomType, old_start, old_end)
+            try:
+                self._check_capacity(booking.hotelId, room_type, start, end)
+                self._log('modify', booking_id, {'hotelId': booking.hotelId, 'arrival': arrival,
+                                                 'departure': departure, 'roomType': room_type,
+                                                 'roomRate': room_rate})
+            except Exception:
+                self.occupancy.add_booking(booking.hotelId, booking.roomType, old_start, old_end)
+                self._bookings_changed(booking.hotelId, booking.roomType)
+                raise
+            self._apply_modify(self._state, booking_id, booking, room_type, start, end, room_rate)
+            self._maybe_compact()
+
+    def _apply_add(self, state: _State, booking_id: int, hotel_id: str, room_type: str,
+                   start: int, end: int, room_rate: str) -> None:
+        state.bookings.skip_to(booking_id)
+        state.bookings.append_row(hotel_id, room_type, start, end, room_rate)
+        state.occupancy.add_booking(hotel_id, room_type, start, end)
+        schedule = state.schedules.get((hotel_id, room_type))
+        if schedule is not None:
+            schedule.assign(booking_id, start, end)
+        if state.rollups is not None:
+            state.rollups.add(hotel_id, room_type, room_rate, start, end)
+        self._bookings_changed(hotel_id, room_type)
+
+    def _apply_cancel(self, state: _State, booking_id: int) -> None:
+        booking = state.bookings[booking_id]
+        start, end = date_to_ordinal(booking.arrival), date_to_ordinal(booking.departure)
+        state.occupancy.remove_booking(booking.hotelId, booking.roomType, start, end)
+        schedule = state.schedules.get((booking.hotelId, booking.roomType))
+        if schedule is not None:
+            schedule.release(booking_id)
+        if state.rollups is not None:
+            state.rollups.remove(booking.hotelId, booking.roomType, booking.roomRate, start, end)
+        self._bookings_changed(booking.hotelId, booking.roomType)
+        state.bookings.cancel(booking_id)
+
+    def _apply_modify(self, state: _State, booking_id: int, booking: Booking, room_type: str,
+                      start: int, end: int, room_rate: str) -> None:
+        """Store a modified booking whose old stay is already out of the occupancy index."""
+        state.occupancy.add_booking(booking.hotelId, room_type, start, end)
+        old_schedule = state.schedules.get((booking.hotelId, booking.roomType))
+        if old_schedule is not None:
+            old_schedule.release(booking_id)
+        new_schedule = state.schedules.get((booking.hotelId, room_type))
+        if new_schedule is not None:
+            new_schedule.assign(booking_id, start, end)
+        if state.rollups is not None:
+            state.rollups.remove(booking.hotelId, booking.roomType, booking.roomRate,
+                                 date_to_ordinal(booking.arrival), date_to_ordinal(booking.departure))
+            state.rollups.add(booking.hotelId, room_type, room_rate, start, end)
+        self._bookings_changed(booking.hotelId, booking.roomType)
+        self._bookings_changed(booking.hotelId, room_type)
+        state.bookings.update_row(booking_id, booking.hotelId, room_type, start, end, room_rate)
+
+    def _apply_event(self, state: _State, event: Dict) -> None:
+        """Apply one replayed journal event; capacity was checked when it was logged."""
+        booking_id = event['id']
+        if event['op'] == 'cancel':
+            self._apply_cancel(state, booking_id)
+            return
+        record = event['booking']
+        start, end = date_to_ordinal(record['arrival']), date_to_ordinal(record['departure'])
+        if event['op'] == 'add':
+            self._apply_add(state, booking_id, record['hotelId'], record['roomType'],
+                            start, end, record['roomRate'])
         else:
-            start_date = self._parse_date(date_str)
-            end_date = start_date + timedelta(days=1)
+            booking = state.bookings[booking_id]
+            state.occupancy.remove_booking(booking.hotelId, booking.roomType,
+                                           date_to_ordinal(booking.arrival),
+                                           date_to_ordinal(booking.departure))
+            self._apply_modify(state, booking_id, booking, record['roomType'], start, end,
+                               record['roomRate'])
 
-        hotel = next((h for h in self.hotels if h.id == hotel_id), None)
-        if not hotel:
-            raise ResourceNotFoundError(f"Hotel {hotel_id} not found")
+    def _log(self, op: str, booking_id: int, booking: Optional[Dict[str, str]] = None) -> None:
+        """Write a booking change to the journal, if any, before it is applied."""
+        if self.journal is None:
+            if not self.storage.persistent:
+                self._unjournaled_changes += 1
+            return
+        self.journal.append(op, booking_id, booking)
 
-        total_rooms = sum(1 for room in hotel.rooms if room.roomType == room_type)
-        overlapping_bookings = sum(
-            1 for booking in self.bookings
-            if (booking.hotelId == hotel_id and
-                booking.roomType == room_type and
-                self._parse_date(booking.arrival) < end_date and
-                self._parse_date(booking.departure) > start_date)
-        )
+    def _maybe_compact(self) -> None:
+        """Start a background compaction once the journal has grown past compact_after."""
+        if self.journal and self.compact_after and self.journal.pending_events >= self.compact_after:
+            self.compact_journal(wait=False)
 
-        return max(0, total_rooms - overlapping_bookings)
+    def compact_journal(self, wait: bool = True) -> None:
+        """
+        Fold the journal into a new bookings snapshot.
+
+        The live bookings are copied under the write lock and written out
+        on a background thread, so writers only wait for the copy and the
+        final journal truncation. A compaction already in progress is
+        reused rather than started twice.
 
-    def search_availability(self, hotel_id: str, days: int, room_type: str) -> str:
+        Args:
+            wait: Block until the compaction has finished
+        """
+        if self.journal is None:
+            return
+        with self._write_lock:
+            thread = self._compaction
+            if thread is None or not thread.is_alive():
+                self.journal.sync()
+                thread = threading.Thread(target=self._compact,
+                                          args=(self.bookings.copy(), self.journal.seq),
+                                          name='journal-compaction', daemon=True)
+                self._compaction = thread
+                thread.start()
+        if wait:
+            thread.join()
+
+    def _compact(self, store: BookingStore, seq: int) -> None:
+        try:
+            self.journal.write_snapshot(store, seq)
+            with self._write_lock:
+                self.journal.truncate()
+        except OSError:
+            pass  # The journal still holds every event; compaction is retried later
+
+    def close(self) -> None:
+        """Stop watching, wait for a running compaction, flush the journal and close the storage."""
+        if self._watch_stop is not None:
+            self._watch_stop.set()
+        if self._compaction is not None:
+            self._compaction.join()
+        with self._write_lock:
+            if self.journal is not None:
+                self.journal.close()
+            self.storage.close()
+
+    def _bookings_changed(self, hotel_id: str, room_type: str) -> None:
+        """Drop derived results that depend on the given (hotel, room type) group."""
+        self.cache.invalidate(hotel_id, room_type)
+
+    def cache_stats(self) -> Dict[str, int]:
+        """Return the result cache's size, hit, miss and eviction counters."""
+        return self.cache.stats()
+
+    def stats_report(self) -> str:
+        """Return timers, counters and cache statistics as text."""
+        extra = {f"cache.{name}": value for name, value in self.cache_stats().items()}
+        return self.stats.report(extra)
+
+    def memory_report(self) -> Dict[str, float]:
+        """
+        Measure the memory held by the loaded hotels and bookings.
+
+        Hotels are measured first, so strings they share with the booking
+        store, such as interned hotel ids and room types, count once and
+        toward the hotels. Booking bytes include the occupancy index.
+
+        Returns:
+            dict: hotels, hotel_bytes, bytes_per_hotel, bookings,
+            booking_bytes and bytes_per_booking
+        """
+        state = self._state
+        seen: Set[int] = set()
+        hotel_bytes = deep_sizeof(state.hotels, seen)
+        booking_bytes = deep_sizeof(state.bookings, seen)
+        if state.occupancy is not state.bookings:
+            booking_bytes += deep_sizeof(state.occupancy, seen)
+        hotels, bookings = len(state.hotels), len(state.bookings)
+        return {
+            'hotels': hotels,
+            'hotel_bytes': hotel_bytes,
+            'bytes_per_hotel': hotel_bytes / hotels if hotels else 0.0,
+            'bookings': bookings,
+            'booking_bytes': booking_bytes,
+            'bytes_per_booking': booking_bytes / bookings if bookings else 0.0,
+        }
+
+    def _get_booking(self, booking_id: int) -> Booking:
+        if not self.bookings.is_active(booking_id):
+            raise ResourceNotFoundError(f"Booking {booking_id} not found")
+        return self.bookings[booking_id]
+
+    def _validate_stay(self, hotel_id: str, arrival: str, departure: str,
+                       room_type: str) -> Tuple[int, int]:
+        if hotel_id not in self.hotels_by_id:
+            raise ResourceNotFoundError(f"Hotel {hotel_id} not found")
+        if room_type not in self.room_types_by_hotel[hotel_id]:
+            raise ValidationError(f"Room type {room_type} not found in hotel {hotel_id}")
+        validate_date_format(arrival)
+        validate_date_format(departure)
+        start, end = date_to_ordinal(arrival), date_to_ordinal(departure)
+        if end <= start:
+            raise ValidationError("Departure must be after arrival")
+        return start, end
+
+    def _check_capacity(self, hotel_id: str, room_type: str, start: int, end: int) -> None:
+        rooms = self.room_counts[hotel_id].get(room_type, 0)
+        if self.occupancy.max_occupancy(hotel_id, room_type, start, end) >= rooms:
+            raise OverbookingError(
+                f"No {room_type} room available in hotel {hotel_id} for the whole stay")
+
+    def search_availability(self, hotel_id: str, days: int, room_type: str,
+                            limit: Optional[int] = None, until: Optional[str] = None) -> str:
         """
         Search for available rooms over a period.
         
@@ -73,58 +729,241 @@ class HotelManager:
             hotel_id: Hotel identifier
             days: Number of days to search
             room_type: Room type code
+            limit: Maximum number of periods to list; all when None
+            until: Last night (YYYYMMDD) to search, if before the end of days
             
         Returns:
             str: Formatted string showing availability periods
+
+        Raises:
+            ResourceNotFoundError: If hotel is not found
+            DateFormatError: If until is not a valid date
         """
-        start_date = datetime.now()
-        end_date = start_date + timedelta(days=days)
-        available_periods = []
-        current_period_start = None
-        current_count = 0
-
-        current_date = start_date
-        while current_date < end_date:
-            date_str = current_date.strftime('%Y%m%d')
-            availability = self.check_availability(hotel_id, date_str, room_type)
-
-            if availability > 0:
-                if current_period_start is None:
-                    current_period_start = current_date
-                    current_count = availability
-                elif availability != current_count:
-                    if current_period_start:
-                        available_periods.append(self._format_period(
-                            current_period_start,
-                            current_date - timedelta(days=1),
-                            current_count
-                        ))
-                    current_period_start = current_date
-                    current_count = availability
-            else:
-                if current_period_start is not None:
-                    available_periods.append(self._format_period(
-                        current_period_start,
-                        current_date - timedelta(days=1),
-                        current_count
-                    ))
-                    current_period_start = None
-
-            current_date += timedelta(days=1)
-
-        if current_period_start is not None:
-            available_periods.append(self._format_period(
-                current_period_start,
-                current_date - timedelta(days=1),
-                current_count
-            ))
-
-        return ', '.join(available_periods)
-
-    def _format_period(self, start_date: datetime, end_date: datetime, count: int) -> str:
-        """Format a single availability period."""
-        start_str = start_date.strftime('%Y%m%d')
-        end_str = end_date.strftime('%Y%m%d')
-        if start_str == end_str:
+        state = self._state
+        with self.stats.timer('phase.lookup'):
+            if hotel_id not in state.hotels_by_id:
+                raise ResourceNotFoundError(f"Hotel {hotel_id} not found")
+
+            start = self._today()
+            end = self._search_end(start, days, until)
+            key = ('search', state.generation, hotel_id, room_type, start, end, limit)
+            result = self.cache.get(key)
+        if result is MISSING:
+            version = self.cache.version((hotel_id, room_type))
+            with self.stats.timer('phase.compute'):
+                periods = list(self._iter_periods(state, hotel_id, room_type, start, end, limit))
+            if self.stats.enabled:
+                # A limited search stops at the end of its last period.
+                scanned = periods[-1].end + 1 if limit is not None and len(periods) == limit else end
+                self.stats.increment('bookings_scanned',
+                                     state.occupancy.count_events(hotel_id, room_type, start, scanned))
+            with self.stats.timer('phase.format'):
+                result = ', '.join(self._format_period(*period) for period in periods)
+            self.cache.put(key, result, (hotel_id, room_type), version)
+        return result
+
+    def iter_availability(self, hotel_id: str, days: int, room_type: str,
+                          limit: Optional[int] = None, until: Optional[str] = None) -> Iterator[Period]:
+        """
+        Lazily yield the availability periods search_availability lists.
+
+        Periods are produced one at a time from the occupancy calendar, so
+        a caller that stops early, or passes a limit, never pays for the
+        rest of the horizon. Results are not cached.
+
+        Args:
+            hotel_id: Hotel identifier
+            days: Number of days to search
+            room_type: Room type code
+            limit: Stop after this many periods; no limit when None
+            until: Last night (YYYYMMDD) to search, if before the end of days
+
+        Returns:
+            iterator: Period(start, end, count) objects in date order
+
+        Raises:
+            ResourceNotFoundError: If hotel is not found
+            DateFormatError: If until is not a valid date
+        """
+        state = self._state
+        if hotel_id not in state.hotels_by_id:
+            raise ResourceNotFoundError(f"Hotel {hotel_id} not found")
+        start = self._today()
+        return self._iter_periods(state, hotel_id, room_type, start,
+                                  self._search_end(start, days, until), limit)
+
+    @staticmethod
+    def _search_end(start: int, days: int, until: Optional[str]) -> int:
+        """Return the day after the last night a search covers."""
+        end = start + days
+        if until is not None:
+            validate_date_format(until)
+            end = min(end, date_to_ordinal(until) + 1)
+        return end
+
+    def _iter_periods(self, state: _State, hotel_id: str, room_type: str, start: int, end: int,
+                      limit: Optional[int]) -> Iterator[Period]:
+        runs = state.occupancy.iter_runs(hotel_id, room_type, start, end)
+        return map(Period._make, islice(runs, limit))
+
+    def find_stays(self, hotel_id: str, nights: int, room_type: str, min_rooms: int,
+                   horizon: int = 365, limit: int = 1) -> List[Tuple[str, str, int]]:
+        """
+        Find the earliest stays of consecutive nights with enough rooms free.
+
+        Daily availability over the horizon is laid out from the occupancy
+        sweep and indexed by a sparse range-minimum table, so each candidate
+        arrival day is checked in constant time.
+        
+        Args:
+            hotel_id: Hotel identifier
+            nights: Length of the stay in nights
+            room_type: Room type code
+            min_rooms: Rooms that must be free on every night of the stay
+            horizon: Number of days from today the stay must fit in, at
+                most MAX_HORIZON
+            limit: Maximum number of stays to return
+            
+        Returns:
+            list: (arrival, departure, fewest rooms free on any night) for
+            the earliest qualifying arrival days, in date order
+            
+        Raises:
+            ResourceNotFoundError: If hotel is not found
+            ValidationError: If horizon exceeds MAX_HORIZON
+        """
+        state = self._state
+        if hotel_id not in state.hotels_by_id:
+            raise ResourceNotFoundError(f"Hotel {hotel_id} not found")
+        if horizon > MAX_HORIZON:
+            raise ValidationError(f"Horizon must be at most {MAX_HORIZON} days")
+        start = self._today()
+        key = ('stays', state.generation, hotel_id, room_type, start, nights, min_rooms, horizon, limit)
+        result = self.cache.get(key)
+        if result is MISSING:
+            version = self.cache.version((hotel_id, room_type))
+            daily = [0] * horizon
+            for first, last, count in state.occupancy.iter_runs(hotel_id, room_type, start, start + horizon):
+                daily[first - start:last - start + 1] = [count] * (last - first + 1)
+            table = SparseTableMin(daily)
+            result = []
+            for offset in table.windows(nights, min_rooms):
+                result.append((ordinal_to_date(start + offset), ordinal_to_date(start + offset + nights),
+                               table.min(offset, offset + nights)))
+                if len(result) >= limit:
+                    break
+            self.cache.put(key, result, (hotel_id, room_type), version)
+        return result
+
+    def room_schedule(self, hotel_id: str, room_type: str) -> RoomSchedule:
+        """
+        Return the room-level assignment of a hotel's bookings of one room type.
+
+        The first call for a hotel scans the booking store once and assigns
+        the bookings of all its room types (see RoomSchedule.build); the
+        schedules are then kept up to date as bookings change.
+
+        Raises:
+            ResourceNotFoundError: If hotel is not found
+        """
+        with self._write_lock:
+            state = self._state
+            hotel = state.hotels_by_id.get(hotel_id)
+            if hotel is None:
+                raise ResourceNotFoundError(f"Hotel {hotel_id} not found")
+            if (hotel_id, room_type) not in state.schedules:
+                self._build_schedules(state, hotel)
+            return state.schedules[(hotel_id, room_type)]
+
+    def _build_schedules(self, state: _State, hotel: Hotel) -> None:
+        room_ids: Dict[str, List[str]] = {rt.code: [] for rt in hotel.roomTypes}
+        for room in hotel.rooms:
+            room_ids.setdefault(room.roomType, []).append(room.roomId)
+        stays: Dict[str, List[Tuple[int, int, int]]] = {room_type: [] for room_type in room_ids}
+        for booking_id, room_type, arrival, departure in state.bookings.iter_stays(hotel.id):
+            stays.setdefault(room_type, []).append((booking_id, arrival, departure))
+        for room_type, group_stays in stays.items():
+            state.schedules[(hotel.id, room_type)] = RoomSchedule.build(
+                room_ids.get(room_type, ()), group_stays)
+
+    def occupancy_report(self, date_str: str, period: str = 'month',
+                         hotel_ids: Optional[Sequence[str]] = None,
+                         room_types: Optional[Sequence[str]] = None) -> List[RollupRow]:
+        """
+        Report occupied room-nights and occupancy by rate over calendar periods.
+
+        The first report builds the rollups of all bookings in one pass
+        (see rollup.Rollups); they are then kept up to date as bookings
+        change, so later reports only sum stored nightly counts.
+
+        Args:
+            date_str: Date or date range in YYYYMMDD format; a range
+                covers the nights from its start up to, not including, its end
+            period: 'day', 'week' or 'month'
+            hotel_ids: Hotels to include; all hotels if None
+            room_types: Room type codes to include; all of each hotel's if None
+
+        Returns:
+            list: One RollupRow per period, hotel, room type and rate
+
+        Raises:
+            ResourceNotFoundError: If a requested hotel is not found
+            ValidationError: If the period is unknown or the range ends before it starts
+        """
+        if period not in PERIODS:
+            raise ValidationError(f"Period must be one of {', '.join(PERIODS)}")
+        start, end = self._parse_range(date_str)
+        with self._write_lock:
+            state = self._state
+            if hotel_ids is None:
+                hotel_ids = list(state.hotels_by_id)
+            for hotel_id in hotel_ids:
+                if hotel_id not in state.hotels_by_id:
+                    raise ResourceNotFoundError(f"Hotel {hotel_id} not found")
+            if state.rollups is None:
+                with self.stats.timer('phase.rollup'):
+                    state.rollups = Rollups.build(state.bookings)
+            types = {hotel_id: list(room_types) if room_types is not None
+                     else sorted(state.room_types_by_hotel[hotel_id]) for hotel_id in hotel_ids}
+            return state.rollups.report(hotel_ids, types, state.room_counts, start, end, period)
+
+    def room_of_booking(self, booking_id: int) -> Optional[str]:
+        """
+        Return the room a booking is assigned to.
+
+        Returns:
+            str: Room id, or None if no room could take the booking
+
+        Raises:
+            ResourceNotFoundError: If the booking does not exist
+        """
+        booking = self._get_booking(booking_id)
+        return self.room_schedule(booking.hotelId, booking.roomType).room_for(booking_id)
+
+    def room_occupancy(self, hotel_id: str, date_str: str, room_type: str) -> Dict[str, Optional[int]]:
+        """
+        Map each room of a type to the booking occupying it on a night.
+
+        Args:
+            hotel_id: Hotel identifier
+            date_str: Date in YYYYMMDD format
+            room_type: Room type code
+
+        Returns:
+            dict: Booking id per room id, None for free rooms
+
+        Raises:
+            ResourceNotFoundError: If hotel is not found
+        """
+        return self.room_schedule(hotel_id, room_type).occupancy(date_to_ordinal(date_str))
+
+    def _today(self) -> int:
+        """Return today's day ordinal; the search horizon starts here."""
+        return datetime.now().toordinal()
+
+    def _format_period(self, start: int, end: int, count: int) -> str:
+        """Format a single availability period given first and last day ordinals."""
+        start_str = ordinal_to_date(start)
+        if start == end:
             return f"({start_str}, {count})"
-        return f"({start_str}-{end_str}, {count})" 
\ No newline at end of file
+        return f"({start_str}-{ordinal_to_date(end)}, {count})" 
\ No newline at end of file
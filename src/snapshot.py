@@ -0,0 +1,162 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Dict, List, Optional, Tuple
+from .occupancy import GroupKey, OccupancyGroup
+from .store import BookingStore, StringTable
+
+MAGIC = b'HRSNAP01'
+VERSION = 3
+_HEADER_LENGTH = struct.Struct('<Q')
+_ALIGNMENT = 8
+_SAMPLE_BYTES = 1 << 20
+
+_COLUMNS = ('hotel_codes', 'room_type_codes', 'rate_codes', 'arrivals', 'departures')
+
+
+def source_key(filename: str) -> Dict:
+    """
+    Identify the current contents of a source file.
+
+    The key combines size, modification time and a BLAKE2 digest of the
+    first and last MiB, which catches in-place edits that preserve mtime
+    without reading a multi-GB file in full on every start.
+    """
+    stat = os.stat(filename)
+    digest = hashlib.blake2b(digest_size=16)
+    with open(filename, 'rb') as f:
+        digest.update(f.read(_SAMPLE_BYTES))
+        if stat.st_size > _SAMPLE_BYTES:
+            f.seek(max(_SAMPLE_BYTES, stat.st_size - _SAMPLE_BYTES))
+            digest.update(f.read(_SAMPLE_BYTES))
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'hash': digest.hexdigest()}
+
+
+def save_snapshot(path: str, sources: List[str], store: BookingStore,
+                  groups: Dict[GroupKey, OccupancyGroup]) -> None:
+    """
+    Write the booking columns and occupancy groups to a binary snapshot.
+
+    The file is written next to its final location, fsynced and renamed
+    into place, so readers never observe a partially written snapshot. The
+    header records the body length, so a file torn after the rename (for
+    example by a crash before the data reached the disk) is rejected.
+
+    Args:
+        path: Snapshot file path
+        sources: Source files the snapshot is derived from
+        store: Booking store to persist
+        groups: Occupancy groups to persist
+    """
+    buffers = []
+    offset = 0
+
+    def place(values) -> List:
+        nonlocal offset
+        data = values.tobytes()
+        entry = [offset, values.typecode, len(values)]
+        buffers.append(data + b'\0' * (-len(data) % _ALIGNMENT))
+        offset += len(buffers[-1])
+        return entry
+
+    columns = {name: place(getattr(store, name)) for name in _COLUMNS}
+    columns['cancelled'] = place(array('i', sorted(store.cancelled)))
+    group_entries = [
+        [hotel_id, room_type, place(group.arrivals), place(group.departures), group.degenerate]
+        for (hotel_id, room_type), group in groups.items()
+    ]
+    header = json.dumps({
+        'version': VERSION,
+        'byteorder': sys.byteorder,
+        'sources': {os.path.abspath(source): source_key(source) for source in sources},
+        'tables': {
+            'hotel_ids': store.hotel_ids.values,
+            'room_types': store.room_types.values,
+            'room_rates': store.room_rates.values,
+        },
+        'columns': columns,
+        'groups': group_entries,
+        'body_length': offset,
+    }).encode('utf-8')
+    header += b' ' * (-(len(MAGIC) + _HEADER_LENGTH.size + len(header)) % _ALIGNMENT)
+
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(_HEADER_LENGTH.pack(len(header)))
+        f.write(header)
+        for data in buffers:
+            f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def load_snapshot(path: str, sources: List[str]) -> Optional[Tuple[BookingStore, Dict[GroupKey, OccupancyGroup]]]:
+    """
+    Map a snapshot into memory if it is still valid for its sources.
+
+    Columns and group arrays are memoryviews over the mapped file, so no
+    booking data is copied or decoded.
+
+    Args:
+        path: Snapshot file path
+        sources: Source files the snapshot must match
+
+    Returns:
+        tuple: (BookingStore, groups), or None if the snapshot is missing,
+        unreadable or stale
+    """
+    try:
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+    view = memoryview(mapped)
+    prefix = len(MAGIC) + _HEADER_LENGTH.size
+    if len(view) < prefix or view[:len(MAGIC)] != MAGIC:
+        return None
+    (header_length,) = _HEADER_LENGTH.unpack(view[len(MAGIC):prefix])
+    try:
+        header = json.loads(bytes(view[prefix:prefix + header_length]))
+        expected = {os.path.abspath(source): source_key(source) for source in sources}
+    except (ValueError, OSError):
+        return None
+    if (header.get('version') != VERSION or header.get('byteorder') != sys.byteorder
+            or header.get('sources') != expected):
+        return None
+    body = view[prefix + header_length:]
+    if len(body) != header.get('body_length'):
+        return None  # Truncated or torn
+
+    def column(entry):
+        start, typecode, length = entry
+        width = struct.calcsize(typecode)
+        if start < 0 or length < 0 or start + length * width > len(body):
+            raise ValueError(f"Snapshot entry {entry} lies outside the body")
+        return body[start:start + length * width].cast(typecode)
+
+    try:
+        store = BookingStore()
+        store.hotel_ids = StringTable(header['tables']['hotel_ids'])
+        store.room_types = StringTable(header['tables']['room_types'])
+        store.room_rates = StringTable(header['tables']['room_rates'])
+        for name in _COLUMNS:
+            setattr(store, name, column(header['columns'][name]))
+        store.cancelled = set(column(header['columns']['cancelled']))
+
+        groups: Dict[GroupKey, OccupancyGroup] = {}
+        for hotel_id, room_type, arrivals, departures, degenerate in header['groups']:
+            group = OccupancyGroup()
+            group.arrivals = column(arrivals)
+            group.departures = column(departures)
+            group.degenerate = [tuple(pair) for pair in degenerate]
+            groups[(hotel_id, room_type)] = group
+    except (KeyError, TypeError, ValueError, struct.error):
+        return None
+    return store, groups
@@ -0,0 +1,207 @@
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Set
+
+
+class Histogram:
+    """
+    Latency histogram with power-of-two nanosecond buckets.
+
+    Recording is an int.bit_length() and a list increment, so it is cheap
+    enough for per-command use; percentiles are reported as the upper
+    bound of the bucket they fall in.
+    """
+
+    def __init__(self):
+        self.buckets: List[int] = [0] * 64
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns: Optional[int] = None
+        self.max_ns = 0
+
+    def record(self, elapsed_ns: int) -> None:
+        self.buckets[min(63, elapsed_ns.bit_length())] += 1
+        self.count += 1
+        self.total_ns += elapsed_ns
+        if self.min_ns is None or elapsed_ns < self.min_ns:
+            self.min_ns = elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+
+    def percentile(self, fraction: float) -> int:
+        """Return an upper bound in nanoseconds for the given percentile."""
+        if not self.count:
+            return 0
+        rank = fraction * self.count
+        seen = 0
+        for index, bucket in enumerate(self.buckets):
+            seen += bucket
+            if bucket and seen >= rank:
+                return min(self.max_ns, (1 << index) - 1)
+        return self.max_ns
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            'count': self.count,
+            'mean_us': self.total_ns / self.count / 1000 if self.count else 0.0,
+            'min_us': (self.min_ns or 0) / 1000,
+            'p50_us': self.percentile(0.50) / 1000,
+            'p99_us': self.percentile(0.99) / 1000,
+            'max_us': self.max_ns / 1000,
+        }
+
+
+class StatsHook:
+    """Exporter interface; subclasses receive every recorded measurement."""
+
+    def on_timing(self, name: str, elapsed_ns: int) -> None:
+        pass
+
+    def on_count(self, name: str, amount: int) -> None:
+        pass
+
+
+class _Timer:
+    __slots__ = ('stats', 'name', 'started')
+
+    def __init__(self, stats: 'Stats', name: str):
+        self.stats = stats
+        self.name = name
+
+    def __enter__(self) -> '_Timer':
+        self.started = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stats.record(self.name, time.perf_counter_ns() - self.started)
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self) -> '_NullTimer':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def deep_sizeof(obj: object, seen: Optional[Set[int]] = None) -> int:
+    """
+    Return the bytes held by obj and everything it references.
+
+    Objects reachable more than once, such as interned strings shared by
+    many records, are counted once per `seen` set; pass the same set to
+    several calls to measure them together. Memory-mapped buffers are
+    counted at their full size.
+    """
+    if seen is None:
+        seen = set()
+    total = 0
+    stack = [obj]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        if isinstance(obj, memoryview):
+            total += sys.getsizeof(obj) + obj.nbytes
+            continue
+        total += sys.getsizeof(obj)
+        if isinstance(obj, (str, bytes, int, float, bool, type(None))):
+            continue
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        if hasattr(obj, '__dict__'):
+            stack.append(obj.__dict__)
+        for cls in type(obj).__mro__:
+            for name in getattr(cls, '__slots__', ()):
+                if hasattr(obj, name):
+                    stack.append(getattr(obj, name))
+    return total
+
+
+class Stats:
+    """
+    Timers and counters for commands and their phases.
+
+    When disabled, timer() returns a shared no-op context manager and
+    increment() returns immediately, so instrumented code pays one
+    attribute check per call site.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.timers: Dict[str, Histogram] = {}
+        self.counters: Dict[str, int] = {}
+        self.hooks: List[StatsHook] = []
+        self._lock = threading.Lock()
+
+    def timer(self, name: str):
+        """Return a context manager timing its body under name."""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name)
+
+    def record(self, name: str, elapsed_ns: int) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self.timers.get(name)
+            if histogram is None:
+                histogram = self.timers[name] = Histogram()
+            histogram.record(elapsed_ns)
+        for hook in self.hooks:
+            hook.on_timing(name, elapsed_ns)
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+        for hook in self.hooks:
+            hook.on_count(name, amount)
+
+    def add_hook(self, hook: StatsHook) -> None:
+        self.hooks.append(hook)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.timers.clear()
+            self.counters.clear()
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Return timer summaries and counter values."""
+        with self._lock:
+            return {
+                'timers': {name: h.summary() for name, h in sorted(self.timers.items())},
+                'counters': dict(sorted(self.counters.items())),
+            }
+
+    def report(self, extra: Optional[Dict[str, int]] = None) -> str:
+        """
+        Format the current numbers as text.
+
+        Args:
+            extra: Additional counters to include, e.g. cache statistics
+        """
+        if not self.enabled:
+            return "Statistics are disabled; start with --stats to enable them"
+        data = self.snapshot()
+        lines = []
+        for name, summary in data['timers'].items():
+            lines.append(
+                f"{name}: count={summary['count']} mean={summary['mean_us']:.1f}us "
+                f"p50<={summary['p50_us']:.1f}us p99<={summary['p99_us']:.1f}us "
+                f"max={summary['max_us']:.1f}us")
+        counters = dict(data['counters'])
+        counters.update(extra or {})
+        lines.extend(f"{name}: {value}" for name, value in counters.items())
+        return '\n'.join(lines)
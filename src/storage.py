@@ -0,0 +1,391 @@
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+from .journal import BookingJournal
+from .loader import ProgressCallback, iter_json_file
+from .models import Booking, Hotel, date_to_ordinal, ordinal_to_date
+from .occupancy import GroupKey, OccupancyGroup, OccupancyIndex
+from .snapshot import load_snapshot, save_snapshot
+from .store import BookingStore
+
+# (booking id, room type, arrival ordinal, departure ordinal)
+HotelStay = Tuple[int, str, int, int]
+
+DEFAULT_BATCH_SIZE = 10000
+
+
+class Storage(ABC):
+    """
+    Where a HotelManager keeps its bookings.
+
+    open() returns a (bookings, occupancy) pair for one state generation.
+    `bookings` offers the BookingStore row API used by the manager:
+    next_id, append_row, update_row, cancel, skip_to, is_active,
+    iter_stays, indexing, len() and iteration. `occupancy` offers the
+    OccupancyIndex query API: room_count, count_overlapping,
+    count_overlapping_many, count_events, iter_runs, max_occupancy,
+    add_booking and remove_booking. The two may be the same object.
+    """
+
+    # Whether booking changes survive a restart without a journal.
+    persistent = False
+
+    @abstractmethod
+    def open(self, hotels: List[Hotel], progress: Optional[ProgressCallback] = None):
+        """Return the (bookings, occupancy) pair for a new state generation."""
+
+    def close(self) -> None:
+        """Release resources held across generations."""
+
+
+class MemoryStorage(Storage):
+    """Bookings parsed from the JSON file into columnar arrays, optionally via a snapshot."""
+
+    def __init__(self, hotels_file: str, bookings_file: str, snapshot_file: Optional[str] = None,
+                 hotel_ids: Optional[Set[str]] = None, journal: Optional[BookingJournal] = None):
+        """
+        Args:
+            hotels_file: Path to hotels JSON file, part of the snapshot key
+            bookings_file: Path to bookings JSON file
+            snapshot_file: Optional binary snapshot cache, see snapshot.py
+            hotel_ids: Optional subset of hotels whose bookings are loaded
+            journal: Optional journal; its compacted snapshot replaces the
+                bookings file once one exists
+        """
+        self.hotels_file = hotels_file
+        self.bookings_file = bookings_file
+        self.snapshot_file = snapshot_file
+        self.hotel_ids = hotel_ids
+        self.journal = journal
+
+    def open(self, hotels: List[Hotel],
+             progress: Optional[ProgressCallback] = None) -> Tuple[BookingStore, OccupancyIndex]:
+        bookings_file = self.bookings_file
+        if self.journal and self.journal.snapshot_file:
+            bookings_file = self.journal.snapshot_file
+        sources = [self.hotels_file, bookings_file]
+        restored = load_snapshot(self.snapshot_file, sources) if self.snapshot_file else None
+        if restored:
+            store, groups = restored
+            occupancy = OccupancyIndex(hotels, store, groups)
+        else:
+            store = BookingStore()
+            for record in iter_json_file(bookings_file, progress):
+                if self.hotel_ids is None or record['hotelId'] in self.hotel_ids:
+                    store.append_record(record)
+            occupancy = OccupancyIndex(hotels, store)
+            if self.snapshot_file and self.hotel_ids is None:
+                try:
+                    save_snapshot(self.snapshot_file, sources, store, occupancy.groups)
+                except OSError:
+                    pass  # The snapshot is only a cache; run without it
+        if self.journal and self.journal.next_id > store.next_id:
+            # The compacted snapshot omits cancelled bookings; keep their ids taken.
+            store.skip_to(self.journal.next_id)
+        return store, occupancy
+
+
+class SQLiteStorage(Storage):
+    """
+    Bookings kept in a local SQLite database instead of memory.
+
+    The database is created and filled from the bookings JSON file on
+    first use; from then on it is the source of truth and booking changes
+    are committed to it directly.
+    """
+
+    persistent = True
+
+    def __init__(self, path: str, bookings_file: str, batch_size: int = DEFAULT_BATCH_SIZE):
+        """
+        Args:
+            path: Database file path
+            bookings_file: Bookings JSON file imported into a new database
+            batch_size: Records inserted per transaction during the import
+        """
+        self.path = path
+        self.bookings_file = bookings_file
+        self.batch_size = batch_size
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def open(self, hotels: List[Hotel],
+             progress: Optional[ProgressCallback] = None) -> Tuple['SQLiteBookings', 'SQLiteBookings']:
+        # Every generation shares one connection, so a reload neither opens
+        # another nor pulls the database from under queries on the old one.
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            if _meta(conn, 'imported') is None:
+                import_bookings(conn, self.bookings_file, self.batch_size, progress)
+            self._conn = conn
+        bookings = SQLiteBookings(self._conn, hotels)
+        return bookings, bookings
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS bookings (
+    id INTEGER PRIMARY KEY,
+    hotel_id TEXT NOT NULL,
+    room_type TEXT NOT NULL,
+    arrival INTEGER NOT NULL,
+    departure INTEGER NOT NULL,
+    room_rate TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+# Covers every occupancy query, so they never touch the table itself.
+_INDEX = ("CREATE INDEX IF NOT EXISTS bookings_occupancy "
+          "ON bookings (hotel_id, room_type, arrival, departure)")
+
+
+@contextmanager
+def _transaction(conn: sqlite3.Connection):
+    conn.execute("BEGIN")
+    try:
+        yield
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+def _meta(conn: sqlite3.Connection, key: str) -> Optional[int]:
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+
+def _set_meta(conn: sqlite3.Connection, key: str, value: int) -> None:
+    conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+
+def import_bookings(conn: sqlite3.Connection, filename: str, batch_size: int = DEFAULT_BATCH_SIZE,
+                    progress: Optional[ProgressCallback] = None) -> int:
+    """
+    Bulk-load a bookings JSON file into an empty database.
+
+    Records are streamed from the file and inserted batch_size at a time,
+    one transaction per batch. The occupancy index is created after the
+    load, which is much faster than maintaining it row by row. An
+    interrupted import is discarded and redone on the next open.
+
+    Returns:
+        int: Number of bookings imported
+    """
+    conn.execute("DROP INDEX IF EXISTS bookings_occupancy")
+    conn.execute("DELETE FROM bookings")
+    insert = "INSERT INTO bookings VALUES (?, ?, ?, ?, ?, ?)"
+    rows: List[Tuple] = []
+    next_id = count = 0
+
+    def flush() -> None:
+        with _transaction(conn):
+            conn.executemany(insert, rows)
+        rows.clear()
+
+    for record in iter_json_file(filename, progress):
+        booking_id = record.get('id', next_id)
+        rows.append((booking_id, record['hotelId'], record['roomType'],
+                     date_to_ordinal(record['arrival']), date_to_ordinal(record['departure']),
+                     record['roomRate']))
+        next_id = booking_id + 1
+        count += 1
+        if len(rows) >= batch_size:
+            flush()
+    if rows:
+        flush()
+
+    with _transaction(conn):
+        conn.execute(_INDEX)
+        max_stay = conn.execute("SELECT MAX(departure - arrival) FROM bookings").fetchone()[0]
+        _set_meta(conn, 'next_id', next_id)
+        _set_meta(conn, 'max_stay', max(0, max_stay or 0))
+        _set_meta(conn, 'imported', 1)
+    conn.execute("ANALYZE")
+    return count
+
+
+class SQLiteBookings:
+    """
+    Booking rows and occupancy queries served from a SQLite database.
+
+    Counting is pushed down into SQL as an index-only range scan. A
+    booking overlaps [start, end) only if it arrives before end and no
+    earlier than start minus the longest stay on record, so the scan is
+    bounded by the query window rather than the length of the history.
+    Sweeps load just the bookings overlapping their window into a
+    temporary OccupancyGroup and reuse its in-memory algorithms.
+
+    remove_booking() and add_booking() do not write rows; they only
+    hide or restore a booking in occupancy results while the manager
+    checks a modification, as the in-memory index does. Row changes go
+    through append_row(), update_row() and cancel().
+    """
+
+    def __init__(self, conn: sqlite3.Connection, hotels: Iterable[Hotel]):
+        self.conn = conn
+        self._lock = threading.RLock()
+        self.room_counts: Dict[GroupKey, int] = {}
+        for hotel in hotels:
+            for room in hotel.rooms:
+                key = (hotel.id, room.roomType)
+                self.room_counts[key] = self.room_counts.get(key, 0) + 1
+        self._next_id = _meta(conn, 'next_id') or 0
+        self._max_stay = _meta(conn, 'max_stay') or 0
+        self._hidden: Dict[GroupKey, List[Tuple[int, int]]] = {}
+
+    # Row API
+
+    @property
+    def next_id(self) -> int:
+        return self._next_id
+
+    def skip_to(self, index: int) -> None:
+        if index < self._next_id:
+            raise ValueError(f"Booking {index} already exists")
+        self._next_id = index
+
+    def append_row(self, hotel_id: str, room_type: str, arrival: int, departure: int, room_rate: str) -> int:
+        with self._lock:
+            booking_id = self._next_id
+            with _transaction(self.conn):
+                self.conn.execute("INSERT INTO bookings VALUES (?, ?, ?, ?, ?, ?)",
+                                  (booking_id, hotel_id, room_type, arrival, departure, room_rate))
+                _set_meta(self.conn, 'next_id', booking_id + 1)
+                self._note_stay(arrival, departure)
+            self._next_id = booking_id + 1
+            return booking_id
+
+    def update_row(self, index: int, hotel_id: str, room_type: str, arrival: int,
+                   departure: int, room_rate: str) -> None:
+        with self._lock:
+            old = self._row(index)
+            with _transaction(self.conn):
+                self.conn.execute(
+                    "UPDATE bookings SET hotel_id = ?, room_type = ?, arrival = ?, departure = ?, room_rate = ? "
+                    "WHERE id = ?", (hotel_id, room_type, arrival, departure, room_rate, index))
+                self._note_stay(arrival, departure)
+            self._unhide(old)
+
+    def cancel(self, index: int) -> None:
+        with self._lock:
+            old = self._row(index)
+            self.conn.execute("DELETE FROM bookings WHERE id = ?", (index,))
+            self._unhide(old)
+
+    def is_active(self, index: int) -> bool:
+        return self._row(index) is not None
+
+    def iter_stays(self, hotel_id: str) -> Iterator[HotelStay]:
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT id, room_type, arrival, departure FROM bookings WHERE hotel_id = ? ORDER BY id",
+                (hotel_id,)).fetchall()
+        return iter(rows)
+
+    def _row(self, index: int) -> Optional[Tuple]:
+        with self._lock:
+            return self.conn.execute(
+                "SELECT hotel_id, room_type, arrival, departure, room_rate FROM bookings WHERE id = ?",
+                (index,)).fetchone()
+
+    def _note_stay(self, arrival: int, departure: int) -> None:
+        if departure - arrival > self._max_stay:
+            self._max_stay = departure - arrival
+            _set_meta(self.conn, 'max_stay', self._max_stay)
+
+    def __getitem__(self, index: int) -> Booking:
+        row = self._row(index)
+        if row is None:
+            raise IndexError(f"Booking {index} not found")
+        hotel_id, room_type, arrival, departure, room_rate = row
+        return Booking(hotel_id, ordinal_to_date(arrival), ordinal_to_date(departure), room_type, room_rate)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM bookings").fetchone()[0]
+
+    def __iter__(self) -> Iterator[Booking]:
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT hotel_id, arrival, departure, room_type, room_rate FROM bookings ORDER BY id").fetchall()
+        for hotel_id, arrival, departure, room_type, room_rate in rows:
+            yield Booking(hotel_id, ordinal_to_date(arrival), ordinal_to_date(departure), room_type, room_rate)
+
+    # Occupancy API
+
+    def room_count(self, hotel_id: str, room_type: str) -> int:
+        return self.room_counts.get((hotel_id, room_type), 0)
+
+    def add_booking(self, hotel_id: str, room_type: str, arrival: int, departure: int) -> None:
+        self._unhide((hotel_id, room_type, arrival, departure))
+
+    def remove_booking(self, hotel_id: str, room_type: str, arrival: int, departure: int) -> None:
+        self._hidden.setdefault((hotel_id, room_type), []).append((arrival, departure))
+
+    def _unhide(self, row: Optional[Tuple]) -> None:
+        if row is None:
+            return
+        hidden = self._hidden.get((row[0], row[1]))
+        if hidden and (row[2], row[3]) in hidden:
+            hidden.remove((row[2], row[3]))
+
+    def count_overlapping(self, hotel_id: str, room_type: str, start: int, end: int) -> int:
+        """Count bookings overlapping [start, end) with one index-only SQL count."""
+        with self._lock:
+            count = self.conn.execute(
+                "SELECT COUNT(*) FROM bookings WHERE hotel_id = ? AND room_type = ? "
+                "AND arrival >= ? AND arrival < ? AND departure > ?",
+                (hotel_id, room_type, start - self._max_stay, end, start)).fetchone()[0]
+        hidden = self._hidden.get((hotel_id, room_type))
+        if hidden:
+            count -= sum(1 for a, d in hidden if a < end and d > start)
+        return count
+
+    def _window(self, hotel_id: str, room_type: str, start: int, end: int) -> OccupancyGroup:
+        """Load the bookings overlapping [start, end) into a frozen group."""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT arrival, departure FROM bookings WHERE hotel_id = ? AND room_type = ? "
+                "AND arrival >= ? AND arrival < ? AND departure > ?",
+                (hotel_id, room_type, start - self._max_stay, end, start)).fetchall()
+        hidden = list(self._hidden.get((hotel_id, room_type), ()))
+        group = OccupancyGroup()
+        for arrival, departure in rows:
+            if hidden and (arrival, departure) in hidden:
+                hidden.remove((arrival, departure))
+                continue
+            group.add(arrival, departure)
+        group.freeze()
+        return group
+
+    def count_overlapping_many(self, hotel_id: str, room_type: str,
+                               ranges: Sequence[Tuple[int, int]]) -> List[int]:
+        if not ranges:
+            return []
+        group = self._window(hotel_id, room_type, min(start for start, _ in ranges),
+                             max(end for _, end in ranges))
+        return group.count_overlapping_many(ranges)
+
+    def count_events(self, hotel_id: str, room_type: str, start: int, end: int) -> int:
+        group = self._window(hotel_id, room_type, start, end)
+        return sum(1 for day in group.arrivals if start < day < end) + \
+            sum(1 for day in group.departures if start < day < end)
+
+    def iter_runs(self, hotel_id: str, room_type: str, start: int, end: int) -> Iterator[Tuple[int, int, int]]:
+        group = self._window(hotel_id, room_type, start, end)
+        return group.iter_runs(start, end, self.room_count(hotel_id, room_type))
+
+    def max_occupancy(self, hotel_id: str, room_type: str, start: int, end: int) -> int:
+        return self._window(hotel_id, room_type, start, end).max_occupancy(start, end)
@@ -0,0 +1,186 @@
+import sys
+from array import array
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+from .models import Booking, date_to_ordinal, ordinal_to_date
+
+
+class StringTable:
+    """Interns low-cardinality strings as small integer codes."""
+
+    def __init__(self, values: Iterable[str] = ()):
+        self.values: List[str] = []
+        self.codes: Dict[str, int] = {}
+        for value in values:
+            self.code(value)
+
+    def code(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            value = sys.intern(value)
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def __getitem__(self, code: int) -> str:
+        return self.values[code]
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class BookingStore:
+    """
+    Columnar, array-backed booking storage.
+
+    Hotel ids, room types and rates are held as interned integer codes and
+    arrival/departure dates as int32 day ordinals, so a booking costs a
+    fixed handful of bytes instead of a dataclass instance with its own
+    __dict__. Indexing and iteration still produce Booking objects for
+    callers that expect them.
+
+    A booking's id is its row index. Cancelled rows stay in place as
+    tombstones so ids remain stable; they are skipped by iteration and
+    not counted by len().
+    """
+
+    def __init__(self):
+        self.hotel_ids = StringTable()
+        self.room_types = StringTable()
+        self.room_rates = StringTable()
+        self.hotel_codes = array('I')
+        self.room_type_codes = array('H')
+        self.rate_codes = array('H')
+        self.arrivals = array('i')
+        self.departures = array('i')
+        self.cancelled: Set[int] = set()
+
+    @classmethod
+    def from_bookings(cls, bookings: Iterable[Booking]) -> 'BookingStore':
+        store = cls()
+        for booking in bookings:
+            store.append(booking)
+        return store
+
+    def append(self, booking: Booking) -> int:
+        """Append a booking and return its row index."""
+        return self.append_row(
+            booking.hotelId,
+            booking.roomType,
+            date_to_ordinal(booking.arrival),
+            date_to_ordinal(booking.departure),
+            booking.roomRate
+        )
+
+    def append_record(self, record: Dict[str, str]) -> int:
+        """
+        Append a booking given as a raw JSON record and return its row index.
+
+        A record carrying an "id" (as written by journal compaction) is
+        placed at that row; skipped ids become cancelled tombstones.
+        """
+        if 'id' in record:
+            self.skip_to(record['id'])
+        return self.append_row(
+            record['hotelId'],
+            record['roomType'],
+            date_to_ordinal(record['arrival']),
+            date_to_ordinal(record['departure']),
+            record['roomRate']
+        )
+
+    def append_row(self, hotel_id: str, room_type: str, arrival: int, departure: int, room_rate: str) -> int:
+        """Append a booking given as pre-parsed columns and return its row index."""
+        self._writable()
+        self.hotel_codes.append(self.hotel_ids.code(hotel_id))
+        self.room_type_codes.append(self.room_types.code(room_type))
+        self.rate_codes.append(self.room_rates.code(room_rate))
+        self.arrivals.append(arrival)
+        self.departures.append(departure)
+        return len(self.arrivals) - 1
+
+    @property
+    def next_id(self) -> int:
+        """Row index the next appended booking will get."""
+        return len(self.arrivals)
+
+    def iter_stays(self, hotel_id: str) -> Iterator[Tuple[int, str, int, int]]:
+        """Yield (row index, room type, arrival, departure) for a hotel's live bookings."""
+        hotel_code = self.hotel_ids.codes.get(hotel_id)
+        if hotel_code is None:
+            return
+        for index, code in enumerate(self.hotel_codes):
+            if code == hotel_code and index not in self.cancelled:
+                yield (index, self.room_types[self.room_type_codes[index]],
+                       self.arrivals[index], self.departures[index])
+
+    def skip_to(self, index: int) -> None:
+        """
+        Pad the store with cancelled rows so the next append gets row index.
+
+        Raises:
+            ValueError: If row index is already taken
+        """
+        gap = index - len(self.arrivals)
+        if gap < 0:
+            raise ValueError(f"Booking {index} already exists")
+        if gap:
+            self._writable()
+            self.cancelled.update(range(len(self.arrivals), index))
+            for name in ('hotel_codes', 'room_type_codes', 'rate_codes', 'arrivals', 'departures'):
+                column = getattr(self, name)
+                column.extend(array(column.typecode, [0]) * gap)
+
+    def update_row(self, index: int, hotel_id: str, room_type: str, arrival: int,
+                   departure: int, room_rate: str) -> None:
+        """Overwrite the columns of an existing booking."""
+        self._writable()
+        self.hotel_codes[index] = self.hotel_ids.code(hotel_id)
+        self.room_type_codes[index] = self.room_types.code(room_type)
+        self.rate_codes[index] = self.room_rates.code(room_rate)
+        self.arrivals[index] = arrival
+        self.departures[index] = departure
+
+    def copy(self) -> 'BookingStore':
+        """Return an independent copy, e.g. to persist while writers continue."""
+        store = BookingStore()
+        store.hotel_ids = StringTable(self.hotel_ids.values)
+        store.room_types = StringTable(self.room_types.values)
+        store.room_rates = StringTable(self.room_rates.values)
+        for name in ('hotel_codes', 'room_type_codes', 'rate_codes', 'arrivals', 'departures'):
+            column = getattr(self, name)
+            setattr(store, name, array(column.typecode if isinstance(column, array) else column.format, column))
+        store.cancelled = set(self.cancelled)
+        return store
+
+    def cancel(self, index: int) -> None:
+        """Mark a booking as cancelled."""
+        self.cancelled.add(index)
+
+    def is_active(self, index: int) -> bool:
+        return 0 <= index < len(self.arrivals) and index not in self.cancelled
+
+    def _writable(self) -> None:
+        if not isinstance(self.arrivals, array):
+            # Columns restored from a snapshot are read-only memoryviews.
+            for name in ('hotel_codes', 'room_type_codes', 'rate_codes', 'arrivals', 'departures'):
+                column = getattr(self, name)
+                setattr(self, name, array(column.format, column))
+
+    def __len__(self) -> int:
+        return len(self.arrivals) - len(self.cancelled)
+
+    def __getitem__(self, index: int) -> Booking:
+        if not self.is_active(index):
+            raise IndexError(f"Booking {index} not found")
+        return Booking(
+            hotelId=self.hotel_ids[self.hotel_codes[index]],
+            arrival=ordinal_to_date(self.arrivals[index]),
+            departure=ordinal_to_date(self.departures[index]),
+            roomType=self.room_types[self.room_type_codes[index]],
+            roomRate=self.room_rates[self.rate_codes[index]]
+        )
+
+    def __iter__(self) -> Iterator[Booking]:
+        for index in range(len(self.arrivals)):
+            if index not in self.cancelled:
+                yield self[index]
@@ -1,5 +1,6 @@
 from datetime import datetime
-from typing import List
+from functools import lru_cache
+from typing import AbstractSet, List, Mapping, Optional, Union
 from .models import Hotel
 from .exceptions import ValidationError, DateFormatError
 
@@ -19,37 +20,57 @@ def validate_date_format(date_str: str) -> bool:
     if not date_str.isdigit() or len(date_str) != 8:
         raise DateFormatError("Date must be in YYYYMMDD format")
     try:
-        datetime.strptime(date_str, '%Y%m%d')
+        _parse_date(date_str)
         return True
     except ValueError as e:
         raise DateFormatError(f"Invalid date: {str(e)}")
 
-def validate_hotel_id(hotel_id: str, hotels: List[Hotel]) -> bool:
+@lru_cache(maxsize=8192)
+def _parse_date(date_str: str) -> datetime:
+    # strptime is slow and commands reuse a small set of dates; failures
+    # raise and are therefore not cached.
+    return datetime.strptime(date_str, '%Y%m%d')
+
+Hotels = Union[List[Hotel], Mapping[str, Hotel]]
+
+def _find_hotel(hotel_id: str, hotels: Hotels) -> Optional[Hotel]:
+    if isinstance(hotels, Mapping):
+        return hotels.get(hotel_id)
+    return next((h for h in hotels if h.id == hotel_id), None)
+
+def validate_hotel_id(hotel_id: str, hotels: Hotels) -> bool:
     """
     Validate if hotel_id exists.
     
     Args:
         hotel_id: Hotel ID to validate
-        hotels: List of available hotels
+        hotels: List of available hotels, or a mapping of hotel ID to hotel
         
     Returns:
         bool: True if valid, False otherwise
     """
+    if isinstance(hotels, Mapping):
+        return hotel_id in hotels
     return any(h.id == hotel_id for h in hotels)
 
-def validate_room_type(room_type: str, hotel_id: str, hotels: List[Hotel]) -> bool:
+def validate_room_type(room_type: str, hotel_id: str, hotels: Hotels,
+                       room_types: Optional[Mapping[str, AbstractSet[str]]] = None) -> bool:
     """
     Validate if room_type exists in the specified hotel.
     
     Args:
         room_type: Room type code to validate
         hotel_id: Hotel ID where to look for room type
-        hotels: List of available hotels
+        hotels: List of available hotels, or a mapping of hotel ID to hotel
+        room_types: Optional mapping of hotel ID to its room type codes;
+            when given, the hotels argument is not consulted
         
     Returns:
         bool: True if valid, False otherwise
     """
-    hotel = next((h for h in hotels if h.id == hotel_id), None)
+    if room_types is not None:
+        return room_type in room_types.get(hotel_id, ())
+    hotel = _find_hotel(hotel_id, hotels)
     if not hotel:
         return False
     return any(rt.code == room_type for rt in hotel.roomTypes) 
\ No newline at end of file
@@ -0,0 +1,26 @@
+import json
+import pytest
+
+HOTELS = [{
+    "id": "H1",
+    "name": "Test Hotel",
+    "roomTypes": [{"code": "SGL", "description": "Single Room"}],
+    "rooms": [{"roomType": "SGL", "roomId": "101"}, {"roomType": "SGL", "roomId": "102"}]
+}]
+
+@pytest.fixture
+def write_data(tmp_path):
+    """
+    Return a function writing hotels and bookings as JSON files.
+
+    The function takes the bookings and optionally the hotels (default:
+    one hotel with two single rooms) and returns the paths of the written
+    hotels and bookings files in tmp_path.
+    """
+    def write(bookings, hotels=HOTELS):
+        hotels_file = tmp_path / "hotels.json"
+        bookings_file = tmp_path / "bookings.json"
+        hotels_file.write_text(json.dumps(hotels))
+        bookings_file.write_text(json.dumps(bookings))
+        return str(hotels_file), str(bookings_file)
+    return write
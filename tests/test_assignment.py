@@ -0,0 +1,75 @@
+import random
+import time
+from src.assignment import RoomSchedule
+
+def _check_no_overlap(schedule):
+    for room in range(len(schedule.room_ids)):
+        pairs = list(zip(schedule.arrivals[room], schedule.departures[room]))
+        assert all(d1 <= a2 for (_, d1), (a2, _) in zip(pairs, pairs[1:]))
+
+class TestRoomSchedule:
+    def test_build_assigns_lowest_free_room(self):
+        schedule = RoomSchedule.build(["101", "102"], [(0, 1, 3), (1, 2, 4), (2, 3, 5), (3, 4, 4)])
+        assert schedule.room_for(0) == "101"
+        assert schedule.room_for(1) == "102"
+        assert schedule.room_for(2) == "101"
+        assert schedule.room_for(3) is None
+        assert schedule.unassigned == []
+        assert schedule.occupancy(2) == {"101": 0, "102": 1}
+        assert schedule.free_rooms(4, 6) == ["102"]
+
+    def test_overbooked_stays_are_unassigned(self):
+        schedule = RoomSchedule.build(["101"], [(0, 1, 3), (1, 2, 4)])
+        assert schedule.unassigned == [(1, 2, 4)]
+        schedule.release(1)
+        assert schedule.unassigned == []
+
+    def test_cancel_on_overbooked_night_assigns_waiting_stay(self):
+        schedule = RoomSchedule.build(["101"], [(0, 10, 12), (1, 10, 12), (2, 11, 13)])
+        assert schedule.unassigned == [(1, 10, 12), (2, 11, 13)]
+        schedule.release(0)
+        assert schedule.room_for(1) == "101"
+        assert schedule.unassigned == [(2, 11, 13)]
+        assert schedule.free_rooms(10, 12) == []
+        # Moving the occupant away, as a modification does, frees the room again.
+        schedule.release(1)
+        schedule.assign(1, 20, 21)
+        assert schedule.room_for(2) == "101"
+        assert schedule.unassigned == []
+
+    def test_incremental_assign_and_release(self):
+        schedule = RoomSchedule.build(["101", "102"], [(0, 1, 3)])
+        assert schedule.assign(1, 2, 4) == "102"
+        assert schedule.assign(2, 3, 5) == "101"
+        schedule.release(0)
+        assert schedule.occupancy(1) == {"101": None, "102": None}
+        assert schedule.assign(3, 1, 3) == "101"
+
+    def test_fragmented_rooms_are_repacked(self):
+        schedule = RoomSchedule(["101", "102"])
+        schedule.assign(0, 1, 3)
+        schedule.assign(1, 3, 4)
+        schedule.assign(2, 3, 5)
+        schedule.release(1)
+        # 101 is taken on night 2 and 102 on nights 3-4, but two rooms suffice.
+        assert schedule.assign(3, 2, 6) == "102"
+        assert schedule.room_for(2) == "101"
+        _check_no_overlap(schedule)
+
+    def test_large_hotel_assignment(self):
+        rng = random.Random(0)
+        rooms = [str(n) for n in range(500)]
+        stays, booking_id = [], 0
+        for room in range(500):
+            day = rng.randrange(3)
+            while day < 365:
+                nights = rng.randint(1, 5)
+                stays.append((booking_id, 738000 + day, 738000 + day + nights))
+                booking_id += 1
+                day += nights + rng.randrange(2)
+        started = time.perf_counter()
+        schedule = RoomSchedule.build(rooms, stays)
+        assert time.perf_counter() - started < 2.0
+        assert schedule.unassigned == []
+        assert len(schedule.room_of) == len(stays)
+        _check_no_overlap(schedule)
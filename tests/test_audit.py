@@ -0,0 +1,73 @@
+import pytest
+from src.audit import (EMPTY_STAY, UNKNOWN_HOTEL, UNKNOWN_ROOM_TYPE, AuditReport,
+                       find_overbooked, overbooked_nights)
+from src.models import date_to_ordinal
+from src.services import HotelManager
+
+HOTELS = [{
+    "id": hotel_id,
+    "name": f"Hotel {hotel_id}",
+    "roomTypes": [{"code": "SGL", "description": "Single"}],
+    "rooms": [{"roomType": "SGL", "roomId": "101"}]
+} for hotel_id in ("H1", "H2")]
+
+BOOKINGS = [
+    {"hotelId": "H1", "arrival": "20240901", "departure": "20240904", "roomType": "SGL", "roomRate": "Standard"},
+    {"hotelId": "H1", "arrival": "20240902", "departure": "20240903", "roomType": "SGL", "roomRate": "Prepaid"},
+    {"hotelId": "H2", "arrival": "20240901", "departure": "20240903", "roomType": "SGL", "roomRate": "Prepaid"},
+    {"hotelId": "H2", "arrival": "20240902", "departure": "20240904", "roomType": "SGL", "roomRate": "Prepaid"},
+    {"hotelId": "H9", "arrival": "20240901", "departure": "20240902", "roomType": "SGL", "roomRate": "Prepaid"},
+    {"hotelId": "H1", "arrival": "20240901", "departure": "20240902", "roomType": "STE", "roomRate": "Prepaid"},
+    {"hotelId": "H1", "arrival": "20240905", "departure": "20240905", "roomType": "SGL", "roomRate": "Prepaid"},
+]
+
+@pytest.fixture
+def files(write_data):
+    return write_data(BOOKINGS, HOTELS)
+
+def _days(*dates):
+    return [date_to_ordinal(d) for d in dates]
+
+class TestAudit:
+    def test_sweep_merges_equal_runs(self):
+        runs = overbooked_nights("H1", "SGL", 1, _days("20240901", "20240902", "20240902", "20240910"),
+                                 _days("20240904", "20240905", "20240905", "20240911"))
+        assert [(run.first, run.last, run.booked) for run in runs] == [
+            (date_to_ordinal("20240902"), date_to_ordinal("20240903"), 3),
+            (date_to_ordinal("20240904"), date_to_ordinal("20240904"), 2)]
+        assert overbooked_nights("H1", "SGL", 3, _days("20240901", "20240902"),
+                                 _days("20240903", "20240904")) == []
+
+    def test_sweep_continues_after_last_arrival(self):
+        runs = overbooked_nights("H1", "SGL", 1, [1, 1, 1], [5, 10, 10])
+        assert [(run.first, run.last, run.booked) for run in runs] == [(1, 4, 3), (5, 9, 2)]
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_report(self, files, workers):
+        manager = HotelManager(*files)
+        report = manager.audit(workers=workers)
+        assert isinstance(report, AuditReport) and not report.ok
+        assert report.bookings_checked == 7
+        assert [(item.booking_id, item.reason) for item in report.invalid] == [
+            (4, UNKNOWN_HOTEL), (5, UNKNOWN_ROOM_TYPE), (6, EMPTY_STAY)]
+        assert [(run.hotel_id, run.first, run.last, run.booked, run.rooms) for run in report.overbooked] == [
+            ("H1", date_to_ordinal("20240902"), date_to_ordinal("20240902"), 2, 1),
+            ("H2", date_to_ordinal("20240902"), date_to_ordinal("20240902"), 2, 1)]
+        assert "Overbooked H2 SGL 20240902: 2 bookings for 1 rooms" in report.summary()
+
+    def test_audited_load_excludes_invalid_bookings(self, files):
+        manager = HotelManager(*files, audit=True)
+        assert len(manager.bookings) == 4
+        assert ("H9", "SGL") not in manager.occupancy.groups
+        assert manager.occupancy.count_overlapping("H1", "SGL", *_days("20240901", "20240906")) == 2
+        report = manager.audit(workers=1)
+        assert [item.booking_id for item in report.invalid] == [4, 5, 6]
+        assert report.bookings_checked == 7
+        with pytest.raises(ValueError):
+            HotelManager(*files, audit=True, journal_file=files[1] + ".journal")
+
+    def test_groups_without_overflow_are_skipped(self, files):
+        manager = HotelManager(*files)
+        groups = {("H1", "SGL"): manager.occupancy.groups[("H1", "SGL")]}
+        assert find_overbooked(groups, {("H1", "SGL"): 2}, workers=1) == []
+        assert len(find_overbooked(groups, {("H1", "SGL"): 1}, workers=1)) == 1
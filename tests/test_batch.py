@@ -0,0 +1,75 @@
+import argparse
+import pytest
+from unittest.mock import patch
+from src.batch import run_batch, shard_commands
+from src.cli import CLI, _run_batch
+from src.models import date_to_ordinal
+from src.services import HotelManager
+
+HOTELS = [{
+    "id": hotel_id,
+    "name": f"Hotel {hotel_id}",
+    "roomTypes": [{"code": "SGL", "description": "Single Room"}],
+    "rooms": [{"roomType": "SGL", "roomId": "101"}, {"roomType": "SGL", "roomId": "102"}]
+} for hotel_id in ("H1", "H2", "H3")]
+
+BOOKINGS = [
+    {"hotelId": "H1", "arrival": "20240901", "departure": "20240903", "roomType": "SGL", "roomRate": "Standard"},
+    {"hotelId": "H2", "arrival": "20240901", "departure": "20240902", "roomType": "SGL", "roomRate": "Prepaid"},
+    {"hotelId": "H2", "arrival": "20240901", "departure": "20240904", "roomType": "SGL", "roomRate": "Prepaid"},
+]
+
+COMMANDS = [
+    "Availability(H1, 20240901, SGL)",
+    "Availability(H2, 20240901, SGL)",
+    "Bogus(H1)",
+    "",
+    "Availability(H3, 20240901, SGL)",
+    "Availability(H2, 20240903, SGL)",
+    "Availability(H4, 20240901, SGL)",
+    "Availability(H1, 20240901-20240905, DBL)",
+]
+
+@pytest.fixture
+def files(write_data):
+    return write_data(BOOKINGS, HOTELS)
+
+class TestBatch:
+    def test_shard_commands_groups_by_hotel(self):
+        shards, results = shard_commands(COMMANDS, workers=2)
+        assert set(results) == {2, 3}
+        assert results[3] == ""
+        assert len(shards) == 2
+        for hotel_ids, commands in shards:
+            for _, command in commands:
+                assert CLI.parse_command(command)['hotel_id'] in hotel_ids
+        assert sorted(index for _, commands in shards for index, _ in commands) == [0, 1, 4, 5, 6, 7]
+
+    @pytest.mark.parametrize("workers", [1, 3])
+    def test_run_batch_matches_interactive(self, files, workers):
+        cli = CLI(HotelManager(*files))
+        expected = [cli.process_command(command) for command in COMMANDS]
+        assert run_batch(*files, COMMANDS, workers=workers) == expected
+
+    def test_run_batch_with_mutations_keeps_order(self, files):
+        commands = [
+            "Availability(H1, 20240901, SGL)",
+            "Book(H1, 20240901, 20240902, SGL, Prepaid)",
+            "Availability(H1, 20240901, SGL)",
+            "Cancel(3)",
+            "Availability(H1, 20240901, SGL)",
+            "Availability(H2, 20240903, SGL)",
+        ]
+        shards, _ = shard_commands(commands, workers=4)
+        assert len(shards) == 1
+        assert run_batch(*files, commands, workers=4) == ["1", "3", "0", "Cancelled 3", "1", "1"]
+
+    def test_batch_output_has_one_line_per_command(self, files, tmp_path, capsys):
+        commands_file = tmp_path / "commands.txt"
+        commands_file.write_text("Availability(H1, 20240901, SGL)\n\nRooms(H1, 20240901, SGL)\n"
+                                 "Search(H2, 1, SGL)\nAvailability(H2, 20240901, SGL)\n")
+        # H2 is fully booked on the search day, so Search answers with an empty line.
+        with patch.object(HotelManager, '_today', return_value=date_to_ordinal("20240901")):
+            _run_batch(argparse.Namespace(hotels=files[0], bookings=files[1], batch=str(commands_file),
+                                          workers=1, snapshot=None, journal=None, sqlite=None))
+        assert capsys.readouterr().out.split('\n') == ["1", "101: 0; 102: free", "", "0", ""]
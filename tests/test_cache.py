@@ -0,0 +1,65 @@
+from src.cache import MISSING, ResultCache
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class TestResultCache:
+    def test_hit_and_miss(self):
+        cache = ResultCache(maxsize=2)
+        assert cache.get("a") is MISSING
+        cache.put("a", 0, ("H1", "SGL"))
+        assert cache.get("a") == 0
+        assert cache.stats()['hits'] == 1
+        assert cache.stats()['misses'] == 1
+
+    def test_lru_eviction(self):
+        cache = ResultCache(maxsize=2)
+        cache.put("a", 1, ("H1", "SGL"))
+        cache.put("b", 2, ("H1", "SGL"))
+        cache.get("a")
+        cache.put("c", 3, ("H1", "DBL"))
+        assert cache.get("b") is MISSING
+        assert cache.get("a") == 1
+        assert cache.stats()['evictions'] == 1
+
+    def test_ttl(self):
+        clock = FakeClock()
+        cache = ResultCache(maxsize=2, ttl=10, clock=clock)
+        cache.put("a", 1, ("H1", "SGL"))
+        clock.now = 9.9
+        assert cache.get("a") == 1
+        clock.now = 10
+        assert cache.get("a") is MISSING
+        assert cache.stats()['expirations'] == 1
+
+    def test_invalidate_group(self):
+        cache = ResultCache()
+        cache.put("a", 1, ("H1", "SGL"))
+        cache.put("b", 2, ("H1", "DBL"))
+        cache.invalidate("H1", "SGL")
+        assert cache.get("a") is MISSING
+        assert cache.get("b") == 2
+        assert cache.stats()['invalidations'] == 1
+
+    def test_put_after_invalidation_is_dropped(self):
+        cache = ResultCache()
+        version = cache.version(("H1", "SGL"))
+        cache.invalidate("H1", "SGL")
+        cache.put("a", 1, ("H1", "SGL"), version)
+        assert cache.get("a") is MISSING
+        version = cache.version(("H1", "SGL"))
+        cache.clear()
+        cache.put("a", 1, ("H1", "SGL"), version)
+        assert cache.get("a") is MISSING
+        cache.put("a", 1, ("H1", "SGL"), cache.version(("H1", "SGL")))
+        assert cache.get("a") == 1
+        assert cache.stats()['stale'] == 2
+
+    def test_disabled(self):
+        cache = ResultCache(maxsize=0)
+        cache.put("a", 1, ("H1", "SGL"))
+        assert cache.get("a") is MISSING
@@ -2,6 +2,7 @@ import pytest
 from datetime import datetime
 from src.cli import CLI
 from src.services import HotelManager
+from src.models import date_to_ordinal
 from src.exceptions import ValidationError
 from unittest.mock import patch
 
@@ -79,6 +80,76 @@ class TestCLI:
     #         result = cli.process_command("Search(H1, 5, SGL)")
     #         assert "(20241211-20241215, 2)" in result
 
+    def test_parse_optional_parameter(self, cli):
+        assert cli.parse_command("Modify(0, 20240905, 20240906)") == {
+            'command': 'modify',
+            'booking_id': '0',
+            'arrival': '20240905',
+            'departure': '20240906'
+        }
+        with pytest.raises(ValidationError):
+            cli.parse_command("Modify(0, 20240905)")
+
+    def test_process_booking_commands(self, cli):
+        assert cli.process_command("Book(H1, 20240901, 20240902, SGL, Prepaid)") == "1"
+        assert cli.process_command("Availability(H1, 20240901, SGL)") == "0"
+        assert "Error: No SGL room available" in cli.process_command(
+            "Book(H1, 20240901, 20240902, SGL, Prepaid)")
+        assert cli.process_command("Modify(1, 20240905, 20240906)") == "Modified 1"
+        assert cli.process_command("Cancel(0)") == "Cancelled 0"
+        assert cli.process_command("Availability(H1, 20240901, SGL)") == "2"
+        assert cli.process_command("Cancel(x)") == "Error: Booking id must be a valid number"
+
+    def test_stats_command(self, cli):
+        cli.manager.stats.enabled = True
+        cli.process_command("Availability(H1, 20240901, SGL)")
+        cli.process_command("Availability(H2, 20240901, SGL)")
+        report = cli.process_command("Stats()")
+        assert "command.availability: count=2" in report
+        assert "phase.validate" in report
+        assert "errors.ValidationError: 1" in report
+        assert "cache.misses: 1" in report
+
+    def test_availability_many_command(self, cli):
+        result = cli.process_command(
+            "AvailabilityMany(H1 20240901 SGL; H2 20240901 SGL;H1 20240903 SGL; H1 20240905-20240901 SGL)")
+        assert result.split('\n') == [
+            "1", "Error: Hotel H2 not found", "2", "Error: End date must not be before start date"]
+
+    def test_find_stay_command(self, cli):
+        with patch.object(cli.manager, '_today', return_value=date_to_ordinal("20240901")):
+            assert cli.process_command("FindStay(H1, 2, SGL, 2, 30)") == "(20240903-20240905, 2)"
+            assert cli.process_command("FindStay(H1, 1, SGL, 1, 30, 2)") == \
+                "(20240901-20240902, 1), (20240902-20240903, 1)"
+        assert cli.process_command("FindStay(H1, 0, SGL, 1, 30)") == "Error: Nights must be a positive number"
+        assert cli.process_command("FindStay(H1, 1, SGL, 1, 99999999)") == \
+            "Error: Horizon must be at most 3660 days"
+
+    def test_search_command_limit(self, cli):
+        with patch.object(cli.manager, '_today', return_value=date_to_ordinal("20240831")):
+            assert cli.process_command("Search(H1, 5, SGL)") == "(20240831, 2), (20240901-20240902, 1), (20240903-20240904, 2)"
+            assert cli.process_command("Search(H1, 3650, SGL, 1)") == "(20240831, 2)"
+        assert cli.process_command("Search(H1, 5, SGL, 0)") == "Error: Limit must be a positive number"
+
+    def test_rooms_command(self, cli):
+        assert cli.process_command("Rooms(H1, 20240902, SGL)") == "101: 0\n102: free"
+        assert cli.process_command("Rooms(H1, 20240901-20240903, SGL)").startswith("Error: Date must be")
+
+    def test_report_command(self, cli):
+        assert cli.process_command("Report(20240901-20240904, month)") == \
+            "2024-09 H1 SGL: 2/6 room-nights, 33.3% (Standard 2, 33.3%)"
+        assert cli.process_command("Report(20240901-20240904, month, , DBL)") == ""
+        assert cli.process_command("Report(20240901, year)").startswith("Error: Period must be one of")
+
+    def test_audit_command(self, cli):
+        assert cli.process_command("Audit()") == "Checked 1 bookings: 0 invalid, 0 overbooked periods"
+
+    def test_reload_command(self, cli):
+        assert cli.process_command("Reload()") == "Reload started"
+        cli.manager._reload_thread.join()
+        assert cli.manager.reload_error is None
+        assert cli.process_command("Availability(H1, 20240901, SGL)") == "1"
+
     def test_error_handling(self, cli):
         result = cli.process_command("Availability(H2, 20240901, SGL)")
         assert "Error: Hotel H2 not found" in result
@@ -0,0 +1,28 @@
+import json
+from datetime import date
+from src.datagen import generate_bookings, generate_hotels, write_dataset
+from src.services import HotelManager
+
+class TestDatagen:
+    def test_generation_is_seeded(self):
+        hotels = generate_hotels(5, seed=3)
+        assert hotels == generate_hotels(5, seed=3)
+        assert hotels != generate_hotels(5, seed=4)
+        first = list(generate_bookings(hotels, 50, date(2025, 1, 1), seed=3))
+        assert first == list(generate_bookings(hotels, 50, date(2025, 1, 1), seed=3))
+
+    def test_bookings_reference_hotel_inventory(self):
+        hotels = generate_hotels(3, seed=1)
+        offered = {(h["id"], room["roomType"]) for h in hotels for room in h["rooms"]}
+        for booking in generate_bookings(hotels, 500, date(2025, 1, 1), seed=1):
+            assert (booking["hotelId"], booking["roomType"]) in offered
+            assert booking["departure"] > booking["arrival"] >= "20250101"
+            assert booking["roomRate"] in ("Standard", "Prepaid")
+
+    def test_write_dataset_is_loadable(self, tmp_path):
+        paths = write_dataset(str(tmp_path), hotels=4, bookings=200, start=date(2025, 1, 1), seed=2)
+        with open(paths["bookings"]) as f:
+            assert len(json.load(f)) == 200
+        manager = HotelManager(paths["hotels"], paths["bookings"])
+        assert len(manager.hotels) == 4
+        assert len(manager.bookings) == 200
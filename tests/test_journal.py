@@ -0,0 +1,102 @@
+import json
+import os
+import pytest
+from src.journal import BookingJournal, read_manifest
+from src.services import HotelManager
+
+BOOKINGS = [
+    {"hotelId": "H1", "arrival": "20240901", "departure": "20240903", "roomType": "SGL", "roomRate": "Standard"},
+    {"hotelId": "H1", "arrival": "20240902", "departure": "20240904", "roomType": "SGL", "roomRate": "Prepaid"},
+]
+
+@pytest.fixture
+def files(write_data, tmp_path):
+    return write_data(BOOKINGS) + (str(tmp_path / "bookings.journal"),)
+
+def _state(manager):
+    return [(i, manager.bookings[i]) for i in range(len(manager.bookings.arrivals))
+            if manager.bookings.is_active(i)]
+
+class TestJournal:
+    def test_changes_survive_restart(self, files):
+        hotels_file, bookings_file, journal = files
+        manager = HotelManager(hotels_file, bookings_file, journal_file=journal)
+        booking_id = manager.add_booking("H1", "20240910", "20240912", "SGL", "Standard")
+        manager.cancel_booking(0)
+        manager.modify_booking(1, "20240905", "20240907")
+        manager.close()
+
+        restarted = HotelManager(hotels_file, bookings_file, journal_file=journal)
+        assert _state(restarted) == _state(manager)
+        assert restarted.check_availability("H1", "20240910", "SGL") == 1
+        assert restarted.check_availability("H1", "20240901", "SGL") == 2
+        assert restarted.add_booking("H1", "20240920", "20240921", "SGL", "Standard") == booking_id + 1
+
+    def test_compaction_folds_journal_into_snapshot(self, files):
+        hotels_file, bookings_file, journal = files
+        manager = HotelManager(hotels_file, bookings_file, journal_file=journal)
+        manager.add_booking("H1", "20240910", "20240912", "SGL", "Standard")
+        manager.cancel_booking(0)
+        manager.compact_journal()
+        manager.add_booking("H1", "20240915", "20240916", "SGL", "Prepaid")
+        manager.close()
+
+        manifest = read_manifest(journal)
+        assert manifest['seq'] == 2
+        assert os.path.exists(manifest['snapshot'])
+        with open(journal) as f:
+            assert [json.loads(line)['seq'] for line in f] == [3]
+
+        restarted = HotelManager(hotels_file, bookings_file, journal_file=journal)
+        assert _state(restarted) == _state(manager)
+        assert not restarted.bookings.is_active(0)
+        assert restarted.bookings[3].arrival == "20240915"
+
+    def test_compaction_keeps_ids_of_cancelled_bookings(self, files):
+        hotels_file, bookings_file, journal = files
+        manager = HotelManager(hotels_file, bookings_file, journal_file=journal)
+        booking_id = manager.add_booking("H1", "20240910", "20240912", "SGL", "Standard")
+        manager.cancel_booking(booking_id)
+        manager.compact_journal()
+        manager.close()
+
+        assert read_manifest(journal)['next_id'] == 3
+        restarted = HotelManager(hotels_file, bookings_file, journal_file=journal)
+        assert restarted.bookings.next_id == 3
+        assert restarted.add_booking("H1", "20240910", "20240912", "SGL", "Standard") == 3
+
+    def test_background_compaction_after_threshold(self, files):
+        hotels_file, bookings_file, journal = files
+        manager = HotelManager(hotels_file, bookings_file, journal_file=journal, compact_after=2)
+        manager.add_booking("H1", "20240910", "20240911", "SGL", "Standard")
+        manager.add_booking("H1", "20240911", "20240912", "SGL", "Standard")
+        manager.close()
+        assert read_manifest(journal)['seq'] == 2
+        assert HotelManager(hotels_file, bookings_file, journal_file=journal).bookings[3].arrival == "20240911"
+
+    def test_torn_last_line_is_discarded(self, files):
+        _, _, journal = files
+        with open(journal, 'w') as f:
+            f.write(json.dumps({"seq": 1, "op": "cancel", "id": 0}) + '\n{"seq": 2, "op": "ca')
+        log = BookingJournal(journal)
+        assert [event['seq'] for event in log.replay()] == [1]
+        log.append('cancel', 1)
+        log.close()
+        with open(journal) as f:
+            assert [json.loads(line)['seq'] for line in f] == [1, 2]
+
+    def test_group_commit_batches_fsync(self, files, monkeypatch):
+        _, _, journal = files
+        synced = []
+        monkeypatch.setattr(os, 'fsync', lambda fd: synced.append(fd))
+        log = BookingJournal(journal, sync_every=3)
+        for booking_id in range(7):
+            log.append('cancel', booking_id)
+        assert len(synced) == 2
+        log.close()
+        assert len(synced) == 3
+
+    def test_journal_rejects_partial_load(self, files):
+        hotels_file, bookings_file, journal = files
+        with pytest.raises(ValueError):
+            HotelManager(hotels_file, bookings_file, journal_file=journal, hotel_ids=["H1"])
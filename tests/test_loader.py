@@ -0,0 +1,45 @@
+import io
+import json
+import pytest
+from src.loader import iter_json_array, iter_json_file
+
+RECORDS = [
+    {"hotelId": "H1", "arrival": "20240901", "departure": "20240903", "roomType": "SGL", "roomRate": "Standard"},
+    {"hotelId": "Hé", "arrival": "20240902", "departure": "20240905", "roomType": "DBL", "roomRate": "Prepaid"},
+    12345,
+    "a, string ] with separators",
+]
+
+class TestLoader:
+    @pytest.mark.parametrize("chunk_size", [1, 3, 7, 1 << 16])
+    def test_iter_json_array_chunked(self, chunk_size):
+        data = json.dumps(RECORDS, indent=2).encode('utf-8')
+        result = list(iter_json_array(io.BytesIO(data), chunk_size=chunk_size, backend='stdlib'))
+        assert result == RECORDS
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 5])
+    def test_scalars_split_across_chunks(self, chunk_size):
+        values = [1.5, -2e3, 12345, True, None, False, 0.25]
+        data = json.dumps(values, separators=(',', ':')).encode('utf-8')
+        assert list(iter_json_array(io.BytesIO(data), chunk_size=chunk_size, backend='stdlib')) == values
+        data = b'[' + b' ' * 65533 + b'1.5, 2]'
+        assert list(iter_json_array(io.BytesIO(data), backend='stdlib')) == [1.5, 2]
+
+    def test_empty_array(self):
+        assert list(iter_json_array(io.BytesIO(b' [ ] '), backend='stdlib')) == []
+
+    def test_malformed_input(self):
+        with pytest.raises(ValueError):
+            list(iter_json_array(io.BytesIO(b'{"a": 1}'), backend='stdlib'))
+        with pytest.raises(ValueError):
+            list(iter_json_array(io.BytesIO(b'[1, 2'), backend='stdlib'))
+        with pytest.raises(ValueError):
+            list(iter_json_array(io.BytesIO(b'[1; 2]'), backend='stdlib'))
+
+    def test_iter_json_file_progress(self, tmp_path):
+        path = tmp_path / "bookings.json"
+        path.write_text(json.dumps(RECORDS))
+        seen = []
+        result = list(iter_json_file(str(path), progress=lambda done, total: seen.append((done, total))))
+        assert result == RECORDS
+        assert seen[-1] == (path.stat().st_size, path.stat().st_size)
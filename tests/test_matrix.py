@@ -0,0 +1,51 @@
+import json
+import pytest
+import src.matrix as matrix_module
+from src.services import HotelManager
+from src.exceptions import ResourceNotFoundError
+
+@pytest.fixture
+def manager(tmp_path):
+    hotels_file = tmp_path / "hotels.json"
+    bookings_file = tmp_path / "bookings.json"
+    hotels = [{
+        "id": hotel_id,
+        "name": f"Hotel {hotel_id}",
+        "roomTypes": [{"code": "SGL", "description": "Single"}, {"code": "DBL", "description": "Double"}],
+        "rooms": [{"roomType": "SGL", "roomId": "101"}, {"roomType": "SGL", "roomId": "102"},
+                  {"roomType": "DBL", "roomId": "201"}]
+    } for hotel_id in ("H1", "H2")]
+    bookings = [
+        {"hotelId": "H1", "arrival": "20240901", "departure": "20240903", "roomType": "SGL", "roomRate": "Standard"},
+        {"hotelId": "H1", "arrival": "20240902", "departure": "20240905", "roomType": "SGL", "roomRate": "Prepaid"},
+        {"hotelId": "H2", "arrival": "20240830", "departure": "20240902", "roomType": "DBL", "roomRate": "Prepaid"},
+        {"hotelId": "H2", "arrival": "20240901", "departure": "20240904", "roomType": "DBL", "roomRate": "Prepaid"},
+    ]
+    hotels_file.write_text(json.dumps(hotels))
+    bookings_file.write_text(json.dumps(bookings))
+    return HotelManager(str(hotels_file), str(bookings_file))
+
+BACKENDS = [
+    pytest.param(True, marks=pytest.mark.skipif(matrix_module.np is None, reason="numpy not installed")),
+    False,
+]
+
+class TestAvailabilityMatrix:
+    @pytest.mark.parametrize("use_numpy", BACKENDS)
+    def test_matches_check_availability(self, manager, monkeypatch, use_numpy):
+        if not use_numpy:
+            monkeypatch.setattr(matrix_module, "np", None)
+        matrix = manager.availability_matrix("20240829-20240906", ["SGL", "DBL", "STE"])
+        assert matrix.hotel_ids == ["H1", "H2"]
+        assert len(matrix.dates) == 8
+        for hotel_id in matrix.hotel_ids:
+            for room_type in matrix.room_types:
+                expected = [manager.check_availability(hotel_id, date_str, room_type)
+                            for date_str in matrix.dates]
+                assert matrix.row(hotel_id, room_type) == expected
+
+    def test_selected_hotels(self, manager):
+        matrix = manager.availability_matrix("20240902", ["SGL"], ["H1"])
+        assert matrix.values == [[[0]]]
+        with pytest.raises(ResourceNotFoundError):
+            manager.availability_matrix("20240902", ["SGL"], ["H3"])
@@ -1,5 +1,5 @@
 import pytest
-from src.models import Hotel, RoomType, Room, Booking
+from src.models import Hotel, RoomType, Room, Booking, FrozenBooking, FrozenHotel, FrozenRoom
 
 class TestModels:
     def test_room_type_creation(self):
@@ -53,4 +53,36 @@ class TestModels:
         booking = Booking.from_dict(booking_data)
         assert booking.hotelId == "H1"
         assert booking.arrival == "20240901"
-        assert booking.departure == "20240903" 
\ No newline at end of file
+        assert booking.departure == "20240903"
+
+    def test_models_are_slotted(self):
+        booking = Booking("H1", "20240901", "20240903", "SGL", "Standard")
+        assert not hasattr(booking, '__dict__')
+        with pytest.raises(AttributeError):
+            booking.guests = 2
+
+    def test_from_dict_interns_repeated_fields(self):
+        first = Booking.from_dict({"hotelId": "".join(["H", "1"]), "arrival": "20240901",
+                                   "departure": "20240903", "roomType": "".join(["S", "GL"]),
+                                   "roomRate": "".join(["Pre", "paid"])})
+        second = Booking.from_dict({"hotelId": "".join(["H", "1"]), "arrival": "20240902",
+                                    "departure": "20240904", "roomType": "".join(["S", "GL"]),
+                                    "roomRate": "".join(["Pre", "paid"])})
+        assert first.hotelId is second.hotelId
+        assert first.roomType is second.roomType
+        assert first.roomRate is second.roomRate
+
+    def test_frozen_variants(self):
+        hotel = FrozenHotel.from_dict({
+            "id": "H1",
+            "name": "Test Hotel",
+            "roomTypes": [{"code": "SGL", "description": "Single Room", "amenities": ["WiFi"]}],
+            "rooms": [{"roomType": "SGL", "roomId": "101"}]
+        })
+        assert hotel.roomTypes[0].amenities == ("WiFi",)
+        assert hotel.rooms == (FrozenRoom("SGL", "101"),)
+        booking = Booking("H1", "20240901", "20240903", "SGL", "Standard").freeze()
+        assert booking == FrozenBooking("H1", "20240901", "20240903", "SGL", "Standard")
+        assert len({hotel, booking, booking}) == 2
+        with pytest.raises(AttributeError):
+            booking.roomRate = "Prepaid"
@@ -0,0 +1,88 @@
+import pytest
+from src.occupancy import OccupancyIndex
+from src.models import Hotel, RoomType, Room, Booking, date_to_ordinal, ordinal_to_date
+from src.store import BookingStore
+
+@pytest.fixture
+def index():
+    hotel = Hotel(
+        id="H1",
+        name="Test Hotel",
+        roomTypes=[RoomType(code="SGL", description="Single", amenities=[], features=[])],
+        rooms=[Room(roomType="SGL", roomId="101"), Room(roomType="SGL", roomId="102")]
+    )
+    bookings = [
+        Booking("H1", "20240901", "20240903", "SGL", "Standard"),
+        Booking("H1", "20240902", "20240905", "SGL", "Prepaid"),
+        Booking("H1", "20240910", "20240910", "SGL", "Prepaid"),
+    ]
+    return OccupancyIndex([hotel], BookingStore.from_bookings(bookings))
+
+class TestOccupancyIndex:
+    def test_ordinal_round_trip(self):
+        assert ordinal_to_date(date_to_ordinal("20240229")) == "20240229"
+        assert date_to_ordinal("20240901") + 1 == date_to_ordinal("20240902")
+
+    def test_room_count(self, index):
+        assert index.room_count("H1", "SGL") == 2
+        assert index.room_count("H1", "DBL") == 0
+        assert index.room_count("H2", "SGL") == 0
+
+    def test_count_overlapping_single_day(self, index):
+        day = date_to_ordinal
+        assert index.count_overlapping("H1", "SGL", day("20240901"), day("20240902")) == 1
+        assert index.count_overlapping("H1", "SGL", day("20240902"), day("20240903")) == 2
+        assert index.count_overlapping("H1", "SGL", day("20240905"), day("20240906")) == 0
+        assert index.count_overlapping("H1", "DBL", day("20240901"), day("20240902")) == 0
+
+    def test_count_overlapping_range(self, index):
+        day = date_to_ordinal
+        assert index.count_overlapping("H1", "SGL", day("20240901"), day("20240902")) == 1
+        assert index.count_overlapping("H1", "SGL", day("20240831"), day("20240906")) == 2
+        # Zero-length bookings only overlap ranges that strictly contain them
+        assert index.count_overlapping("H1", "SGL", day("20240909"), day("20240911")) == 1
+
+    def test_iter_runs(self, index):
+        day = date_to_ordinal
+        runs = list(index.iter_runs("H1", "SGL", day("20240831"), day("20240907")))
+        assert runs == [
+            (day("20240831"), day("20240831"), 2),
+            (day("20240901"), day("20240901"), 1),
+            (day("20240903"), day("20240904"), 1),
+            (day("20240905"), day("20240906"), 2),
+        ]
+        assert list(index.iter_runs("H1", "DBL", day("20240901"), day("20240905"))) == []
+
+    def test_count_overlapping_many_matches_single_counts(self, index):
+        days = [date_to_ordinal(f"202409{day:02d}") for day in range(1, 12)]
+        ranges = [(start, end) for start in days for end in days if end > start]
+        ranges.reverse()
+        assert index.count_overlapping_many("H1", "SGL", ranges) == [
+            index.count_overlapping("H1", "SGL", start, end) for start, end in ranges
+        ]
+        assert index.count_overlapping_many("H1", "DBL", ranges[:2]) == [0, 0]
+
+    def test_iter_runs_follow_live_updates(self, index):
+        day = date_to_ordinal
+        start, end = day("20240901"), day("20240906")
+        list(index.iter_runs("H1", "SGL", start, end))
+        index.add_booking("H1", "SGL", day("20240903"), day("20240905"))
+        assert list(index.iter_runs("H1", "SGL", start, end)) == [
+            (day("20240901"), day("20240901"), 1),
+            (day("20240905"), day("20240905"), 2),
+        ]
+        index.remove_booking("H1", "SGL", day("20240902"), day("20240905"))
+        assert list(index.iter_runs("H1", "SGL", start, end)) == [
+            (day("20240901"), day("20240904"), 1),
+            (day("20240905"), day("20240905"), 2),
+        ]
+
+    def test_max_occupancy_follows_live_updates(self, index):
+        day = date_to_ordinal
+        assert index.max_occupancy("H1", "SGL", day("20240901"), day("20240906")) == 2
+        assert index.max_occupancy("H1", "SGL", day("20240903"), day("20240905")) == 1
+        index.add_booking("H1", "SGL", day("20240904"), day("20240907"))
+        assert index.max_occupancy("H1", "SGL", day("20240903"), day("20240905")) == 2
+        index.remove_booking("H1", "SGL", day("20240901"), day("20240903"))
+        assert index.max_occupancy("H1", "SGL", day("20240901"), day("20240903")) == 1
+        assert index.max_occupancy("H1", "DBL", day("20240901"), day("20240903")) == 0
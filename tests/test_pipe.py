@@ -0,0 +1,50 @@
+import io
+import json
+import pytest
+from src.cli import CLI
+from src.pipe import run_pipe
+from src.services import HotelManager
+
+@pytest.fixture
+def cli(tmp_path):
+    hotels_file = tmp_path / "hotels.json"
+    bookings_file = tmp_path / "bookings.json"
+    hotels_file.write_text('''[{
+        "id": "H1",
+        "name": "Test Hotel",
+        "roomTypes": [{"code": "SGL", "description": "Single Room"}],
+        "rooms": [{"roomType": "SGL", "roomId": "101"}, {"roomType": "SGL", "roomId": "102"}]
+    }]''')
+    bookings_file.write_text('''[{
+        "hotelId": "H1", "arrival": "20240901", "departure": "20240903",
+        "roomType": "SGL", "roomRate": "Standard"
+    }]''')
+    return CLI(HotelManager(str(hotels_file), str(bookings_file)))
+
+def _pipe(cli, text, chunk_size=1024 * 1024):
+    stdout = io.BytesIO()
+    answered = run_pipe(cli, io.BytesIO(text.encode()), stdout, chunk_size)
+    lines = [json.loads(line) for line in stdout.getvalue().decode().splitlines()]
+    assert answered == len(lines)
+    return lines
+
+class TestPipe:
+    def test_json_lines_and_blank_lines(self, cli):
+        results = _pipe(cli, "Availability(H1, 20240901, SGL)\n\n  \nAvailability(H2, 20240901, SGL)\nNope")
+        assert results[:2] == [
+            {'ok': True, 'command': 'availability', 'result': '1', 'line': 1},
+            {'ok': False, 'error': 'ValidationError', 'message': 'Hotel H2 not found', 'line': 4},
+        ]
+        assert results[2]['line'] == 5
+        assert results[2]['message'].startswith("Unknown command")
+
+    def test_small_chunks_split_lines(self, cli):
+        commands = "Availability(H1,20240901,SGL)\nAvailability( H1 ,  20240903 , SGL )\n" * 3
+        results = _pipe(cli, commands, chunk_size=7)
+        assert [result['result'] for result in results] == ["1", "2"] * 3
+        assert [result['line'] for result in results] == [1, 2, 3, 4, 5, 6]
+
+    def test_parser_tolerates_spacing(self, cli):
+        assert cli.parse_command("  Search ( H1,5 ,SGL )  ") == {
+            'command': 'search', 'hotel_id': 'H1', 'days': '5', 'room_type': 'SGL'}
+        assert cli.parse_command("Stats( )") == {'command': 'stats'}
@@ -0,0 +1,23 @@
+import random
+from src.rangemin import SparseTableMin
+
+class TestSparseTableMin:
+    def test_matches_brute_force(self):
+        rng = random.Random(3)
+        values = [rng.randrange(10) for _ in range(137)]
+        table = SparseTableMin(values)
+        for _ in range(500):
+            start = rng.randrange(len(values))
+            end = rng.randrange(start + 1, len(values) + 1)
+            assert table.min(start, end) == min(values[start:end])
+
+    def test_windows(self):
+        table = SparseTableMin([3, 1, 2, 2, 2, 0, 2, 2])
+        assert list(table.windows(2, 2)) == [2, 3, 6]
+        assert list(table.windows(3, 2)) == [2]
+        assert list(table.windows(9, 0)) == []
+
+    def test_single_value(self):
+        table = SparseTableMin([4])
+        assert table.min(0, 1) == 4
+        assert list(table.windows(1, 4)) == [0]
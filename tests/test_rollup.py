@@ -0,0 +1,61 @@
+import pytest
+import src.rollup as rollup_module
+from src.models import Booking, date_to_ordinal
+from src.rollup import Rollups, iter_periods
+from src.store import BookingStore
+
+BOOKINGS = [
+    Booking("H1", "20240830", "20240902", "SGL", "Standard"),
+    Booking("H1", "20240901", "20240903", "SGL", "Prepaid"),
+    Booking("H1", "20240901", "20240901", "SGL", "Prepaid"),
+    Booking("H1", "20240902", "20240905", "DBL", "Prepaid"),
+    Booking("H2", "20240901", "20240902", "SGL", "Standard"),
+]
+
+BACKENDS = [
+    pytest.param(True, marks=pytest.mark.skipif(rollup_module.np is None, reason="numpy not installed")),
+    False,
+]
+
+def _nightly(rollups, key, start, end):
+    series = rollups.series.get(key)
+    return [series.total(day, day + 1) if series else 0 for day in range(start, end)]
+
+class TestRollups:
+    def test_periods(self):
+        start, end = date_to_ordinal("20240830"), date_to_ordinal("20241002")
+        assert [label for label, _, _ in iter_periods(start, end, 'month')] == ["2024-08", "2024-09", "2024-10"]
+        weeks = list(iter_periods(start, end, 'week'))
+        assert weeks[0] == ("2024-W35", start, date_to_ordinal("20240902"))
+        assert weeks[-1][2] == end
+        assert sum(last - first for _, first, last in weeks) == end - start
+        assert len(list(iter_periods(start, end, 'day'))) == end - start
+
+    @pytest.mark.parametrize("use_numpy", BACKENDS)
+    def test_build_matches_incremental(self, monkeypatch, use_numpy):
+        if not use_numpy:
+            monkeypatch.setattr(rollup_module, "np", None)
+        store = BookingStore.from_bookings(BOOKINGS + [Booking("H1", "20240901", "20240910", "SGL", "Standard")])
+        store.cancel(len(BOOKINGS))
+        built = Rollups.build(store)
+        incremental = Rollups.build(iter(BOOKINGS))
+        start, end = date_to_ordinal("20240828"), date_to_ordinal("20240908")
+        assert set(built.series) == set(incremental.series)
+        for key in built.series:
+            assert _nightly(built, key, start, end) == _nightly(incremental, key, start, end)
+        assert _nightly(built, ("H1", "SGL", "Prepaid"), date_to_ordinal("20240901"),
+                        date_to_ordinal("20240904")) == [1, 1, 0]
+
+    def test_report_and_updates(self):
+        rollups = Rollups.build(BookingStore.from_bookings(BOOKINGS))
+        start, end = date_to_ordinal("20240801"), date_to_ordinal("20241001")
+        counts = {"H1": {"SGL": 2, "DBL": 1}}
+        rows = rollups.report(["H1"], {"H1": ["SGL"]}, counts, start, end, 'month')
+        assert [(row.period, row.room_rate, row.room_nights, row.capacity) for row in rows] == [
+            ("2024-08", "Prepaid", 0, 62), ("2024-08", "Standard", 2, 62),
+            ("2024-09", "Prepaid", 2, 60), ("2024-09", "Standard", 1, 60)]
+        rollups.add("H1", "SGL", "Prepaid", date_to_ordinal("20240825"), date_to_ordinal("20240828"))
+        rollups.remove("H1", "SGL", "Standard", date_to_ordinal("20240830"), date_to_ordinal("20240902"))
+        rows = rollups.report(["H1"], {"H1": ["SGL"]}, counts, start, end, 'month')
+        assert [row.room_nights for row in rows] == [3, 0, 2, 0]
+        assert rows[0].occupancy == pytest.approx(100 * 3 / 62)
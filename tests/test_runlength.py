@@ -0,0 +1,54 @@
+import random
+from src.runlength import OccupancyCalendar
+
+
+def nightly(stays, start, end):
+    return [sum(1 for a, d in stays if a <= day < d) for day in range(start, end)]
+
+
+def expand(calendar, start, end):
+    days = []
+    for first, last, count in calendar.runs(start, end):
+        days.extend([count] * (last - first + 1))
+    return days
+
+
+class TestOccupancyCalendar:
+    STAYS = [(10, 13), (11, 12), (11, 15), (20, 22)]
+
+    def build(self, stays):
+        return OccupancyCalendar.from_sorted(sorted(a for a, _ in stays), sorted(d for _, d in stays))
+
+    def test_from_sorted_matches_nightly_counts(self):
+        calendar = self.build(self.STAYS)
+        assert expand(calendar, 5, 25) == nightly(self.STAYS, 5, 25)
+        assert [calendar.at(day) for day in (9, 10, 11, 12, 13, 15, 21, 22)] == [0, 1, 3, 2, 1, 0, 1, 0]
+
+    def test_runs_are_clipped_and_distinct(self):
+        calendar = self.build(self.STAYS)
+        assert list(calendar.runs(12, 16)) == [(12, 12, 2), (13, 14, 1), (15, 15, 0)]
+        counts = [count for _, _, count in calendar.runs(0, 30)]
+        assert all(a != b for a, b in zip(counts, counts[1:]))
+        assert calendar.max(10, 30) == 3
+        assert calendar.max(15, 20) == 0
+
+    def test_add_and_remove_restore_runs(self):
+        calendar = self.build(self.STAYS)
+        before = (list(calendar.starts), list(calendar.counts))
+        calendar.add(13, 20, 1)
+        assert expand(calendar, 5, 25) == nightly(self.STAYS + [(13, 20)], 5, 25)
+        assert list(calendar.runs(13, 23)) == [(13, 14, 2), (15, 21, 1), (22, 22, 0)]
+        calendar.add(13, 20, -1)
+        assert (list(calendar.starts), list(calendar.counts)) == before
+
+    def test_random_updates_match_nightly_counts(self):
+        rng = random.Random(7)
+        stays = [(a, a + rng.randint(1, 30)) for a in (rng.randint(1, 300) for _ in range(200))]
+        calendar = OccupancyCalendar()
+        for arrival, departure in stays:
+            calendar.add(arrival, departure, 1)
+        for arrival, departure in stays[::3]:
+            calendar.add(arrival, departure, -1)
+        live = [stay for n, stay in enumerate(stays) if n % 3]
+        assert expand(calendar, 0, 340) == nightly(live, 0, 340)
+        assert len(calendar) == len(self.build(live))
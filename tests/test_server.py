@@ -0,0 +1,54 @@
+import asyncio
+import pytest
+from src.cli import CLI
+from src.server import CommandServer
+from src.services import HotelManager
+
+@pytest.fixture
+def cli(tmp_path):
+    hotels_file = tmp_path / "hotels.json"
+    bookings_file = tmp_path / "bookings.json"
+    hotels_file.write_text('''[{
+        "id": "H1",
+        "name": "Test Hotel",
+        "roomTypes": [{"code": "SGL", "description": "Single Room"}],
+        "rooms": [{"roomType": "SGL", "roomId": "101"}, {"roomType": "SGL", "roomId": "102"}]
+    }]''')
+    bookings_file.write_text('''[{
+        "hotelId": "H1", "arrival": "20240901", "departure": "20240903",
+        "roomType": "SGL", "roomRate": "Standard"
+    }]''')
+    return CLI(HotelManager(str(hotels_file), str(bookings_file)))
+
+async def _query(port, lines):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(''.join(f"{line}\n" for line in lines).encode())
+    await writer.drain()
+    responses = [(await reader.readline()).decode().rstrip('\n')
+                 for line in lines if line.strip()]
+    writer.close()
+    await writer.wait_closed()
+    return responses
+
+class TestCommandServer:
+    def test_serves_concurrent_clients(self, cli):
+        async def scenario():
+            server = CommandServer(cli, max_pending=2)
+            listener = await server.start('127.0.0.1', 0)
+            port = listener.sockets[0].getsockname()[1]
+            try:
+                results = await asyncio.gather(*[
+                    _query(port, ["Availability(H1, 20240901, SGL)", "", "Availability(H1, 20240905, SGL)"])
+                    for _ in range(20)
+                ])
+                errors = await _query(port, ["Bogus(1)", "AvailabilityMatrix(20240901-20240903, SGL)"])
+            finally:
+                listener.close()
+                await listener.wait_closed()
+                server.close()
+            return results, errors
+
+        results, errors = asyncio.run(scenario())
+        assert results == [["1", "2"]] * 20
+        assert errors[0].startswith("Error: Unknown command")
+        assert errors[1] == "H1 SGL: 1 1"
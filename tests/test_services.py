@@ -1,7 +1,11 @@
+import os
+import threading
+import time
 import pytest
 from datetime import datetime
 from src.services import HotelManager
-from src.exceptions import ResourceNotFoundError
+from src.models import date_to_ordinal, ordinal_to_date
+from src.exceptions import OverbookingError, ReloadError, ResourceNotFoundError, ValidationError
 from unittest.mock import patch
 
 class TestHotelManager:
@@ -51,6 +55,11 @@ class TestHotelManager:
         assert manager.bookings[0].hotelId == "H1"
         assert manager.bookings[0].roomType == "SGL"
 
+    def test_lookup_maps(self, manager):
+        assert manager.hotels_by_id["H1"] is manager.hotels[0]
+        assert manager.room_types_by_hotel == {"H1": {"SGL"}}
+        assert manager.room_counts == {"H1": {"SGL": 2}}
+
     def test_check_availability(self, manager):
         # Test single date availability
         assert manager.check_availability("H1", "20240901", "SGL") == 1
@@ -64,8 +73,217 @@ class TestHotelManager:
         with pytest.raises(ResourceNotFoundError):
             manager.check_availability("H2", "20240901", "SGL")
 
-    # def test_search_availability(self, manager):
-    #     with patch('datetime.datetime') as mock_date:
-    #         mock_date.now.return_value = datetime(2024, 9, 1)
-    #         result = manager.search_availability("H1", 5, "SGL")
-    #         assert "(20241211-20241215, 2)" in result
+    def test_check_availability_reversed_range(self, manager):
+        with pytest.raises(ValidationError):
+            manager.check_availability("H1", "20240905-20240901", "SGL")
+
+    def test_search_availability(self, manager):
+        with patch.object(manager, '_today', return_value=date_to_ordinal("20240831")):
+            result = manager.search_availability("H1", 5, "SGL")
+        assert result == "(20240831, 2), (20240901-20240902, 1), (20240903-20240904, 2)"
+
+    def test_search_availability_matches_daily_checks(self, manager):
+        start = date_to_ordinal("20240825")
+        with patch.object(manager, '_today', return_value=start):
+            result = manager.search_availability("H1", 20, "SGL")
+
+        periods, previous = [], None
+        for day in range(start, start + 20):
+            count = manager.check_availability("H1", ordinal_to_date(day), "SGL")
+            if count and previous and previous[2] == count:
+                previous[1] = day
+            elif count:
+                previous = [day, day, count]
+                periods.append(previous)
+            else:
+                previous = None
+        assert result == ', '.join(manager._format_period(*p) for p in periods)
+
+    def test_search_availability_unknown_hotel(self, manager):
+        with pytest.raises(ResourceNotFoundError):
+            manager.search_availability("H2", 5, "SGL")
+
+    def test_search_availability_limit_and_until(self, manager):
+        with patch.object(manager, '_today', return_value=date_to_ordinal("20240831")):
+            assert manager.search_availability("H1", 5, "SGL", limit=2) == "(20240831, 2), (20240901-20240902, 1)"
+            assert manager.search_availability("H1", 5, "SGL", until="20240901") == "(20240831, 2), (20240901, 1)"
+            assert manager.search_availability("H1", 5, "SGL", until="20240830") == ""
+
+    def test_iter_availability_is_lazy(self, manager):
+        with patch.object(manager, '_today', return_value=date_to_ordinal("20240831")):
+            periods = manager.iter_availability("H1", 100000, "SGL")
+            first = next(periods)
+            assert first == (date_to_ordinal("20240831"), date_to_ordinal("20240831"), 2)
+            assert (first.start_date, first.end_date, first.count) == ("20240831", "20240831", 2)
+            assert [p.start_date for p in manager.iter_availability("H1", 5, "SGL", limit=2)] == [
+                "20240831", "20240901"]
+
+    def test_add_booking(self, manager):
+        booking_id = manager.add_booking("H1", "20240902", "20240904", "SGL", "Prepaid")
+        assert booking_id == 1
+        assert manager.bookings[booking_id].arrival == "20240902"
+        assert manager.check_availability("H1", "20240902", "SGL") == 0
+        assert manager.check_availability("H1", "20240903", "SGL") == 1
+
+        with pytest.raises(OverbookingError):
+            manager.add_booking("H1", "20240901", "20240905", "SGL", "Prepaid")
+        with pytest.raises(ValidationError):
+            manager.add_booking("H1", "20240901", "20240905", "DBL", "Prepaid")
+        with pytest.raises(ValidationError):
+            manager.add_booking("H1", "20240905", "20240905", "SGL", "Prepaid")
+        with pytest.raises(ResourceNotFoundError):
+            manager.add_booking("H2", "20240901", "20240905", "SGL", "Prepaid")
+        assert len(manager.bookings) == 2
+
+    def test_cancel_booking(self, manager):
+        manager.cancel_booking(0)
+        assert manager.check_availability("H1", "20240901", "SGL") == 2
+        assert len(manager.bookings) == 0
+        with pytest.raises(ResourceNotFoundError):
+            manager.cancel_booking(0)
+
+    def test_modify_booking(self, manager):
+        manager.add_booking("H1", "20240905", "20240907", "SGL", "Prepaid")
+        manager.modify_booking(0, "20240904", "20240906")
+        assert manager.check_availability("H1", "20240901", "SGL") == 2
+        assert manager.check_availability("H1", "20240905", "SGL") == 0
+        assert manager.bookings[0].roomRate == "Standard"
+
+        with pytest.raises(OverbookingError):
+            manager.add_booking("H1", "20240905", "20240906", "SGL", "Prepaid")
+        manager.modify_booking(1, "20240910", "20240912")
+        assert manager.check_availability("H1", "20240905", "SGL") == 1
+
+    def test_result_cache(self, manager):
+        assert manager.check_availability("H1", "20240901", "SGL") == 1
+        assert manager.check_availability("H1", "20240901", "SGL") == 1
+        assert manager.cache_stats()['hits'] == 1
+
+        manager.add_booking("H1", "20240901", "20240902", "SGL", "Prepaid")
+        assert manager.check_availability("H1", "20240901", "SGL") == 0
+
+        with patch.object(manager, '_today', return_value=date_to_ordinal("20240901")):
+            first = manager.search_availability("H1", 3, "SGL")
+            assert manager.search_availability("H1", 3, "SGL") == first
+        with patch.object(manager, '_today', return_value=date_to_ordinal("20240902")):
+            assert manager.search_availability("H1", 3, "SGL") != first
+
+    def test_result_computed_across_a_booking_is_not_cached(self, manager):
+        count_overlapping = manager.occupancy.count_overlapping
+
+        def count_then_book(*args):
+            # The booking lands after the count but before the result is cached.
+            count = count_overlapping(*args)
+            manager.add_booking("H1", "20240901", "20240902", "SGL", "Prepaid")
+            return count
+
+        with patch.object(manager.occupancy, 'count_overlapping', count_then_book):
+            assert manager.check_availability("H1", "20240901", "SGL") == 1
+        assert manager.check_availability("H1", "20240901", "SGL") == 0
+
+    def test_reload_swaps_in_new_files(self, manager):
+        old_state = manager._state
+        assert manager.check_availability("H1", "20240901", "SGL") == 1
+        with open(manager.bookings_file, 'w') as f:
+            f.write('[]')
+        manager.reload()
+        assert manager._state is not old_state
+        assert manager.check_availability("H1", "20240901", "SGL") == 2
+        # A query holding the old state still sees the old data.
+        assert old_state.occupancy.count_overlapping("H1", "SGL", *manager._parse_range("20240901")) == 1
+
+    def test_failed_reload_keeps_current_state(self, manager):
+        with open(manager.hotels_file, 'w') as f:
+            f.write('[{"id": ')
+        with pytest.raises(ValueError):
+            manager.reload()
+        assert isinstance(manager.reload_error, ValueError)
+        assert manager.check_availability("H1", "20240901", "SGL") == 1
+
+    def test_reload_reads_files_without_write_lock(self, manager):
+        free = []
+        open_storage = manager.storage.open
+
+        def probe():
+            if manager._write_lock.acquire(timeout=1):
+                manager._write_lock.release()
+                free.append(True)
+            else:
+                free.append(False)
+
+        def open_while_probing(*args, **kwargs):
+            # Another thread must be able to take the write lock while the files load.
+            thread = threading.Thread(target=probe)
+            thread.start()
+            thread.join()
+            return open_storage(*args, **kwargs)
+
+        with patch.object(manager.storage, 'open', open_while_probing):
+            manager.reload()
+        assert free == [True]
+
+    def test_reload_refuses_to_drop_unjournaled_changes(self, manager):
+        manager.add_booking("H1", "20240901", "20240902", "SGL", "Prepaid")
+        with pytest.raises(ReloadError):
+            manager.reload()
+        assert manager.check_availability("H1", "20240901", "SGL") == 0
+        assert manager.add_booking("H1", "20240905", "20240906", "SGL", "Prepaid") == 2
+
+    def test_watch_reloads_changed_file(self, manager):
+        manager.watch(interval=0.01)
+        time.sleep(0.05)
+        with open(manager.bookings_file, 'w') as f:
+            f.write('[]')
+        os.utime(manager.bookings_file, ns=(0, 0))
+        deadline = time.monotonic() + 5
+        while manager._state.generation == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        manager.close()
+        assert manager.check_availability("H1", "20240901", "SGL") == 2
+
+    def test_check_availability_many(self, manager):
+        queries = [("H1", "20240902", "SGL"), ("H1", "20240901-20240905", "SGL"),
+                   ("H1", "20240903", "SGL"), ("H1", "20240901", "DBL")]
+        assert manager.check_availability_many(queries) == [
+            manager.check_availability(*query) for query in queries
+        ]
+        with pytest.raises(ResourceNotFoundError):
+            manager.check_availability_many([("H1", "20240901", "SGL"), ("H9", "20240901", "SGL")])
+
+    def test_find_stays(self, manager):
+        manager.add_booking("H1", "20240904", "20240905", "SGL", "Standard")
+        with patch.object(manager, '_today', return_value=date_to_ordinal("20240901")):
+            assert manager.find_stays("H1", 2, "SGL", 2, 10) == [("20240905", "20240907", 2)]
+            assert manager.find_stays("H1", 3, "SGL", 1, 10, limit=3) == [
+                ("20240901", "20240904", 1), ("20240902", "20240905", 1), ("20240903", "20240906", 1)]
+            assert manager.find_stays("H1", 11, "SGL", 1, 10) == []
+            assert manager.find_stays("H1", 1, "SGL", 3, 10) == []
+
+    def test_room_assignment(self, manager):
+        assert manager.room_of_booking(0) == "101"
+        booking_id = manager.add_booking("H1", "20240902", "20240904", "SGL", "Prepaid")
+        assert manager.room_occupancy("H1", "20240902", "SGL") == {"101": 0, "102": booking_id}
+        manager.cancel_booking(0)
+        manager.modify_booking(booking_id, "20240901", "20240902")
+        assert manager.room_occupancy("H1", "20240902", "SGL") == {"101": None, "102": None}
+        assert manager.room_of_booking(booking_id) == "101"
+
+    def test_memory_report(self, manager):
+        report = manager.memory_report()
+        assert report['hotels'] == 1
+        assert report['bookings'] == len(manager.bookings)
+        assert report['bytes_per_hotel'] == report['hotel_bytes'] > 0
+        assert report['bytes_per_booking'] == report['booking_bytes'] / report['bookings']
+
+    def test_occupancy_report(self, manager):
+        rows = manager.occupancy_report("20240901-20240908", 'week')
+        assert [(row.period, row.room_rate, row.room_nights, row.capacity) for row in rows] == [
+            ("2024-W35", "Standard", 1, 2), ("2024-W36", "Standard", 1, 12)]
+        manager.add_booking("H1", "20240906", "20240910", "SGL", "Prepaid")
+        manager.cancel_booking(0)
+        rows = manager.occupancy_report("20240901-20240908", 'week')
+        assert [(row.period, row.room_rate, row.room_nights) for row in rows] == [
+            ("2024-W35", "Prepaid", 0), ("2024-W35", "Standard", 0),
+            ("2024-W36", "Prepaid", 2), ("2024-W36", "Standard", 0)]
+        with pytest.raises(ValidationError):
+            manager.occupancy_report("20240901-20240908", 'year')
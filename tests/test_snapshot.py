@@ -0,0 +1,58 @@
+import json
+import os
+import pytest
+from src.services import HotelManager
+from src.snapshot import load_snapshot
+
+BOOKINGS = [
+    {"hotelId": "H1", "arrival": "20240901", "departure": "20240903", "roomType": "SGL", "roomRate": "Standard"},
+    {"hotelId": "H1", "arrival": "20240902", "departure": "20240904", "roomType": "SGL", "roomRate": "Prepaid"},
+]
+
+@pytest.fixture
+def files(write_data, tmp_path):
+    return write_data(BOOKINGS) + (str(tmp_path / "cache.snap"),)
+
+class TestSnapshot:
+    def test_snapshot_written_and_reused(self, files):
+        hotels_file, bookings_file, snapshot = files
+        cold = HotelManager(hotels_file, bookings_file, snapshot_file=snapshot)
+        assert os.path.exists(snapshot)
+
+        warm = HotelManager(hotels_file, bookings_file, snapshot_file=snapshot)
+        assert isinstance(warm.bookings.arrivals, memoryview)
+        assert list(warm.bookings) == list(cold.bookings)
+        for date_str in ("20240901", "20240902", "20240903", "20240901-20240905"):
+            assert (warm.check_availability("H1", date_str, "SGL")
+                    == cold.check_availability("H1", date_str, "SGL"))
+
+    def test_stale_snapshot_is_rebuilt(self, files):
+        hotels_file, bookings_file, snapshot = files
+        HotelManager(hotels_file, bookings_file, snapshot_file=snapshot)
+        with open(bookings_file, 'w') as f:
+            json.dump(BOOKINGS[:1], f)
+        assert load_snapshot(snapshot, [hotels_file, bookings_file]) is None
+
+        manager = HotelManager(hotels_file, bookings_file, snapshot_file=snapshot)
+        assert len(manager.bookings) == 1
+        assert load_snapshot(snapshot, [hotels_file, bookings_file]) is not None
+
+    def test_corrupt_snapshot_is_ignored(self, files):
+        hotels_file, bookings_file, snapshot = files
+        with open(snapshot, 'wb') as f:
+            f.write(b'not a snapshot')
+        assert load_snapshot(snapshot, [hotels_file, bookings_file]) is None
+        assert HotelManager(hotels_file, bookings_file, snapshot_file=snapshot).check_availability(
+            "H1", "20240902", "SGL") == 0
+
+    def test_truncated_snapshot_is_rebuilt(self, files):
+        hotels_file, bookings_file, snapshot = files
+        HotelManager(hotels_file, bookings_file, snapshot_file=snapshot)
+        with open(snapshot, 'rb') as f:
+            data = f.read()
+        for size in (len(data) - 8, len(data) - 3):
+            with open(snapshot, 'wb') as f:
+                f.write(data[:size])
+            assert load_snapshot(snapshot, [hotels_file, bookings_file]) is None
+            manager = HotelManager(hotels_file, bookings_file, snapshot_file=snapshot)
+            assert manager.check_availability("H1", "20240902", "SGL") == 0
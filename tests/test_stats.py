@@ -0,0 +1,52 @@
+from src.stats import Histogram, Stats, StatsHook, deep_sizeof
+
+class RecordingHook(StatsHook):
+    def __init__(self):
+        self.timings = []
+        self.counts = []
+
+    def on_timing(self, name, elapsed_ns):
+        self.timings.append(name)
+
+    def on_count(self, name, amount):
+        self.counts.append((name, amount))
+
+class TestStats:
+    def test_histogram_percentiles(self):
+        histogram = Histogram()
+        for elapsed_ns in [1000] * 98 + [1_000_000] * 2:
+            histogram.record(elapsed_ns)
+        assert histogram.count == 100
+        assert 1000 <= histogram.percentile(0.5) < 2048
+        assert histogram.percentile(0.99) == 1_000_000
+        assert histogram.summary()['max_us'] == 1000
+
+    def test_disabled_stats_record_nothing(self):
+        stats = Stats()
+        with stats.timer('phase.parse'):
+            pass
+        stats.increment('errors.ValidationError')
+        assert stats.snapshot() == {'timers': {}, 'counters': {}}
+        assert "disabled" in stats.report()
+
+    def test_enabled_stats_and_hooks(self):
+        stats = Stats(enabled=True)
+        hook = RecordingHook()
+        stats.add_hook(hook)
+        with stats.timer('phase.parse'):
+            pass
+        stats.increment('bookings_scanned', 5)
+        stats.increment('bookings_scanned', 2)
+        snapshot = stats.snapshot()
+        assert snapshot['timers']['phase.parse']['count'] == 1
+        assert snapshot['counters'] == {'bookings_scanned': 7}
+        assert hook.timings == ['phase.parse']
+        assert hook.counts == [('bookings_scanned', 5), ('bookings_scanned', 2)]
+        assert "bookings_scanned: 7" in stats.report()
+
+    def test_deep_sizeof_counts_shared_objects_once(self):
+        shared = "x" * 1000
+        assert deep_sizeof([shared, shared]) < 2 * deep_sizeof(shared)
+        seen = set()
+        deep_sizeof(shared, seen)
+        assert deep_sizeof([shared], seen) < deep_sizeof(shared)
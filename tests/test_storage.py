@@ -0,0 +1,117 @@
+import sqlite3
+import pytest
+from unittest.mock import patch
+from src.cli import CLI
+from src.exceptions import OverbookingError, UnsupportedStorageError
+from src.models import date_to_ordinal
+from src.services import HotelManager
+from src.storage import SQLiteStorage, import_bookings
+
+HOTELS = [{
+    "id": "H1",
+    "name": "Test Hotel",
+    "roomTypes": [{"code": "SGL", "description": "Single Room"},
+                  {"code": "DBL", "description": "Double Room"}],
+    "rooms": [{"roomType": "SGL", "roomId": "101"}, {"roomType": "SGL", "roomId": "102"},
+              {"roomType": "DBL", "roomId": "201"}]
+}]
+
+BOOKINGS = [
+    {"hotelId": "H1", "arrival": "20240901", "departure": "20240903", "roomType": "SGL", "roomRate": "Standard"},
+    {"hotelId": "H1", "arrival": "20240902", "departure": "20240910", "roomType": "SGL", "roomRate": "Prepaid"},
+    {"hotelId": "H1", "arrival": "20240905", "departure": "20240906", "roomType": "DBL", "roomRate": "Standard"},
+]
+
+@pytest.fixture
+def files(write_data, tmp_path):
+    return write_data(BOOKINGS, HOTELS) + (str(tmp_path / "bookings.db"),)
+
+class TestSQLiteStorage:
+    def test_import_in_batches(self, files):
+        _, bookings_file, db = files
+        conn = sqlite3.connect(db, isolation_level=None)
+        conn.executescript("CREATE TABLE bookings (id INTEGER PRIMARY KEY, hotel_id TEXT, room_type TEXT, "
+                           "arrival INTEGER, departure INTEGER, room_rate TEXT);"
+                           "CREATE TABLE meta (key TEXT PRIMARY KEY, value INTEGER);")
+        assert import_bookings(conn, bookings_file, batch_size=2) == 3
+        assert conn.execute("SELECT COUNT(*) FROM bookings").fetchone()[0] == 3
+        plan = conn.execute("EXPLAIN QUERY PLAN SELECT COUNT(*) FROM bookings WHERE hotel_id = 'H1' "
+                            "AND room_type = 'SGL' AND arrival >= 0 AND arrival < 9 AND departure > 1").fetchall()
+        assert 'COVERING INDEX bookings_occupancy' in plan[0][-1]
+
+    def test_queries_match_memory_backend(self, files):
+        hotels_file, bookings_file, db = files
+        memory = HotelManager(hotels_file, bookings_file, cache_size=0)
+        sqlite = HotelManager(hotels_file, bookings_file, cache_size=0, sqlite_file=db)
+        for date_str in ("20240901", "20240902", "20240903-20240906", "20240909", "20240910"):
+            for room_type in ("SGL", "DBL"):
+                assert (sqlite.check_availability("H1", date_str, room_type)
+                        == memory.check_availability("H1", date_str, room_type))
+        queries = [("H1", "20240901-20240905", "SGL"), ("H1", "20240905", "DBL")]
+        assert sqlite.check_availability_many(queries) == memory.check_availability_many(queries)
+        assert (sqlite.availability_matrix("20240901-20240908", ["SGL", "DBL"]).values
+                == memory.availability_matrix("20240901-20240908", ["SGL", "DBL"]).values)
+        assert sqlite.room_of_booking(1) == memory.room_of_booking(1)
+
+    def test_changes_persist_across_reopen(self, files):
+        hotels_file, bookings_file, db = files
+        manager = HotelManager(hotels_file, bookings_file, sqlite_file=db)
+        booking_id = manager.add_booking("H1", "20240911", "20240913", "SGL", "Standard")
+        manager.cancel_booking(0)
+        manager.modify_booking(2, "20240906", "20240907")
+
+        reopened = HotelManager(hotels_file, bookings_file, sqlite_file=db)
+        assert booking_id == 3
+        assert len(reopened.bookings) == 3
+        assert not reopened.bookings.is_active(0)
+        assert reopened.bookings[2].arrival == "20240906"
+        assert reopened.check_availability("H1", "20240911", "SGL") == 1
+        assert reopened.add_booking("H1", "20240920", "20240921", "SGL", "Standard") == 4
+
+    def test_modify_checks_capacity_without_its_own_stay(self, files):
+        hotels_file, bookings_file, db = files
+        manager = HotelManager(hotels_file, bookings_file, sqlite_file=db)
+        manager.add_booking("H1", "20240903", "20240905", "SGL", "Standard")
+        manager.modify_booking(1, "20240903", "20240911")
+        with pytest.raises(OverbookingError):
+            manager.modify_booking(0, "20240901", "20240904")
+        assert manager.bookings[0].departure == "20240903"
+        assert manager.check_availability("H1", "20240902", "SGL") == 1
+
+    def test_search_matches_memory_backend(self, files):
+        hotels_file, bookings_file, db = files
+        memory = HotelManager(hotels_file, bookings_file, cache_size=0)
+        sqlite = HotelManager(hotels_file, bookings_file, cache_size=0, sqlite_file=db)
+        sqlite.add_booking("H1", "20240911", "20240913", "DBL", "Standard")
+        memory.add_booking("H1", "20240911", "20240913", "DBL", "Standard")
+        with patch.object(HotelManager, '_today', return_value=date_to_ordinal("20240831")):
+            for room_type in ("SGL", "DBL"):
+                assert (sqlite.search_availability("H1", 365, room_type)
+                        == memory.search_availability("H1", 365, room_type))
+            assert sqlite.search_availability("H1", 365, "SGL", limit=2) == "(20240831, 2), (20240901, 1)"
+            assert list(sqlite.iter_availability("H1", 365, "DBL", until="20240911")) == list(
+                memory.iter_availability("H1", 365, "DBL", until="20240911"))
+
+    def test_reload_reuses_connection(self, files):
+        hotels_file, bookings_file, db = files
+        manager = HotelManager(hotels_file, bookings_file, sqlite_file=db)
+        conn = manager.bookings.conn
+        manager.reload()
+        assert manager.bookings.conn is conn
+        assert manager.check_availability("H1", "20240902", "SGL") == 0
+        manager.close()
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+
+    def test_rejects_journal(self, files, tmp_path):
+        hotels_file, bookings_file, db = files
+        with pytest.raises(ValueError):
+            HotelManager(hotels_file, bookings_file, journal_file=str(tmp_path / "journal"),
+                         storage=SQLiteStorage(db, bookings_file))
+
+    def test_audit_needs_memory_storage(self, files):
+        hotels_file, bookings_file, db = files
+        manager = HotelManager(hotels_file, bookings_file, sqlite_file=db)
+        with pytest.raises(UnsupportedStorageError):
+            manager.audit()
+        assert CLI(manager).process_command("Audit()") == "Error: Auditing needs in-memory storage"
@@ -0,0 +1,31 @@
+import pytest
+from src.store import BookingStore, StringTable
+from src.models import Booking, date_to_ordinal
+
+@pytest.fixture
+def bookings():
+    return [
+        Booking("H1", "20240901", "20240903", "SGL", "Standard"),
+        Booking("H2", "20240902", "20240905", "DBL", "Prepaid"),
+        Booking("H1", "20240904", "20240906", "SGL", "Prepaid"),
+    ]
+
+class TestBookingStore:
+    def test_string_table_interns(self):
+        table = StringTable(["SGL", "DBL", "SGL"])
+        assert len(table) == 2
+        assert table.code("DBL") == 1
+        assert table[0] == "SGL"
+
+    def test_round_trip(self, bookings):
+        store = BookingStore.from_bookings(bookings)
+        assert len(store) == 3
+        assert store[1] == bookings[1]
+        assert list(store) == bookings
+
+    def test_columns(self, bookings):
+        store = BookingStore.from_bookings(bookings)
+        assert list(store.hotel_codes) == [0, 1, 0]
+        assert list(store.rate_codes) == [0, 1, 1]
+        assert store.arrivals[0] == date_to_ordinal("20240901")
+        assert store.arrivals.itemsize == 4
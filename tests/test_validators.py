@@ -34,4 +34,16 @@ class TestValidators:
     def test_room_type_validation(self, sample_hotel):
         assert validate_room_type("SGL", "H1", [sample_hotel]) == True
         assert validate_room_type("DBL", "H1", [sample_hotel]) == False
-        assert validate_room_type("SGL", "H2", [sample_hotel]) == False 
\ No newline at end of file
+        assert validate_room_type("SGL", "H2", [sample_hotel]) == False
+
+    def test_validation_with_maps(self, sample_hotel):
+        hotels_by_id = {"H1": sample_hotel}
+        assert validate_hotel_id("H1", hotels_by_id) == True
+        assert validate_hotel_id("H2", hotels_by_id) == False
+        assert validate_room_type("SGL", "H1", hotels_by_id) == True
+        assert validate_room_type("DBL", "H1", hotels_by_id) == False
+
+        room_types = {"H1": {"SGL"}}
+        assert validate_room_type("SGL", "H1", hotels_by_id, room_types) == True
+        assert validate_room_type("DBL", "H1", hotels_by_id, room_types) == False
+        assert validate_room_type("SGL", "H2", hotels_by_id, room_types) == False